@@ -12,6 +12,7 @@ from dotenv import load_dotenv
 from sqlalchemy import engine_from_config, pool
 
 from src.models import Base  # Adjust the import path as necessary
+from src.settings import database_settings
 
 # from src.models import participant, question, quiz, user
 
@@ -35,7 +36,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 target_metadata = Base.metadata
 
 # Retrieve synchronous database URL from environment variables
-DATABASE_URL_SYNC = os.getenv("DATABASE_URL_SYNC")
+DATABASE_URL_SYNC = database_settings.url_sync
 
 
 def run_migrations_offline():
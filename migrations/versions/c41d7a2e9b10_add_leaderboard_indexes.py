@@ -0,0 +1,60 @@
+"""add_leaderboard_indexes
+
+Revision ID: c41d7a2e9b10
+Revises: 87483bdbd50a
+Create Date: 2026-10-18 10:12:44.318207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c41d7a2e9b10"
+down_revision: Union[str, None] = "87483bdbd50a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Merge duplicate joins left by concurrent add_participant calls so the
+    # unique index can be built: the earliest row for each pair takes the
+    # summed score of its duplicates, then the rest are dropped
+    op.execute("""
+        UPDATE participants
+        SET score = duplicates.total
+        FROM (
+            SELECT MIN(id) AS keep_id, SUM(score) AS total
+            FROM participants
+            GROUP BY quiz_id, user_id
+            HAVING COUNT(*) > 1
+        ) AS duplicates
+        WHERE participants.id = duplicates.keep_id
+        """)
+    op.execute("""
+        DELETE FROM participants
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM participants GROUP BY quiz_id, user_id
+        )
+        """)
+    op.create_index(
+        "idx_participants_quiz_id_score",
+        "participants",
+        ["quiz_id", sa.text("score DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "uq_participants_quiz_id_user_id",
+        "participants",
+        ["quiz_id", "user_id"],
+        unique=True,
+    )
+    op.create_index("idx_questions_quiz_id", "questions", ["quiz_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_questions_quiz_id", table_name="questions")
+    op.drop_index("uq_participants_quiz_id_user_id", table_name="participants")
+    op.drop_index("idx_participants_quiz_id_score", table_name="participants")
@@ -0,0 +1,28 @@
+"""add_question_duration
+
+Revision ID: e7a1f3c5d920
+Revises: c41d7a2e9b10
+Create Date: 2026-10-18 20:15:02.481733
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a1f3c5d920"
+down_revision: Union[str, None] = "c41d7a2e9b10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "questions", sa.Column("duration_seconds", sa.Integer(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("questions", "duration_seconds")
@@ -0,0 +1,21 @@
+import os
+
+from src.broadcasters.base_broadcaster import BaseBroadcaster
+from src.broadcasters.in_process_broadcaster import InProcessBroadcaster
+from src.broadcasters.memory_broadcaster import MemoryBroadcaster, MemoryBroker
+
+BROADCAST_BACKEND = os.getenv("BROADCAST_BACKEND", "in_process")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+def create_broadcaster(backend: str = BROADCAST_BACKEND) -> BaseBroadcaster:
+    if backend == "redis":
+        # Imported lazily so single-worker deployments don't need Redis installed
+        from src.broadcasters.redis_broadcaster import RedisBroadcaster
+
+        return RedisBroadcaster(REDIS_URL)
+    if backend == "memory":
+        return MemoryBroadcaster()
+    if backend == "in_process":
+        return InProcessBroadcaster()
+    raise ValueError(f"Unknown broadcast backend: {backend}")
@@ -0,0 +1,67 @@
+import uuid
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional
+
+# Called with (quiz_id, message) for every message delivered to this worker
+MessageHandler = Callable[[str, dict], Awaitable[None]]
+# Called with each message sent to an address this worker listens on
+DirectHandler = Callable[[dict], Awaitable[None]]
+
+
+class BaseBroadcaster(ABC):
+    # Seconds a quiz lease lasts unless renewed; None means it never expires
+    owner_ttl: Optional[float] = None
+
+    def __init__(self):
+        self.handler: Optional[MessageHandler] = None
+        self.direct_handler: Optional[DirectHandler] = None
+        self.worker_id = uuid.uuid4().hex
+
+    def set_handler(self, handler: MessageHandler):
+        self.handler = handler
+
+    def set_direct_handler(self, handler: DirectHandler):
+        self.direct_handler = handler
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def claim(self, quiz_id: str) -> bool:
+        """
+        Makes this worker the owner of a live quiz, or renews its claim.
+        False means another worker runs the quiz. Single-process backends
+        own every quiz.
+        """
+        return True
+
+    async def release(self, quiz_id: str):
+        pass
+
+    async def listen(self, address: str):
+        """Delivers messages sent to ``address`` to the direct handler."""
+
+    async def unlisten(self, address: str):
+        pass
+
+    async def send_direct(self, address: str, message: dict) -> bool:
+        """
+        Sends a message to the one worker listening on ``address``. False
+        means nobody is listening. Single-process backends own every quiz,
+        so nothing is ever sent between workers.
+        """
+        return False
+
+    @abstractmethod
+    async def subscribe(self, quiz_id: str):
+        pass
+
+    @abstractmethod
+    async def unsubscribe(self, quiz_id: str):
+        pass
+
+    @abstractmethod
+    async def publish(self, quiz_id: str, message: dict):
+        pass
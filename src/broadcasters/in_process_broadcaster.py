@@ -0,0 +1,23 @@
+from typing import Set
+
+from src.broadcasters.base_broadcaster import BaseBroadcaster
+
+
+class InProcessBroadcaster(BaseBroadcaster):
+    """
+    Single-worker backend: messages are handed straight back to this process.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.subscriptions: Set[str] = set()
+
+    async def subscribe(self, quiz_id: str):
+        self.subscriptions.add(quiz_id)
+
+    async def unsubscribe(self, quiz_id: str):
+        self.subscriptions.discard(quiz_id)
+
+    async def publish(self, quiz_id: str, message: dict):
+        if quiz_id in self.subscriptions and self.handler:
+            await self.handler(quiz_id, message)
@@ -0,0 +1,79 @@
+import json
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.broadcasters.base_broadcaster import BaseBroadcaster
+
+
+class MemoryBroker:
+    """
+    Stand-in for a pub/sub server shared by several in-memory broadcasters,
+    so tests can simulate more than one worker in a single process.
+    """
+
+    def __init__(self):
+        self.broadcasters: List["MemoryBroadcaster"] = []
+        self.published: List[Tuple[str, dict]] = []
+        self.owners: Dict[str, "MemoryBroadcaster"] = {}
+        self.listeners: Dict[str, "MemoryBroadcaster"] = {}
+
+    async def publish(self, quiz_id: str, payload: str):
+        message = json.loads(payload)
+        self.published.append((quiz_id, message))
+        for broadcaster in list(self.broadcasters):
+            if quiz_id in broadcaster.subscriptions and broadcaster.handler:
+                await broadcaster.handler(quiz_id, message)
+
+
+class MemoryBroadcaster(BaseBroadcaster):
+    def __init__(
+        self, broker: Optional[MemoryBroker] = None, owner_ttl: Optional[float] = None
+    ):
+        super().__init__()
+        self.broker = broker or MemoryBroker()
+        self.owner_ttl = owner_ttl
+        self.subscriptions: Set[str] = set()
+
+    async def start(self):
+        if self not in self.broker.broadcasters:
+            self.broker.broadcasters.append(self)
+
+    async def stop(self):
+        if self in self.broker.broadcasters:
+            self.broker.broadcasters.remove(self)
+        self.subscriptions.clear()
+        for quiz_id in [q for q, o in self.broker.owners.items() if o is self]:
+            del self.broker.owners[quiz_id]
+        for address in [a for a, o in self.broker.listeners.items() if o is self]:
+            del self.broker.listeners[address]
+
+    async def claim(self, quiz_id: str) -> bool:
+        return self.broker.owners.setdefault(quiz_id, self) is self
+
+    async def release(self, quiz_id: str):
+        if self.broker.owners.get(quiz_id) is self:
+            del self.broker.owners[quiz_id]
+
+    async def listen(self, address: str):
+        self.broker.listeners[address] = self
+
+    async def unlisten(self, address: str):
+        if self.broker.listeners.get(address) is self:
+            del self.broker.listeners[address]
+
+    async def send_direct(self, address: str, message: dict) -> bool:
+        listener = self.broker.listeners.get(address)
+        if listener is None:
+            return False
+        if listener.direct_handler:
+            await listener.direct_handler(json.loads(json.dumps(message)))
+        return True
+
+    async def subscribe(self, quiz_id: str):
+        self.subscriptions.add(quiz_id)
+
+    async def unsubscribe(self, quiz_id: str):
+        self.subscriptions.discard(quiz_id)
+
+    async def publish(self, quiz_id: str, message: dict):
+        # Round-trip through JSON like a real wire would
+        await self.broker.publish(quiz_id, json.dumps(message))
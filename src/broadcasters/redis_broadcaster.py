@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+from typing import Optional
+
+from redis import asyncio as aioredis
+
+from src.broadcasters.base_broadcaster import BaseBroadcaster
+from src.utils.logger import LoggerSingleton
+
+QUIZ_OWNER_TTL_SECONDS = int(os.getenv("QUIZ_OWNER_TTL_SECONDS", 15))
+
+# Take the lease if it is free, or renew it if this worker already holds it
+CLAIM_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then return 1 end
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then redis.call('DEL', KEYS[1]) end
+return 0
+"""
+
+
+class RedisBroadcaster(BaseBroadcaster):
+    """
+    Fans messages out to every worker through Redis pub/sub. Each worker only
+    subscribes to the quizzes it has local sockets for.
+
+    Live quizzes are owned by one worker through a lease key with a TTL,
+    which the owner renews while it runs the quiz, so a quiz never runs two
+    timelines. Direct messages to one worker, such as commands forwarded to
+    a quiz's owner, use their own channels.
+    """
+
+    CHANNEL_PREFIX = "quiz:broadcast:"
+    DIRECT_PREFIX = "quiz:direct:"
+    OWNER_PREFIX = "quiz:owner:"
+
+    def __init__(self, redis_url: str, owner_ttl: int = QUIZ_OWNER_TTL_SECONDS):
+        super().__init__()
+        self.redis = aioredis.from_url(redis_url)
+        self.owner_ttl = owner_ttl
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self.logger = LoggerSingleton().logger
+        self._reader: Optional[asyncio.Task] = None
+
+    def _channel(self, quiz_id: str) -> str:
+        return f"{self.CHANNEL_PREFIX}{quiz_id}"
+
+    async def start(self):
+        if self._reader is None:
+            self._reader = asyncio.create_task(self._read_loop())
+            self.logger.info("Redis broadcaster started")
+
+    async def stop(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        await self.pubsub.aclose()
+        await self.redis.aclose()
+        self.logger.info("Redis broadcaster stopped")
+
+    async def claim(self, quiz_id: str) -> bool:
+        key = f"{self.OWNER_PREFIX}{quiz_id}"
+        return bool(
+            await self.redis.eval(CLAIM_SCRIPT, 1, key, self.worker_id, self.owner_ttl)
+        )
+
+    async def release(self, quiz_id: str):
+        key = f"{self.OWNER_PREFIX}{quiz_id}"
+        await self.redis.eval(RELEASE_SCRIPT, 1, key, self.worker_id)
+
+    async def listen(self, address: str):
+        await self.pubsub.subscribe(f"{self.DIRECT_PREFIX}{address}")
+
+    async def unlisten(self, address: str):
+        await self.pubsub.unsubscribe(f"{self.DIRECT_PREFIX}{address}")
+
+    async def send_direct(self, address: str, message: dict) -> bool:
+        # PUBLISH returns how many subscribers got the message
+        receivers = await self.redis.publish(
+            f"{self.DIRECT_PREFIX}{address}", json.dumps(message)
+        )
+        return receivers > 0
+
+    async def subscribe(self, quiz_id: str):
+        await self.pubsub.subscribe(self._channel(quiz_id))
+
+    async def unsubscribe(self, quiz_id: str):
+        await self.pubsub.unsubscribe(self._channel(quiz_id))
+
+    async def publish(self, quiz_id: str, message: dict):
+        await self.redis.publish(self._channel(quiz_id), json.dumps(message))
+
+    async def _read_loop(self):
+        while True:
+            try:
+                if not self.pubsub.subscribed:
+                    await asyncio.sleep(0.1)
+                    continue
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message is None:
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                if channel.startswith(self.DIRECT_PREFIX):
+                    if self.direct_handler:
+                        await self.direct_handler(json.loads(message["data"]))
+                    continue
+                if self.handler is None:
+                    continue
+                quiz_id = channel[len(self.CHANNEL_PREFIX) :]
+                await self.handler(quiz_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error reading from Redis pub/sub: {str(e)}")
+                await asyncio.sleep(1)
@@ -0,0 +1,3 @@
+from src.caches.principal_cache import PrincipalCache
+from src.caches.question_cache import CachedQuestion, QuestionCache, QuizQuestions
+from src.caches.quiz_cache import CachedQuiz, QuizCache
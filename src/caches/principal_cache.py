@@ -0,0 +1,39 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from src.schemas.user import UserRead
+
+
+class PrincipalCache:
+    """
+    Authenticated users keyed by the token they presented, so repeat
+    requests and websocket reconnects skip the user lookup. An entry lives
+    until the token's ``exp``, capped at ``max_ttl`` seconds so a deleted
+    user stops authenticating within that window.
+    """
+
+    def __init__(self, max_size: int = 10000, max_ttl: float = 300.0):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.entries: "OrderedDict[str, Tuple[float, UserRead]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[UserRead]:
+        entry = self.entries.get(token)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at <= time.time():
+            del self.entries[token]
+            return None
+        self.entries.move_to_end(token)
+        return user
+
+    def put(self, token: str, user: UserRead, exp: Optional[float]):
+        expires_at = time.time() + self.max_ttl
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        self.entries[token] = (expires_at, user)
+        self.entries.move_to_end(token)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
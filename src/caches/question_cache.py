@@ -0,0 +1,130 @@
+import asyncio
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from src.models import Question
+from src.utils.logger import LoggerSingleton
+from src.utils.metrics import (
+    QUESTION_CACHE_EVICTIONS,
+    QUESTION_CACHE_HITS,
+    QUESTION_CACHE_MISSES,
+)
+
+QuestionLoader = Callable[[str], Awaitable[Iterable[Question]]]
+
+
+def parse_options(raw: str) -> Tuple[str, ...]:
+    # Options are stored as a JSON list, older rows as "a, b, c"
+    try:
+        options = json.loads(raw)
+    except (TypeError, ValueError):
+        options = None
+    if isinstance(options, list):
+        return tuple(str(option) for option in options)
+    return tuple(option.strip() for option in str(raw).split(","))
+
+
+@dataclass(frozen=True)
+class CachedQuestion:
+    id: int
+    text: str
+    options: Tuple[str, ...]
+    correct_option: int
+    duration_seconds: Optional[int] = None
+
+    @classmethod
+    def from_model(cls, question: Question) -> "CachedQuestion":
+        return cls(
+            id=question.id,
+            text=question.text,
+            options=parse_options(question.options),
+            correct_option=question.correct_option,
+            duration_seconds=question.duration_seconds,
+        )
+
+    def option_index(self, selected_option: Any) -> int:
+        """The selected option's index, or -1 if it isn't one of the options."""
+        # Clients send the option index; the option text is accepted too
+        if isinstance(selected_option, str) and not selected_option.isdigit():
+            try:
+                return self.options.index(selected_option)
+            except ValueError:
+                return -1
+        try:
+            return int(selected_option)
+        except (TypeError, ValueError):
+            return -1
+
+
+@dataclass(frozen=True)
+class QuizQuestions:
+    version: int
+    questions: Dict[int, CachedQuestion]
+
+
+class QuestionCache:
+    """
+    Read-through cache of each quiz's questions, so grading an answer is a
+    dict lookup instead of a query. Every quiz has a version that
+    ``invalidate`` bumps; a load that started before an invalidation is
+    returned to its caller but not stored. The least recently used quizzes
+    are evicted once ``max_quizzes`` are cached.
+    """
+
+    def __init__(self, max_quizzes: int = 1024):
+        self.max_quizzes = max_quizzes
+        self.entries: "OrderedDict[str, QuizQuestions]" = OrderedDict()
+        self.versions: Dict[str, int] = {}
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self.logger = LoggerSingleton().logger
+
+    async def get(self, quiz_id: str, loader: QuestionLoader) -> QuizQuestions:
+        entry = self._lookup(quiz_id)
+        if entry is not None:
+            return entry
+        lock = self._load_locks.setdefault(quiz_id, asyncio.Lock())
+        async with lock:
+            # Another caller may have loaded it while we waited
+            entry = self._lookup(quiz_id, count=False)
+            if entry is not None:
+                return entry
+            QUESTION_CACHE_MISSES.inc()
+            version = self.versions.get(quiz_id, 0)
+            questions = await loader(quiz_id)
+            entry = QuizQuestions(
+                version=version,
+                questions={
+                    question.id: CachedQuestion.from_model(question)
+                    for question in questions
+                },
+            )
+            if self.versions.get(quiz_id, 0) == version:
+                self._store(quiz_id, entry)
+            self.logger.info(
+                f"Cached {len(entry.questions)} questions for quiz ID: {quiz_id}"
+            )
+            return entry
+
+    def invalidate(self, quiz_id: str):
+        self.versions[quiz_id] = self.versions.get(quiz_id, 0) + 1
+        self.entries.pop(quiz_id, None)
+        self.logger.info(f"Question cache invalidated for quiz ID: {quiz_id}")
+
+    def _lookup(self, quiz_id: str, count: bool = True) -> Optional[QuizQuestions]:
+        entry = self.entries.get(quiz_id)
+        if entry is None:
+            return None
+        self.entries.move_to_end(quiz_id)
+        if count:
+            QUESTION_CACHE_HITS.inc()
+        return entry
+
+    def _store(self, quiz_id: str, entry: QuizQuestions):
+        self.entries[quiz_id] = entry
+        self.entries.move_to_end(quiz_id)
+        while len(self.entries) > self.max_quizzes:
+            evicted, _ = self.entries.popitem(last=False)
+            self._load_locks.pop(evicted, None)
+            QUESTION_CACHE_EVICTIONS.inc()
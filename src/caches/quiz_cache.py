@@ -0,0 +1,89 @@
+import asyncio
+import datetime
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from src.models import QuizSession
+from src.utils.logger import LoggerSingleton
+from src.utils.metrics import QUIZ_CACHE_HITS, QUIZ_CACHE_MISSES
+
+QuizLoader = Callable[[str], Awaitable[Optional[QuizSession]]]
+
+
+@dataclass(frozen=True)
+class CachedQuiz:
+    quiz_id: str
+    creator_user_id: int
+    status: str
+    created_at: Optional[datetime.datetime]
+
+    @classmethod
+    def from_model(cls, quiz: QuizSession) -> "CachedQuiz":
+        return cls(
+            quiz_id=quiz.quiz_id,
+            creator_user_id=quiz.creator_user_id,
+            status=quiz.status,
+            created_at=quiz.created_at,
+        )
+
+
+class QuizCache:
+    """
+    Shared cache of quiz metadata so the existence check every QuizService
+    call starts with is not a query. Entries expire after ``ttl`` seconds,
+    which bounds how stale another worker's status change can look here;
+    changes made through this process call ``invalidate``. Concurrent misses
+    for the same quiz share a single load. Missing quizzes are not cached.
+    """
+
+    def __init__(self, max_size: int = 4096, ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[float, CachedQuiz]]" = OrderedDict()
+        self.versions: Dict[str, int] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.logger = LoggerSingleton().logger
+
+    async def get(self, quiz_id: str, loader: QuizLoader) -> Optional[CachedQuiz]:
+        entry = self.entries.get(quiz_id)
+        if entry is not None:
+            expires_at, quiz = entry
+            if expires_at > time.monotonic():
+                self.entries.move_to_end(quiz_id)
+                QUIZ_CACHE_HITS.inc()
+                return quiz
+            del self.entries[quiz_id]
+        QUIZ_CACHE_MISSES.inc()
+        load = self._inflight.get(quiz_id)
+        if load is None:
+            load = asyncio.ensure_future(self._load(quiz_id, loader))
+            self._inflight[quiz_id] = load
+            load.add_done_callback(lambda done: self._finish(quiz_id, done))
+        # A cancelled caller must not cancel the load the others are waiting on
+        return await asyncio.shield(load)
+
+    async def _load(self, quiz_id: str, loader: QuizLoader) -> Optional[CachedQuiz]:
+        version = self.versions.get(quiz_id, 0)
+        model = await loader(quiz_id)
+        if model is None:
+            return None
+        quiz = CachedQuiz.from_model(model)
+        if self.versions.get(quiz_id, 0) == version:
+            self.entries[quiz_id] = (time.monotonic() + self.ttl, quiz)
+            self.entries.move_to_end(quiz_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return quiz
+
+    def _finish(self, quiz_id: str, load: asyncio.Future):
+        if self._inflight.get(quiz_id) is load:
+            del self._inflight[quiz_id]
+
+    def invalidate(self, quiz_id: str):
+        self.versions[quiz_id] = self.versions.get(quiz_id, 0) + 1
+        self.entries.pop(quiz_id, None)
+        # Later callers must not join a load that may predate the change
+        self._inflight.pop(quiz_id, None)
+        self.logger.info(f"Quiz cache invalidated for quiz ID: {quiz_id}")
@@ -3,5 +3,17 @@ from abc import ABC, abstractmethod
 
 class BaseCommand(ABC):
     @abstractmethod
-    async def execute(self):
+    async def execute(self, actor, quiz_service):
+        """Runs inside the quiz's actor, one command at a time."""
         pass
+
+    def to_message(self, now: float) -> dict:
+        """
+        Arguments to rebuild the command on the worker that owns the quiz.
+        ``now`` is this worker's monotonic clock.
+        """
+        return {}
+
+    @classmethod
+    def from_message(cls, data: dict, websocket, now: float) -> "BaseCommand":
+        return cls(websocket=websocket)
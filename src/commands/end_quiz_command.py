@@ -0,0 +1,18 @@
+from typing import Optional
+
+from fastapi import WebSocket
+
+from src.commands.base_command import BaseCommand
+from src.services.quiz_service import QuizService
+from src.utils.logger import LoggerSingleton
+
+
+class EndQuizCommand(BaseCommand):
+    def __init__(self, websocket: Optional[WebSocket] = None):
+        self.websocket = websocket
+        self.logger = LoggerSingleton().logger
+
+    async def execute(self, actor, quiz_service: QuizService):
+        self.logger.info(f"Ending quiz with ID: {actor.quiz_id}")
+        await actor.end(quiz_service)
+        self.logger.info(f"Quiz {actor.quiz_id} ended and leaderboard broadcasted")
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from fastapi import WebSocket
+
+from src.commands.base_command import BaseCommand
+from src.services.quiz_service import QuizService
+
+
+class PauseQuizCommand(BaseCommand):
+    def __init__(self, websocket: Optional[WebSocket] = None):
+        self.websocket = websocket
+
+    async def execute(self, actor, quiz_service: QuizService):
+        remaining = actor.pause()
+        await actor.broadcast(
+            actor.quiz_id, {"type": "quiz_paused", "data": {"remaining": remaining}}
+        )
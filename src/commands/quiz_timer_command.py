@@ -0,0 +1,16 @@
+from src.commands.base_command import BaseCommand
+from src.services.quiz_service import QuizService
+
+
+class QuizTimerCommand(BaseCommand):
+    """Posted by the scheduler when the current timeline step is due."""
+
+    def __init__(self, timer_seq: int):
+        self.timer_seq = timer_seq
+        self.websocket = None
+
+    async def execute(self, actor, quiz_service: QuizService):
+        # A pause, skip or end since scheduling makes this timer stale
+        if self.timer_seq != actor.timer_seq or not actor.running:
+            return
+        await actor.step(quiz_service)
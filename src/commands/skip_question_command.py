@@ -0,0 +1,16 @@
+from typing import Optional
+
+from fastapi import WebSocket
+
+from src.commands.base_command import BaseCommand
+from src.services.quiz_service import QuizService
+
+
+class SkipQuestionCommand(BaseCommand):
+    """Closes the open question now, or opens the next one if none is open."""
+
+    def __init__(self, websocket: Optional[WebSocket] = None):
+        self.websocket = websocket
+
+    async def execute(self, actor, quiz_service: QuizService):
+        await actor.skip(quiz_service)
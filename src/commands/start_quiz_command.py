@@ -1,42 +1,28 @@
-import asyncio
+from typing import Optional
+
+from fastapi import WebSocket
 
 from src.commands.base_command import BaseCommand
-from src.observers.leaderboard_observer import LeaderboardObserver
+from src.realtime.quiz_timeline import QuizTimeline
 from src.services.quiz_service import QuizService
 from src.utils.logger import LoggerSingleton
 
 
 class StartQuizCommand(BaseCommand):
-    def __init__(
-        self, quiz_service: QuizService, quiz_id: str, observer: LeaderboardObserver
-    ):
-        self.quiz_service = quiz_service
-        self.quiz_id = quiz_id
-        self.observer = observer
+    def __init__(self, websocket: Optional[WebSocket] = None):
+        self.websocket = websocket
         self.logger = LoggerSingleton().logger
 
-    async def execute(self):
-        self.logger.info(f"Starting quiz with ID: {self.quiz_id}")
-        try:
-            self.quiz_service.start_quiz(self.quiz_id)
-            self.logger.info(f"Quiz {self.quiz_id} started successfully")
-            # Fetch questions and emit them sequentially
-            questions = self.quiz_service.quiz_repository.get_questions(self.quiz_id)
-            for question in questions:
-                data = {
-                    "id": question.id,
-                    "text": question.text,
-                    "options": question.options,
-                }
-                self.logger.info(
-                    f"Broadcasting question ID: {question.id} for quiz ID: {self.quiz_id}"
-                )
-                await self.observer.notify({"new_question": data})
-                await asyncio.sleep(10)  # Wait for 10 seconds before next question
-            self.logger.info(f"Quiz {self.quiz_id} has ended")
-            await self.observer.notify({"quiz_end": "Quiz has ended!"})
-        except Exception as e:
-            self.logger.error(
-                f"Error executing StartQuizCommand for quiz ID {self.quiz_id}: {str(e)}"
-            )
-            raise
+    async def execute(self, actor, quiz_service: QuizService):
+        self.logger.info(f"Starting quiz with ID: {actor.quiz_id}")
+        if actor.running:
+            raise ValueError("Quiz has already started.")
+        await quiz_service.update_status(actor.quiz_id, "started")
+        questions = await quiz_service.get_cached_questions(actor.quiz_id)
+        actor.status = "started"
+        await actor.publish_leaderboard()
+        # Opens the first question; the scheduler drives the rest
+        await actor.start_timeline(QuizTimeline(questions), quiz_service)
+        self.logger.info(
+            f"Quiz {actor.quiz_id} started with {len(questions)} questions"
+        )
@@ -1,42 +1,105 @@
+from typing import Any, Optional
+
+from fastapi import WebSocket
+
 from src.commands.base_command import BaseCommand
-from src.observers.leaderboard_observer import LeaderboardObserver
 from src.services.quiz_service import QuizService
 from src.utils.logger import LoggerSingleton
+from src.utils.metrics import ANSWERS_DUPLICATE, ANSWERS_REJECTED
 
 
 class SubmitAnswerCommand(BaseCommand):
     def __init__(
         self,
-        quiz_service: QuizService,
-        quiz_id: str,
         user_id: int,
-        question_id: int,
-        selected_option: int,
-        observer: LeaderboardObserver,
+        question_id: Any,
+        selected_option: Any,
+        websocket: Optional[WebSocket] = None,
+        received_at: Optional[float] = None,
+        idempotency_key: Any = None,
     ):
-        self.quiz_service = quiz_service
-        self.quiz_id = quiz_id
         self.user_id = user_id
         self.question_id = question_id
         self.selected_option = selected_option
-        self.observer = observer
+        self.websocket = websocket
+        # Monotonic time the server read the message, not when it is run
+        self.received_at = received_at
+        self.idempotency_key = (
+            str(idempotency_key) if idempotency_key is not None else None
+        )
         self.logger = LoggerSingleton().logger
 
-    async def execute(self):
-        self.logger.info(
-            f"Executing SubmitAnswerCommand: quiz_id={self.quiz_id}, user_id={self.user_id}, question_id={self.question_id}, selected_option={self.selected_option}"
+    def to_message(self, now: float) -> dict:
+        return {
+            "user_id": self.user_id,
+            "question_id": self.question_id,
+            "selected_option": self.selected_option,
+            "idempotency_key": self.idempotency_key,
+            # Clocks differ between workers, so the age travels instead
+            "age": None if self.received_at is None else now - self.received_at,
+        }
+
+    @classmethod
+    def from_message(cls, data: dict, websocket, now: float) -> "SubmitAnswerCommand":
+        return cls(
+            data["user_id"],
+            data["question_id"],
+            data["selected_option"],
+            websocket=websocket,
+            received_at=None if data["age"] is None else now - data["age"],
+            idempotency_key=data["idempotency_key"],
         )
-        try:
-            result = self.quiz_service.submit_answer(
-                quiz_id=self.quiz_id,
-                user_id=self.user_id,
-                question_id=self.question_id,
-                selected_option=self.selected_option,
+
+    async def execute(self, actor, quiz_service: QuizService):
+        self.logger.debug(
+            "Executing SubmitAnswerCommand: quiz_id={}, user_id={}, question_id={}",
+            actor.quiz_id,
+            self.user_id,
+            self.question_id,
+        )
+        received_at = self.received_at
+        if received_at is None:
+            received_at = actor.scheduler.clock()
+        # Checked in memory only; a resent or rejected answer never reaches
+        # the database
+        answers = actor.answers
+        reply = answers.reply_for(self.user_id, self.idempotency_key)
+        if reply is None and answers.has_answered(self.question_id, self.user_id):
+            reply = self._received(self.question_id)
+        if reply is not None:
+            ANSWERS_DUPLICATE.inc()
+            await actor.reply(self.websocket, {**reply, "duplicate": True})
+            return
+
+        window = actor.window
+        if window is None or str(window.question.id) != str(self.question_id):
+            ANSWERS_REJECTED.labels(reason="not_open").inc()
+            await actor.reply(
+                self.websocket,
+                {
+                    "type": "error",
+                    "message": f"Question {self.question_id} is not open for answers.",
+                },
             )
-            self.logger.info(
-                f"Answer submitted successfully for user_id={self.user_id} in quiz_id={self.quiz_id}"
+            return
+        if not window.accepts(received_at):
+            ANSWERS_REJECTED.labels(reason="late").inc()
+            await actor.reply(
+                self.websocket,
+                {
+                    "type": "error",
+                    "message": f"Answer to question {self.question_id} arrived after its deadline.",
+                },
             )
-            await self.observer.notify({"answer_result": result})
-        except Exception as e:
-            self.logger.error(f"Error executing SubmitAnswerCommand: {str(e)}")
-            raise
+            return
+
+        # Graded with the rest of the question's answers when it closes
+        window.add(self.user_id, self.selected_option, received_at, self.websocket)
+        answers.mark_answered(window.question.id, self.user_id)
+        reply = self._received(window.question.id)
+        answers.remember(self.user_id, self.idempotency_key, reply)
+        await actor.reply(self.websocket, reply)
+
+    @staticmethod
+    def _received(question_id: Any) -> dict:
+        return {"type": "answer_received", "data": {"question_id": question_id}}
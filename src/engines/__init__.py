@@ -0,0 +1,27 @@
+import os
+
+from src.engines.base_leaderboard_engine import BaseLeaderboardEngine
+from src.engines.memory_leaderboard_engine import MemoryLeaderboardEngine
+
+LEADERBOARD_ENGINE = os.getenv("LEADERBOARD_ENGINE", "memory")
+BROADCAST_BACKEND = os.getenv("BROADCAST_BACKEND", "in_process")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+def create_leaderboard_engine(
+    backend: str = LEADERBOARD_ENGINE,
+    broadcast_backend: str = BROADCAST_BACKEND,
+) -> BaseLeaderboardEngine:
+    if backend == "redis":
+        from src.engines.redis_leaderboard_engine import RedisLeaderboardEngine
+
+        return RedisLeaderboardEngine.from_url(REDIS_URL)
+    if backend == "memory":
+        if broadcast_backend == "redis":
+            # Each worker would publish its own stale copy of the board
+            raise ValueError(
+                "The memory leaderboard engine is per worker; "
+                "use LEADERBOARD_ENGINE=redis with BROADCAST_BACKEND=redis."
+            )
+        return MemoryLeaderboardEngine()
+    raise ValueError(f"Unknown leaderboard engine: {backend}")
@@ -0,0 +1,84 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+class BaseLeaderboardEngine(ABC):
+    """
+    Ranked scores per quiz, keyed by user ID. Every operation is O(log n)
+    (plus the size of the returned slice), so reads no longer sort the
+    whole participants table.
+
+    Entries are returned as ``{"username": ..., "score": ...}`` dicts in
+    rank order, matching ``LeaderboardEntry``.
+    """
+
+    def __init__(self):
+        self._load_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def start(self):
+        pass
+
+    async def ensure_loaded(
+        self, quiz_id: str, loader: Callable[[], Awaitable[List[dict]]]
+    ):
+        """Loads the quiz from ``loader`` once, even under concurrent callers."""
+        if await self.is_loaded(quiz_id):
+            return
+        async with self._load_locks[quiz_id]:
+            if not await self.is_loaded(quiz_id):
+                await self.load(quiz_id, await loader())
+        self._load_locks.pop(quiz_id, None)
+
+    async def stop(self):
+        pass
+
+    @abstractmethod
+    async def is_loaded(self, quiz_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def load(self, quiz_id: str, entries: List[dict]):
+        """Loads the quiz from ``user_id``/``username``/``score`` rows."""
+
+    @abstractmethod
+    async def add(self, quiz_id: str, user_id: int, username: str, score: int = 0):
+        """Adds a participant, leaving an existing score untouched."""
+
+    @abstractmethod
+    async def increment(self, quiz_id: str, user_id: int, amount: int) -> int:
+        pass
+
+    async def increment_many(
+        self, quiz_id: str, amounts: Dict[int, int]
+    ) -> Dict[int, int]:
+        """Increments several users, returning their new scores."""
+        return {
+            user_id: await self.increment(quiz_id, user_id, amount)
+            for user_id, amount in amounts.items()
+        }
+
+    @abstractmethod
+    async def top(self, quiz_id: str, limit: Optional[int] = None) -> List[dict]:
+        pass
+
+    @abstractmethod
+    async def range(self, quiz_id: str, offset: int, limit: int) -> List[dict]:
+        pass
+
+    @abstractmethod
+    async def rank(self, quiz_id: str, user_id: int) -> Optional[int]:
+        """1-based rank, or None if the user isn't on the leaderboard."""
+
+    @abstractmethod
+    async def score(self, quiz_id: str, user_id: int) -> Optional[int]:
+        pass
+
+    @abstractmethod
+    async def count(self, quiz_id: str) -> int:
+        pass
+
+    @abstractmethod
+    async def drop(self, quiz_id: str):
+        pass
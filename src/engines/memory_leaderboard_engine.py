@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from src.engines.base_leaderboard_engine import BaseLeaderboardEngine
+
+
+class _Board:
+    __slots__ = ("ranking", "scores", "names")
+
+    def __init__(self):
+        # (score, member) ascending, read from the end. Members are user IDs
+        # as strings, so ties break exactly as in a Redis sorted set.
+        self.ranking: SortedList = SortedList()
+        self.scores: Dict[int, int] = {}
+        self.names: Dict[int, str] = {}
+
+    def set_score(self, user_id: int, score: int):
+        old = self.scores.get(user_id)
+        if old is not None:
+            self.ranking.remove((old, str(user_id)))
+        self.scores[user_id] = score
+        self.ranking.add((score, str(user_id)))
+
+    def slice(self, offset: int, stop: Optional[int]) -> List[Tuple[int, str]]:
+        size = len(self.ranking)
+        stop = size if stop is None else min(stop, size)
+        if offset >= stop:
+            return []
+        return list(self.ranking.islice(size - stop, size - offset, reverse=True))
+
+    def rank(self, user_id: int) -> int:
+        index = self.ranking.index((self.scores[user_id], str(user_id)))
+        return len(self.ranking) - index
+
+    def entries(self, keys: List[Tuple[int, str]]) -> List[dict]:
+        # Unnamed users show their ID, as the Redis engine does
+        return [
+            {"username": self.names.get(int(member)) or member, "score": score}
+            for score, member in keys
+        ]
+
+
+class MemoryLeaderboardEngine(BaseLeaderboardEngine):
+    """
+    In-process engine backed by an order-statistic sorted list, ranking and
+    breaking ties the same way as the Redis engine.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.boards: Dict[str, _Board] = {}
+
+    async def is_loaded(self, quiz_id: str) -> bool:
+        return quiz_id in self.boards
+
+    async def load(self, quiz_id: str, entries: List[dict]):
+        board = _Board()
+        for entry in entries:
+            board.scores[entry["user_id"]] = entry["score"]
+            board.names[entry["user_id"]] = entry["username"]
+        board.ranking.update(
+            (score, str(user_id)) for user_id, score in board.scores.items()
+        )
+        self.boards[quiz_id] = board
+
+    async def add(self, quiz_id: str, user_id: int, username: str, score: int = 0):
+        board = self.boards.setdefault(quiz_id, _Board())
+        board.names[user_id] = username
+        if user_id not in board.scores:
+            board.set_score(user_id, score)
+
+    async def increment(self, quiz_id: str, user_id: int, amount: int) -> int:
+        board = self.boards.setdefault(quiz_id, _Board())
+        new = board.scores.get(user_id, 0) + amount
+        board.set_score(user_id, new)
+        return new
+
+    async def top(self, quiz_id: str, limit: Optional[int] = None) -> List[dict]:
+        board = self.boards.get(quiz_id)
+        if board is None:
+            return []
+        return board.entries(board.slice(0, limit))
+
+    async def range(self, quiz_id: str, offset: int, limit: int) -> List[dict]:
+        board = self.boards.get(quiz_id)
+        if board is None:
+            return []
+        return board.entries(board.slice(offset, offset + limit))
+
+    async def rank(self, quiz_id: str, user_id: int) -> Optional[int]:
+        board = self.boards.get(quiz_id)
+        if board is None or user_id not in board.scores:
+            return None
+        return board.rank(user_id)
+
+    async def score(self, quiz_id: str, user_id: int) -> Optional[int]:
+        board = self.boards.get(quiz_id)
+        return board.scores.get(user_id) if board else None
+
+    async def count(self, quiz_id: str) -> int:
+        board = self.boards.get(quiz_id)
+        return len(board.scores) if board else 0
+
+    async def drop(self, quiz_id: str):
+        self.boards.pop(quiz_id, None)
@@ -0,0 +1,112 @@
+from typing import Dict, List, Optional
+
+from src.engines.base_leaderboard_engine import BaseLeaderboardEngine
+
+
+class RedisLeaderboardEngine(BaseLeaderboardEngine):
+    """
+    Engine backed by Redis sorted sets, shared by every worker. Usernames
+    live in a hash next to the sorted set so rankings only store user IDs.
+    """
+
+    KEY_PREFIX = "quiz:leaderboard:"
+
+    def __init__(self, redis):
+        super().__init__()
+        self.redis = redis
+
+    @classmethod
+    def from_url(cls, redis_url: str) -> "RedisLeaderboardEngine":
+        from redis import asyncio as aioredis
+
+        return cls(aioredis.from_url(redis_url, decode_responses=True))
+
+    async def stop(self):
+        await self.redis.aclose()
+
+    def _keys(self, quiz_id: str):
+        base = f"{self.KEY_PREFIX}{quiz_id}"
+        return f"{base}:scores", f"{base}:names", f"{base}:loaded"
+
+    async def _entries(self, quiz_id: str, ranked) -> List[dict]:
+        if not ranked:
+            return []
+        _, names_key, _ = self._keys(quiz_id)
+        names = await self.redis.hmget(names_key, [member for member, _ in ranked])
+        return [
+            {"username": name or member, "score": int(score)}
+            for (member, score), name in zip(ranked, names)
+        ]
+
+    async def is_loaded(self, quiz_id: str) -> bool:
+        _, _, loaded_key = self._keys(quiz_id)
+        return bool(await self.redis.exists(loaded_key))
+
+    async def load(self, quiz_id: str, entries: List[dict]):
+        # Seeds the board once across workers. Nothing is deleted and present
+        # members keep their score, so increments from a worker that loaded
+        # first are never overwritten.
+        scores_key, names_key, loaded_key = self._keys(quiz_id)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.set(loaded_key, 1, nx=True)
+        if entries:
+            pipe.zadd(
+                scores_key,
+                {str(entry["user_id"]): entry["score"] for entry in entries},
+                nx=True,
+            )
+            pipe.hset(
+                names_key,
+                mapping={str(entry["user_id"]): entry["username"] for entry in entries},
+            )
+        await pipe.execute()
+
+    async def add(self, quiz_id: str, user_id: int, username: str, score: int = 0):
+        scores_key, names_key, _ = self._keys(quiz_id)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.zadd(scores_key, {str(user_id): score}, nx=True)
+        pipe.hset(names_key, mapping={str(user_id): username})
+        await pipe.execute()
+
+    async def increment(self, quiz_id: str, user_id: int, amount: int) -> int:
+        scores_key, _, _ = self._keys(quiz_id)
+        return int(await self.redis.zincrby(scores_key, amount, str(user_id)))
+
+    async def increment_many(
+        self, quiz_id: str, amounts: Dict[int, int]
+    ) -> Dict[int, int]:
+        # One round trip for the whole batch
+        scores_key, _, _ = self._keys(quiz_id)
+        pipe = self.redis.pipeline(transaction=False)
+        for user_id, amount in amounts.items():
+            pipe.zincrby(scores_key, amount, str(user_id))
+        scores = await pipe.execute()
+        return {user_id: int(score) for user_id, score in zip(amounts, scores)}
+
+    async def top(self, quiz_id: str, limit: Optional[int] = None) -> List[dict]:
+        return await self.range(quiz_id, 0, limit if limit is not None else -1)
+
+    async def range(self, quiz_id: str, offset: int, limit: int) -> List[dict]:
+        scores_key, _, _ = self._keys(quiz_id)
+        stop = -1 if limit < 0 else offset + limit - 1
+        if stop != -1 and stop < offset:
+            return []
+        ranked = await self.redis.zrevrange(scores_key, offset, stop, withscores=True)
+        return await self._entries(quiz_id, ranked)
+
+    async def rank(self, quiz_id: str, user_id: int) -> Optional[int]:
+        scores_key, _, _ = self._keys(quiz_id)
+        rank = await self.redis.zrevrank(scores_key, str(user_id))
+        return None if rank is None else rank + 1
+
+    async def score(self, quiz_id: str, user_id: int) -> Optional[int]:
+        scores_key, _, _ = self._keys(quiz_id)
+        score = await self.redis.zscore(scores_key, str(user_id))
+        return None if score is None else int(score)
+
+    async def count(self, quiz_id: str) -> int:
+        scores_key, _, _ = self._keys(quiz_id)
+        return await self.redis.zcard(scores_key)
+
+    async def drop(self, quiz_id: str):
+        await self.redis.delete(*self._keys(quiz_id))
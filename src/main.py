@@ -5,16 +5,22 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from src.database import async_engine
+from src.database import async_engine, warm_up_pool
 from src.models.base import Base
+from src.realtime.connection_manager import manager
 from src.routers import auth, quiz, websocket
+from src.routers.websocket import actors, coalescer, scheduler
+from src.utils.dependencies import leaderboard_engine, score_aggregator
+from src.utils.hashing import bulk_password_hasher, password_hasher
 from src.utils.exceptions import (
+    HashingBusyException,
     InvalidAnswerException,
     InvalidCredentialsException,
     ParticipantNotFoundException,
     QuizNotFoundException,
     UserAlreadyExistsException,
     UserNotFoundException,
+    hashing_busy_handler,
     invalid_answer_handler,
     invalid_credentials_handler,
     participant_not_found_handler,
@@ -57,6 +63,7 @@ app.add_exception_handler(InvalidCredentialsException, invalid_credentials_handl
 app.add_exception_handler(QuizNotFoundException, quiz_not_found_handler)
 app.add_exception_handler(ParticipantNotFoundException, participant_not_found_handler)
 app.add_exception_handler(InvalidAnswerException, invalid_answer_handler)
+app.add_exception_handler(HashingBusyException, hashing_busy_handler)
 
 
 @app.get("/")
@@ -73,19 +80,40 @@ async def create_tables():
 async def startup_event():
     try:
         # await create_tables()
+        await manager.start()
+        await scheduler.start()
+        await score_aggregator.start()
+        await leaderboard_engine.start()
         logger_instance.info("Initialize application")
         # Any additional startup tasks can be added here
     except Exception as e:
         logger_instance.error(f"Error during startup: {e}")
+    # Last and on its own: an unreachable database at boot must not keep the
+    # background tasks above from starting
+    try:
+        await warm_up_pool()
+    except Exception as e:
+        logger_instance.error(f"Error warming up the database pool: {e}")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     try:
+        await actors.stop()
+        await scheduler.stop()
+        await coalescer.stop()
+        await manager.stop()
+        # Flush every pending score before the engine goes away
+        await score_aggregator.stop()
+        await leaderboard_engine.stop()
+        password_hasher.shutdown()
+        bulk_password_hasher.shutdown()
         await async_engine.dispose()
         logger_instance.info("Database engine disposed.")
     except Exception as e:
         logger_instance.error(f"Error during shutdown: {e}")
+    # Drain the enqueued log records before the process exits
+    await logger_instance.complete()
 
 
 if __name__ == "__main__":
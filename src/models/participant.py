@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from src.models.base import Base
@@ -14,3 +14,9 @@ class Participant(Base):
 
     user = relationship("User", back_populates="participant_quizzes")
     quiz_session = relationship("QuizSession", back_populates="participants")
+
+    __table_args__ = (
+        # Serves the leaderboard ORDER BY without sorting the whole quiz
+        Index("idx_participants_quiz_id_score", quiz_id, score.desc()),
+        Index("uq_participants_quiz_id_user_id", "quiz_id", "user_id", unique=True),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from src.models.base import Base
@@ -12,5 +12,9 @@ class Question(Base):
     text = Column(String, nullable=False)
     options = Column(String, nullable=False)  # Store as JSON string
     correct_option = Column(Integer, nullable=False)
+    # Seconds the question stays open; NULL uses QUESTION_DURATION_SECONDS
+    duration_seconds = Column(Integer, nullable=True)
 
     quiz_session = relationship("QuizSession", back_populates="questions")
+
+    __table_args__ = (Index("idx_questions_quiz_id", "quiz_id"),)
@@ -1,19 +1,24 @@
-from typing import List
+from typing import Dict, List
 
 from fastapi import WebSocket
 
 from src.observers.base_observer import BaseObserver
+from src.realtime.codec import Codec, negotiate_codec, send_payload
+from src.realtime.frame import Frame
 from src.utils.logger import LoggerSingleton
 
 
 class LeaderboardObserver(BaseObserver):
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.codecs: Dict[WebSocket, Codec] = {}
         self.logger = LoggerSingleton().logger
 
     async def connect(self, websocket: WebSocket):
-        await websocket.accept()
+        codec, subprotocol = negotiate_codec(websocket)
+        await websocket.accept(subprotocol=subprotocol)
         self.active_connections.append(websocket)
+        self.codecs[websocket] = codec
         self.logger.info(
             f"New WebSocket connection added. Total connections: {len(self.active_connections)}"
         )
@@ -21,6 +26,7 @@ class LeaderboardObserver(BaseObserver):
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+            self.codecs.pop(websocket, None)
             self.logger.info(
                 f"WebSocket connection removed. Total connections: {len(self.active_connections)}"
             )
@@ -33,10 +39,11 @@ class LeaderboardObserver(BaseObserver):
         self.logger.info(
             f"Broadcasting data to {len(self.active_connections)} active connections."
         )
+        frame = Frame(data)
         disconnected_clients = []
         for connection in self.active_connections:
             try:
-                await connection.send_json(data)
+                await send_payload(connection, frame.payload(self.codecs[connection]))
                 self.logger.debug(f"Data sent to connection: {connection.client}")
             except Exception as e:
                 self.logger.error(
@@ -0,0 +1,60 @@
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+ANSWER_IDEMPOTENCY_KEYS = int(os.getenv("ANSWER_IDEMPOTENCY_KEYS", 10000))
+
+
+class AnswerIndex:
+    """
+    Records which participants have answered which question of one quiz,
+    so resent submissions are recognised in memory. Participants get a
+    dense slot on their first answer and every question keeps a bitset
+    over the slots, which is one bit per participant per question.
+
+    Client-supplied idempotency keys are kept per participant, with the
+    reply they got, in an LRU bounded to ``max_keys``.
+    """
+
+    def __init__(self, max_keys: int = ANSWER_IDEMPOTENCY_KEYS):
+        self.max_keys = max_keys
+        self.slots: Dict[int, int] = {}
+        self.answered: Dict[str, bytearray] = {}
+        self.keys: "OrderedDict[Tuple[int, str], dict]" = OrderedDict()
+
+    def _slot(self, user_id: int) -> int:
+        slot = self.slots.get(user_id)
+        if slot is None:
+            slot = self.slots[user_id] = len(self.slots)
+        return slot
+
+    def has_answered(self, question_id: Any, user_id: int) -> bool:
+        bits = self.answered.get(str(question_id))
+        slot = self.slots.get(user_id)
+        if bits is None or slot is None or slot >> 3 >= len(bits):
+            return False
+        return bool(bits[slot >> 3] & (1 << (slot & 7)))
+
+    def mark_answered(self, question_id: Any, user_id: int):
+        slot = self._slot(user_id)
+        bits = self.answered.setdefault(str(question_id), bytearray())
+        if slot >> 3 >= len(bits):
+            # Grown a chunk at a time rather than a byte per new participant
+            bits.extend(bytes(max((slot >> 3) + 1 - len(bits), 64)))
+        bits[slot >> 3] |= 1 << (slot & 7)
+
+    def reply_for(self, user_id: int, key: Optional[str]) -> Optional[dict]:
+        if key is None:
+            return None
+        reply = self.keys.get((user_id, key))
+        if reply is not None:
+            self.keys.move_to_end((user_id, key))
+        return reply
+
+    def remember(self, user_id: int, key: Optional[str], reply: dict):
+        if key is None:
+            return
+        self.keys[(user_id, key)] = reply
+        self.keys.move_to_end((user_id, key))
+        while len(self.keys) > self.max_keys:
+            self.keys.popitem(last=False)
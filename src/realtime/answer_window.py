@@ -0,0 +1,73 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.caches import CachedQuestion
+from src.scoring import BaseScoringStrategy
+
+
+class AnswerWindow:
+    """
+    The server-side window in which the open question takes answers, on
+    the monotonic clock. Answers are only buffered here; they are graded
+    together when the window closes. Time spent paused neither counts
+    towards the deadline nor against an answer's speed.
+    """
+
+    def __init__(self, question: CachedQuestion, opened_at: float, duration: float):
+        self.question = question
+        self.opened_at = opened_at
+        self.closes_at = opened_at + duration
+        self.paused_at: Optional[float] = None
+        self.pauses: List[Tuple[float, float]] = []
+        self.user_ids: List[int] = []
+        self.options: List[int] = []
+        self.elapsed: List[float] = []
+        self.websockets: List[Any] = []
+
+    @property
+    def duration(self) -> float:
+        paused = sum(end - start for start, end in self.pauses)
+        return self.closes_at - self.opened_at - paused
+
+    def accepts(self, received_at: float) -> bool:
+        if not self.opened_at <= received_at <= self.closes_at:
+            return False
+        if self.paused_at is not None and received_at >= self.paused_at:
+            return False
+        return not any(start <= received_at < end for start, end in self.pauses)
+
+    def add(
+        self, user_id: int, selected_option: Any, received_at: float, websocket=None
+    ):
+        paused = sum(end - start for start, end in self.pauses if end <= received_at)
+        self.user_ids.append(user_id)
+        self.options.append(self.question.option_index(selected_option))
+        self.elapsed.append(received_at - self.opened_at - paused)
+        self.websockets.append(websocket)
+
+    def pause(self, now: float):
+        self.paused_at = now
+
+    def resume(self, now: float):
+        if self.paused_at is None:
+            return
+        self.pauses.append((self.paused_at, now))
+        self.closes_at += now - self.paused_at
+        self.paused_at = None
+
+    def grade(
+        self, strategy: BaseScoringStrategy, streaks: Dict[int, int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns whether each buffered answer is correct and its points."""
+        count = len(self.user_ids)
+        options = np.fromiter(self.options, dtype=np.int64, count=count)
+        elapsed = np.fromiter(self.elapsed, dtype=np.float64, count=count)
+        streak = np.fromiter(
+            (streaks.get(user_id, 0) for user_id in self.user_ids),
+            dtype=np.int64,
+            count=count,
+        )
+        correct = options == self.question.correct_option
+        points = strategy.score(correct, elapsed, self.duration, streak)
+        return correct, points
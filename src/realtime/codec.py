@@ -0,0 +1,111 @@
+import json
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import msgpack
+from fastapi import WebSocket
+from starlette.websockets import WebSocketDisconnect
+
+Payload = Union[str, bytes]
+
+
+class Raw:
+    """A value that has already been encoded with the codec it is used with."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: Payload):
+        self.payload = payload
+
+
+class JsonCodec:
+    name = "json"
+    binary = False
+
+    def encode(self, obj: Any) -> str:
+        return json.dumps(obj)
+
+    def decode(self, data: Payload) -> Any:
+        return json.loads(data)
+
+    def encode_map(self, items: Iterable[Tuple[str, Any]]) -> str:
+        parts = [
+            f"{json.dumps(key)}: "
+            + (value.payload if isinstance(value, Raw) else json.dumps(value))
+            for key, value in items
+        ]
+        return "{" + ", ".join(parts) + "}"
+
+
+class MsgpackCodec:
+    name = "msgpack"
+    binary = True
+
+    def encode(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def decode(self, data: Payload) -> Any:
+        # Clients may still send the occasional text frame
+        if isinstance(data, str):
+            return json.loads(data)
+        return msgpack.unpackb(data, raw=False)
+
+    def encode_map(self, items: Iterable[Tuple[str, Any]]) -> bytes:
+        items = list(items)
+        parts = [self._map_header(len(items))]
+        for key, value in items:
+            parts.append(msgpack.packb(key, use_bin_type=True))
+            parts.append(
+                value.payload
+                if isinstance(value, Raw)
+                else msgpack.packb(value, use_bin_type=True)
+            )
+        return b"".join(parts)
+
+    @staticmethod
+    def _map_header(size: int) -> bytes:
+        if size < 16:
+            return bytes([0x80 | size])
+        if size < 0x10000:
+            return b"\xde" + size.to_bytes(2, "big")
+        return b"\xdf" + size.to_bytes(4, "big")
+
+
+JSON_CODEC = JsonCodec()
+MSGPACK_CODEC = MsgpackCodec()
+CODECS: Dict[str, Union[JsonCodec, MsgpackCodec]] = {
+    JSON_CODEC.name: JSON_CODEC,
+    MSGPACK_CODEC.name: MSGPACK_CODEC,
+}
+Codec = Union[JsonCodec, MsgpackCodec]
+
+
+def negotiate_codec(websocket: WebSocket) -> Tuple[Codec, Optional[str]]:
+    """
+    Picks the wire encoding for a socket. A matching ``Sec-WebSocket-Protocol``
+    wins and is echoed back on accept; otherwise ``?encoding=`` is honoured.
+    JSON is the default.
+    """
+    for subprotocol in websocket.scope.get("subprotocols", []):
+        if subprotocol in CODECS:
+            return CODECS[subprotocol], subprotocol
+    encoding = websocket.query_params.get("encoding")
+    if encoding in CODECS:
+        return CODECS[encoding], None
+    return JSON_CODEC, None
+
+
+async def send_payload(websocket: WebSocket, payload: Payload):
+    if isinstance(payload, bytes):
+        await websocket.send_bytes(payload)
+    else:
+        await websocket.send_text(payload)
+
+
+async def receive_message(websocket: WebSocket, codec: Codec) -> Any:
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    data = message.get("text")
+    if data is None:
+        data = message.get("bytes")
+    return codec.decode(data)
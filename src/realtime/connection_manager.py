@@ -0,0 +1,204 @@
+import asyncio
+import os
+from functools import partial
+from typing import Any, Dict, List, Optional
+
+from fastapi import WebSocket
+
+from src.broadcasters import BaseBroadcaster, create_broadcaster
+from src.realtime.codec import (
+    JSON_CODEC,
+    Codec,
+    negotiate_codec,
+    receive_message,
+)
+from src.realtime.connection_writer import ConnectionWriter
+from src.realtime.frame import Frame
+from src.realtime.leaderboard_delta import LeaderboardState
+from src.realtime.leaderboard_views import (
+    LeaderboardView,
+    LeaderboardViewer,
+    LeaderboardViewRenderer,
+)
+from src.schemas.leaderboard import Leaderboard
+from src.utils.logger import LoggerSingleton
+
+logger = LoggerSingleton().logger
+
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", 64))
+WS_MAX_LAG_SECONDS = float(os.getenv("WS_MAX_LAG_SECONDS", 5))
+
+
+class ConnectionManager:
+    """
+    Tracks the sockets connected to this worker. Broadcasts go through the
+    broadcaster so that every worker holding sockets for the quiz receives
+    them, and each worker only serializes and sends to its own sockets.
+
+    Full leaderboards travel over the broadcaster; each worker turns them
+    into sequenced deltas against what its own sockets last saw. Sockets
+    that asked for a ``top_n`` or ``around_me`` view get a constant-size
+    view message instead.
+    """
+
+    def __init__(
+        self,
+        broadcaster: Optional[BaseBroadcaster] = None,
+        max_queue: int = WS_SEND_QUEUE_SIZE,
+        max_lag: float = WS_MAX_LAG_SECONDS,
+    ):
+        self.active_connections: Dict[str, List[WebSocket]] = {}
+        self.writers: Dict[WebSocket, ConnectionWriter] = {}
+        self.leaderboards: Dict[str, LeaderboardState] = {}
+        self.viewers: Dict[WebSocket, LeaderboardViewer] = {}
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.broadcaster = broadcaster or create_broadcaster()
+        self.broadcaster.set_handler(self.deliver_local)
+
+    async def start(self):
+        await self.broadcaster.start()
+
+    async def stop(self):
+        for writer in list(self.writers.values()):
+            await writer.stop()
+        await self.broadcaster.stop()
+
+    async def connect(
+        self,
+        quiz_id: str,
+        websocket: WebSocket,
+        username: Optional[str] = None,
+        view: Optional[LeaderboardView] = None,
+    ):
+        codec, subprotocol = negotiate_codec(websocket)
+        await websocket.accept(subprotocol=subprotocol)
+        if quiz_id not in self.active_connections:
+            self.active_connections[quiz_id] = []
+            await self.broadcaster.subscribe(quiz_id)
+        self.active_connections[quiz_id].append(websocket)
+        writer = ConnectionWriter(
+            websocket,
+            codec=codec,
+            max_queue=self.max_queue,
+            max_lag=self.max_lag,
+            on_close=lambda w: self._drop_slow(quiz_id, w),
+        )
+        self.writers[websocket] = writer
+        self.viewers[websocket] = LeaderboardViewer(username, view or LeaderboardView())
+        writer.start()
+        self.send_snapshot(quiz_id, websocket)
+        logger.info(f"WebSocket connection established for quiz ID: {quiz_id}")
+
+    async def disconnect(self, quiz_id: str, websocket: WebSocket):
+        # Bookkeeping comes before any await, so a cancelled handler still
+        # leaves nothing behind
+        writer = self.writers.pop(websocket, None)
+        self.viewers.pop(websocket, None)
+        connections = self.active_connections.get(quiz_id)
+        last = False
+        if connections and websocket in connections:
+            connections.remove(websocket)
+            if not connections:
+                del self.active_connections[quiz_id]
+                self.leaderboards.pop(quiz_id, None)
+                last = True
+        if writer:
+            await writer.stop()
+        if last:
+            await self.broadcaster.unsubscribe(quiz_id)
+        logger.info(f"WebSocket connection closed for quiz ID: {quiz_id}")
+
+    def _drop_slow(self, quiz_id: str, writer: ConnectionWriter):
+        # Stop fanning out to the socket right away; the endpoint cleans up
+        # the rest when its receive loop sees the close
+        connections = self.active_connections.get(quiz_id)
+        if connections and writer.websocket in connections:
+            connections.remove(writer.websocket)
+            if not connections:
+                del self.active_connections[quiz_id]
+                self.leaderboards.pop(quiz_id, None)
+                asyncio.create_task(self.broadcaster.unsubscribe(quiz_id))
+
+    def codec_for(self, websocket: WebSocket) -> Codec:
+        writer = self.writers.get(websocket)
+        return writer.codec if writer else JSON_CODEC
+
+    async def receive(self, websocket: WebSocket) -> Any:
+        return await receive_message(websocket, self.codec_for(websocket))
+
+    async def send_personal(self, websocket: WebSocket, message: dict):
+        writer = self.writers.get(websocket)
+        if writer:
+            writer.send(writer.codec.encode(message))
+
+    def set_view(self, quiz_id: str, websocket: WebSocket, view: LeaderboardView):
+        viewer = self.viewers.get(websocket)
+        if viewer and viewer.view != view:
+            self.viewers[websocket] = LeaderboardViewer(viewer.username, view)
+            self.send_snapshot(quiz_id, websocket)
+
+    def send_snapshot(self, quiz_id: str, websocket: WebSocket):
+        # Sent on join and when a client reports a gap in the delta sequence
+        state = self.leaderboards.get(quiz_id)
+        writer = self.writers.get(websocket)
+        viewer = self.viewers.get(websocket)
+        if not (state and state.seq and writer and viewer):
+            return
+        if viewer.view.kind == "full":
+            writer.send_leaderboard(state.snapshot_payload(writer.codec))
+        else:
+            viewer.last_sent = None
+            writer.send_leaderboard(
+                LeaderboardViewRenderer(state).render(viewer, writer.codec)
+            )
+
+    async def broadcast_leaderboard(self, quiz_id: str, leaderboard: Leaderboard):
+        await self.broadcaster.publish(
+            quiz_id, {"type": "leaderboard_update", "data": leaderboard.dict()}
+        )
+        logger.debug("Published leaderboard update for quiz ID: {}", quiz_id)
+
+    async def broadcast(self, quiz_id: str, message: dict):
+        await self.broadcaster.publish(quiz_id, message)
+        logger.debug("Published {} for quiz ID: {}", message.get("type"), quiz_id)
+
+    async def deliver_local(self, quiz_id: str, message: dict):
+        connections = self.active_connections.get(quiz_id)
+        if not connections:
+            return
+        if message.get("type") == "leaderboard_update":
+            state = self.leaderboards.setdefault(quiz_id, LeaderboardState(quiz_id))
+            frame = state.apply(message["data"]["entries"])
+            if frame is None:
+                return
+            renderer = LeaderboardViewRenderer(state)
+            for connection in list(connections):
+                writer = self.writers.get(connection)
+                viewer = self.viewers.get(connection)
+                if not (writer and viewer):
+                    continue
+                if viewer.view.kind == "full":
+                    writer.send_leaderboard(
+                        frame.payload(writer.codec),
+                        partial(state.snapshot_payload, writer.codec),
+                    )
+                    continue
+                payload = renderer.render(viewer, writer.codec)
+                if payload is not None:
+                    writer.send_leaderboard(payload)
+        else:
+            frame = Frame(message)
+            for connection in list(connections):
+                writer = self.writers.get(connection)
+                if writer:
+                    writer.send(frame.payload(writer.codec))
+        logger.debug(
+            "Queued {} for {} local connections for quiz ID: {}",
+            frame.type,
+            len(connections),
+            quiz_id,
+        )
+
+
+manager = ConnectionManager()
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Union
+
+from fastapi import WebSocket
+
+from src.realtime.codec import JSON_CODEC, Codec, Payload, send_payload
+from src.utils.logger import LoggerSingleton
+
+logger = LoggerSingleton().logger
+
+
+class ConnectionWriter:
+    """
+    Owns all outbound traffic for one socket. Messages are queued without
+    blocking the caller and written by a dedicated task, so a stalled client
+    only ever delays itself.
+
+    Leaderboard frames use a "latest wins" slot: if a newer leaderboard
+    arrives before the previous one was written, the stale one is dropped.
+    Since leaderboard frames are deltas, dropping one leaves the client with
+    a gap, so the slot then falls back to a snapshot rendered at send time.
+    A client whose queue overflows, or that makes no progress for
+    ``max_lag`` seconds while it has pending data, is disconnected.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        codec: Codec = JSON_CODEC,
+        max_queue: int = 64,
+        max_lag: float = 5.0,
+        on_close: Optional[Callable[["ConnectionWriter"], None]] = None,
+    ):
+        self.websocket = websocket
+        self.codec = codec
+        self.max_queue = max_queue
+        self.max_lag = max_lag
+        self.on_close = on_close
+        self.queue: Deque[Payload] = deque()
+        self.latest_leaderboard: Union[Payload, Callable[[], Payload], None] = None
+        self.dropped = 0
+        self.closed = False
+        self._wakeup = asyncio.Event()
+        self._last_progress = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    @property
+    def pending(self) -> int:
+        return len(self.queue) + (1 if self.latest_leaderboard is not None else 0)
+
+    def send(self, payload: Payload) -> bool:
+        if self.closed or self._is_lagging():
+            return False
+        if len(self.queue) >= self.max_queue:
+            self._abort("send queue overflow")
+            return False
+        self._mark_idle_progress()
+        self.queue.append(payload)
+        self._wakeup.set()
+        return True
+
+    def send_leaderboard(
+        self, payload: Payload, snapshot: Optional[Callable[[], Payload]] = None
+    ) -> bool:
+        if self.closed or self._is_lagging():
+            return False
+        self._mark_idle_progress()
+        if self.latest_leaderboard is not None:
+            self.dropped += 1
+            if snapshot is not None:
+                payload = snapshot
+        self.latest_leaderboard = payload
+        self._wakeup.set()
+        return True
+
+    async def stop(self):
+        self.closed = True
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def _mark_idle_progress(self):
+        # An idle writer has no lag to account for
+        if self.pending == 0:
+            self._last_progress = time.monotonic()
+
+    def _is_lagging(self) -> bool:
+        if self.pending and time.monotonic() - self._last_progress > self.max_lag:
+            self._abort(f"no progress for {self.max_lag}s")
+            return True
+        return False
+
+    def _next_payload(self) -> Optional[Payload]:
+        # Direct replies keep their order; the leaderboard goes out last so it
+        # is as fresh as possible when it does
+        if self.queue:
+            return self.queue.popleft()
+        payload, self.latest_leaderboard = self.latest_leaderboard, None
+        if callable(payload):
+            payload = payload()
+        return payload
+
+    async def _run(self):
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                payload = self._next_payload()
+                while payload is not None and not self.closed:
+                    await asyncio.wait_for(
+                        send_payload(self.websocket, payload), timeout=self.max_lag
+                    )
+                    self._last_progress = time.monotonic()
+                    payload = self._next_payload()
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self._abort(f"send blocked for more than {self.max_lag}s")
+        except Exception as e:
+            self._abort(f"send failed: {str(e)}")
+
+    def _abort(self, reason: str):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.clear()
+        self.latest_leaderboard = None
+        logger.warning(f"Disconnecting slow WebSocket client {self._client}: {reason}")
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+        asyncio.create_task(self._close())
+        if self.on_close:
+            self.on_close(self)
+
+    async def _close(self):
+        try:
+            await self.websocket.close(code=1013, reason="Client too slow")
+        except Exception as e:
+            logger.debug(f"Error closing slow WebSocket client: {str(e)}")
+
+    @property
+    def _client(self):
+        return getattr(self.websocket, "client", None)
@@ -0,0 +1,36 @@
+from types import MappingProxyType
+from typing import Dict, Mapping
+
+from src.realtime.codec import Codec, Payload
+
+
+class Frame:
+    """
+    One outbound message, encoded at most once per codec and handed as the
+    same ``str``/``bytes`` object to every socket that receives it.
+    """
+
+    __slots__ = ("_message", "_payloads")
+
+    def __init__(self, message: dict):
+        object.__setattr__(self, "_message", MappingProxyType(message))
+        object.__setattr__(self, "_payloads", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Frame is immutable")
+
+    @property
+    def message(self) -> Mapping:
+        return self._message
+
+    @property
+    def type(self) -> str:
+        return self._message.get("type")
+
+    def payload(self, codec: Codec) -> Payload:
+        payloads: Dict[str, Payload] = self._payloads
+        payload = payloads.get(codec.name)
+        if payload is None:
+            payload = codec.encode(dict(self._message))
+            payloads[codec.name] = payload
+        return payload
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Awaitable, Callable, Dict
+
+from src.schemas.leaderboard import Leaderboard
+from src.utils.logger import LoggerSingleton
+
+logger = LoggerSingleton().logger
+
+LeaderboardLoader = Callable[[str], Awaitable[Leaderboard]]
+LeaderboardPublisher = Callable[[str, Leaderboard], Awaitable[None]]
+
+
+class LeaderboardCoalescer:
+    """
+    Collapses bursts of score updates into at most one leaderboard query and
+    broadcast per quiz per tick. Score changes only mark the quiz dirty; the
+    first mark schedules a flush ``tick`` seconds later and further marks in
+    that window are free.
+    """
+
+    def __init__(
+        self,
+        loader: LeaderboardLoader,
+        publisher: LeaderboardPublisher,
+        tick: float = 0.2,
+    ):
+        self.loader = loader
+        self.publisher = publisher
+        self.tick = tick
+        self._scheduled: Dict[str, asyncio.Task] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def mark_dirty(self, quiz_id: str):
+        if quiz_id not in self._scheduled:
+            self._scheduled[quiz_id] = asyncio.create_task(self._flush_later(quiz_id))
+
+    async def flush_now(self, quiz_id: str):
+        task = self._scheduled.pop(quiz_id, None)
+        if task:
+            task.cancel()
+        await self._flush(quiz_id)
+
+    async def stop(self):
+        tasks = list(self._scheduled.values())
+        self._scheduled.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _flush_later(self, quiz_id: str):
+        await asyncio.sleep(self.tick)
+        # Unschedule before flushing so updates during the flush start a new tick
+        self._scheduled.pop(quiz_id, None)
+        await self._flush(quiz_id)
+
+    async def _flush(self, quiz_id: str):
+        lock = self._locks.setdefault(quiz_id, asyncio.Lock())
+        async with lock:
+            try:
+                leaderboard = await self.loader(quiz_id)
+                await self.publisher(quiz_id, leaderboard)
+            except Exception as e:
+                logger.error(
+                    f"Error flushing leaderboard for quiz ID {quiz_id}: {str(e)}"
+                )
+        if not lock.locked() and quiz_id not in self._scheduled:
+            self._locks.pop(quiz_id, None)
@@ -0,0 +1,70 @@
+from typing import Dict, List, Optional, Tuple
+
+from src.realtime.codec import Codec, Payload
+from src.realtime.frame import Frame
+
+
+class LeaderboardState:
+    """
+    Last leaderboard sent to the sockets of one quiz on this worker.
+
+    Each applied leaderboard bumps ``seq`` and yields a ``leaderboard_delta``
+    carrying only entries whose score or rank changed, plus usernames that
+    dropped off. Clients apply deltas in order and ask for a snapshot (join
+    or ``resync``) when they see a gap in ``seq``.
+    """
+
+    def __init__(self, quiz_id: str):
+        self.quiz_id = quiz_id
+        self.seq = 0
+        self.entries: List[dict] = []
+        self.positions: Dict[str, Tuple[int, int]] = {}  # username -> (rank, score)
+        self._snapshot: Optional[Frame] = None
+
+    def apply(self, entries: List[dict]) -> Optional[Frame]:
+        positions = {
+            entry["username"]: (rank, entry["score"])
+            for rank, entry in enumerate(entries, start=1)
+        }
+        changes = [
+            {"username": username, "score": score, "rank": rank}
+            for username, (rank, score) in positions.items()
+            if self.positions.get(username) != (rank, score)
+        ]
+        removed = [username for username in self.positions if username not in positions]
+        if not changes and not removed:
+            return None
+
+        self.seq += 1
+        self.entries = [
+            {"username": entry["username"], "score": entry["score"]}
+            for entry in entries
+        ]
+        self.positions = positions
+        self._snapshot = None
+        return Frame(
+            {
+                "type": "leaderboard_delta",
+                "seq": self.seq,
+                "data": {
+                    "quiz_id": self.quiz_id,
+                    "changes": changes,
+                    "removed": removed,
+                },
+            }
+        )
+
+    def snapshot(self) -> Frame:
+        # One frame per seq, however many clients join or resync
+        if self._snapshot is None:
+            self._snapshot = Frame(
+                {
+                    "type": "leaderboard_update",
+                    "seq": self.seq,
+                    "data": {"quiz_id": self.quiz_id, "entries": self.entries},
+                }
+            )
+        return self._snapshot
+
+    def snapshot_payload(self, codec: Codec) -> Payload:
+        return self.snapshot().payload(codec)
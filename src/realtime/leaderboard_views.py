@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from src.realtime.codec import Codec, Payload, Raw
+from src.realtime.leaderboard_delta import LeaderboardState
+
+VIEW_KINDS = ("full", "top_n", "around_me")
+DEFAULT_TOP_N = 10
+MAX_TOP_N = 100
+MAX_AROUND_K = 25
+
+
+@dataclass(frozen=True)
+class LeaderboardView:
+    """
+    What a connection wants to see: ``full`` gets the sequenced deltas,
+    ``top_n`` gets the top ``n`` plus its own rank, ``around_me`` also gets
+    the ``k`` entries either side of its own rank.
+    """
+
+    kind: str = "full"
+    n: int = DEFAULT_TOP_N
+    k: int = 0
+
+    @classmethod
+    def parse(cls, kind: Optional[str], n=None, k=None) -> "LeaderboardView":
+        kind = kind or "full"
+        if kind not in VIEW_KINDS:
+            raise ValueError(f"Unknown leaderboard view: {kind}")
+        n = min(max(int(n if n is not None else DEFAULT_TOP_N), 0), MAX_TOP_N)
+        k = min(max(int(k if k is not None else 0), 0), MAX_AROUND_K)
+        if kind != "around_me":
+            k = 0
+        return cls(kind=kind, n=n, k=k)
+
+
+@dataclass
+class LeaderboardViewer:
+    username: Optional[str]
+    view: LeaderboardView
+    last_sent: Optional[Tuple[Any, ...]] = None
+
+
+class LeaderboardViewRenderer:
+    """
+    Renders view messages for one leaderboard update. The shared top-N block
+    is encoded once per distinct ``n`` and codec; each socket only adds the
+    small part describing its own position.
+    """
+
+    def __init__(self, state: LeaderboardState):
+        self.state = state
+        self._tops: Dict[Tuple[str, int], Raw] = {}
+
+    def _top(self, n: int, codec: Codec) -> Raw:
+        top = self._tops.get((codec.name, n))
+        if top is None:
+            top = Raw(
+                codec.encode(
+                    [
+                        {
+                            "username": entry["username"],
+                            "score": entry["score"],
+                            "rank": rank,
+                        }
+                        for rank, entry in enumerate(self.state.entries[:n], start=1)
+                    ]
+                )
+            )
+            self._tops[(codec.name, n)] = top
+        return top
+
+    def _around(self, rank: int, k: int) -> list:
+        start = max(rank - 1 - k, 0)
+        return [
+            {"username": entry["username"], "score": entry["score"], "rank": index}
+            for index, entry in enumerate(
+                self.state.entries[start : rank + k], start=start + 1
+            )
+        ]
+
+    def render(self, viewer: LeaderboardViewer, codec: Codec) -> Optional[Payload]:
+        """Returns None when this viewer would see nothing new."""
+        total = len(self.state.entries)
+        top_entries = self.state.entries[: viewer.view.n]
+        position = self.state.positions.get(viewer.username)
+        me = around = None
+        if position is not None:
+            rank, score = position
+            me = {"username": viewer.username, "score": score, "rank": rank}
+            if viewer.view.k:
+                around = self._around(rank, viewer.view.k)
+
+        fingerprint = (total, top_entries, me, around)
+        if fingerprint == viewer.last_sent:
+            return None
+        viewer.last_sent = fingerprint
+
+        data = [
+            ("quiz_id", self.state.quiz_id),
+            ("total", total),
+            ("top", self._top(viewer.view.n, codec)),
+            ("me", me),
+        ]
+        if viewer.view.k:
+            data.append(("around", around or []))
+        return codec.encode_map(
+            [
+                ("type", "leaderboard_view"),
+                ("seq", self.state.seq),
+                ("data", Raw(codec.encode_map(data))),
+            ]
+        )
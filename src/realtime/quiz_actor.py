@@ -0,0 +1,567 @@
+import asyncio
+import os
+import uuid
+import weakref
+from collections import defaultdict
+from typing import (
+    Any,
+    AsyncContextManager,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Set,
+    Type,
+)
+
+from fastapi import HTTPException, WebSocket
+
+from src.broadcasters import BaseBroadcaster
+from src.commands.base_command import BaseCommand
+from src.commands.end_quiz_command import EndQuizCommand
+from src.commands.pause_quiz_command import PauseQuizCommand
+from src.commands.quiz_timer_command import QuizTimerCommand
+from src.commands.resume_quiz_command import ResumeQuizCommand
+from src.commands.skip_question_command import SkipQuestionCommand
+from src.commands.start_quiz_command import StartQuizCommand
+from src.commands.submit_answer_command import SubmitAnswerCommand
+from src.realtime.answer_index import AnswerIndex
+from src.realtime.answer_window import AnswerWindow
+from src.realtime.leaderboard_coalescer import LeaderboardCoalescer
+from src.realtime.quiz_timeline import QuizTimeline
+from src.realtime.timer_scheduler import TimerHandle, TimerScheduler
+from src.scoring import BaseScoringStrategy, create_scoring_strategy
+from src.services.quiz_service import QuizService
+from src.utils.logger import LoggerSingleton
+from src.utils.metrics import QUIZ_ACTOR_MAILBOX_DEPTH, QUIZ_ACTORS_ACTIVE
+
+logger = LoggerSingleton().logger
+
+QUIZ_ACTOR_MAILBOX_SIZE = int(os.getenv("QUIZ_ACTOR_MAILBOX_SIZE", 1024))
+QUIZ_ACTOR_IDLE_SECONDS = float(os.getenv("QUIZ_ACTOR_IDLE_SECONDS", 300))
+# Commands for a quiz owned by another worker are forwarded to it; set to
+# false to refuse them instead
+QUIZ_FORWARD_COMMANDS = os.getenv("QUIZ_FORWARD_COMMANDS", "true").lower() == "true"
+
+ServiceScope = Callable[[], AsyncContextManager[QuizService]]
+Sender = Callable[[WebSocket, dict], Awaitable[None]]
+Broadcaster = Callable[[str, dict], Awaitable[None]]
+
+# Commands a socket can send, which may be forwarded to the quiz's owner
+FORWARDED_COMMANDS: Dict[str, Type[BaseCommand]] = {
+    command.__name__: command
+    for command in (
+        SubmitAnswerCommand,
+        StartQuizCommand,
+        PauseQuizCommand,
+        ResumeQuizCommand,
+        SkipQuestionCommand,
+        EndQuizCommand,
+    )
+}
+
+
+class QuizActor:
+    """
+    Owns one live quiz on this worker. Commands are put on a bounded mailbox
+    and executed one at a time by a single task, so room state is changed
+    without locks and a participant's answers are applied in arrival order.
+    Scores live in the score aggregator, which snapshots them to the
+    database in the background.
+
+    A started quiz's question timeline is driven by the shared
+    TimerScheduler, whose timers post QuizTimerCommands back to the
+    mailbox so they are ordered with the answers around them. Answers are
+    buffered in the open question's AnswerWindow and scored in one batch
+    when it closes.
+
+    The actor exits once the quiz has ended and its mailbox is empty, or
+    after ``idle_timeout`` seconds without commands while no timeline runs.
+    """
+
+    def __init__(
+        self,
+        quiz_id: str,
+        service_scope: ServiceScope,
+        send: Sender,
+        broadcast: Broadcaster,
+        coalescer: LeaderboardCoalescer,
+        scheduler: TimerScheduler,
+        scoring: Optional[BaseScoringStrategy] = None,
+        mailbox_size: int = QUIZ_ACTOR_MAILBOX_SIZE,
+        idle_timeout: float = QUIZ_ACTOR_IDLE_SECONDS,
+        on_exit: Optional[Callable[["QuizActor"], None]] = None,
+    ):
+        self.quiz_id = quiz_id
+        self.service_scope = service_scope
+        self.send = send
+        self.broadcast = broadcast
+        self.coalescer = coalescer
+        self.scheduler = scheduler
+        self.scoring = scoring or create_scoring_strategy()
+        self.idle_timeout = idle_timeout
+        self.on_exit = on_exit
+        self.mailbox: asyncio.Queue = asyncio.Queue(maxsize=mailbox_size)
+        # Room state, only touched from the actor's task
+        self.status: Optional[str] = None
+        self.timeline: Optional[QuizTimeline] = None
+        self.window: Optional[AnswerWindow] = None
+        self.answers = AnswerIndex()
+        # Consecutive correct answers per participant
+        self.streaks: Dict[int, int] = {}
+        # Seconds left on the current step while paused
+        self.paused_remaining: Optional[float] = None
+        self.timer_seq = 0
+        self.closed = False
+        self._timer: Optional[TimerHandle] = None
+        self._posts: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            QUIZ_ACTORS_ACTIVE.inc()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._cancel_timer()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def tell(self, command: BaseCommand):
+        """Queues a command, waiting for room in the mailbox if it is full."""
+        await self.mailbox.put(command)
+        QUIZ_ACTOR_MAILBOX_DEPTH.inc()
+
+    def post(self, command: BaseCommand):
+        """Queues a command without waiting, for callers that can't block."""
+        if self.closed:
+            return
+        try:
+            self.mailbox.put_nowait(command)
+            QUIZ_ACTOR_MAILBOX_DEPTH.inc()
+        except asyncio.QueueFull:
+            task = asyncio.create_task(self.tell(command))
+            self._posts.add(task)
+            task.add_done_callback(self._posts.discard)
+
+    async def reply(self, websocket: Optional[WebSocket], message: dict):
+        if websocket is not None:
+            await self.send(websocket, message)
+
+    def leaderboard_changed(self):
+        # The leaderboard is recomputed and broadcast once per tick
+        self.coalescer.mark_dirty(self.quiz_id)
+
+    async def publish_leaderboard(self):
+        await self.coalescer.flush_now(self.quiz_id)
+
+    @property
+    def running(self) -> bool:
+        return self.timeline is not None and not self.timeline.ended
+
+    def _schedule_step(self, delay: float):
+        self._cancel_timer()
+        self._timer = self.scheduler.call_later(
+            delay, self.post, QuizTimerCommand(self.timer_seq)
+        )
+
+    def _cancel_timer(self):
+        # Bumping the sequence also voids a timer that fired but is queued
+        self.scheduler.cancel(self._timer)
+        self._timer = None
+        self.timer_seq += 1
+
+    async def start_timeline(self, timeline: QuizTimeline, quiz_service: QuizService):
+        self.timeline = timeline
+        self.paused_remaining = None
+        self.answers = AnswerIndex()
+        await self.step(quiz_service)
+
+    async def step(self, quiz_service: QuizService):
+        """Moves the timeline to its next event and schedules the one after."""
+        event = self.timeline.step()
+        if event.kind == "quiz_end":
+            await self.end(quiz_service)
+            return
+        if event.kind == "question_start":
+            question = event.question
+            self.window = AnswerWindow(question, self.scheduler.clock(), event.delay)
+            message = {
+                "type": "new_question",
+                "data": {
+                    "id": question.id,
+                    "text": question.text,
+                    "options": list(question.options),
+                    "index": event.index,
+                    "total": len(self.timeline.questions),
+                    "duration": event.delay,
+                },
+            }
+        else:
+            await self.close_window(quiz_service)
+            message = {
+                "type": "question_closed",
+                "data": {
+                    "id": event.question.id,
+                    "index": event.index,
+                    "correct_option": event.question.correct_option,
+                },
+            }
+        self._schedule_step(event.delay)
+        await self.broadcast(self.quiz_id, message)
+
+    def pause(self) -> float:
+        if not self.running:
+            raise ValueError("Quiz is not running.")
+        if self.paused_remaining is not None:
+            raise ValueError("Quiz is already paused.")
+        now = self.scheduler.clock()
+        self.paused_remaining = self._timer.remaining(now)
+        self._cancel_timer()
+        if self.window is not None:
+            self.window.pause(now)
+        return self.paused_remaining
+
+    def resume(self) -> float:
+        if self.paused_remaining is None:
+            raise ValueError("Quiz is not paused.")
+        remaining, self.paused_remaining = self.paused_remaining, None
+        if self.window is not None:
+            self.window.resume(self.scheduler.clock())
+        self._schedule_step(remaining)
+        return remaining
+
+    async def skip(self, quiz_service: QuizService):
+        if not self.running:
+            raise ValueError("Quiz is not running.")
+        # Skipping also resumes a paused quiz
+        self.paused_remaining = None
+        if self.window is not None:
+            self.window.resume(self.scheduler.clock())
+        self._cancel_timer()
+        await self.step(quiz_service)
+
+    async def end(self, quiz_service: QuizService):
+        self._cancel_timer()
+        if self.timeline is not None:
+            self.timeline.phase = "ended"
+        self.paused_remaining = None
+        if self.window is not None:
+            await self.close_window(quiz_service)
+        # Answers queued before this point have been applied; persist them
+        # and push the final standings without waiting for the next tick
+        await quiz_service.end_quiz(self.quiz_id)
+        self.status = "completed"
+        await self.publish_leaderboard()
+        await self.broadcast(
+            self.quiz_id, {"type": "quiz_end", "message": "Quiz has ended!"}
+        )
+
+    async def close_window(self, quiz_service: QuizService):
+        """Grades every answer the open question received in one batch."""
+        window, self.window = self.window, None
+        if not window.user_ids:
+            self.streaks = {}
+            return
+        correct, points = window.grade(self.scoring, self.streaks)
+        correct, points = correct.tolist(), points.tolist()
+        increments: Dict[int, int] = {}
+        streaks: Dict[int, int] = {}
+        for user_id, is_correct, earned in zip(window.user_ids, correct, points):
+            # A question left unanswered breaks the streak too
+            streaks[user_id] = self.streaks.get(user_id, 0) + 1 if is_correct else 0
+            if earned:
+                increments[user_id] = increments.get(user_id, 0) + earned
+        self.streaks = streaks
+        scores: Dict[int, int] = {}
+        if increments:
+            # The whole window in one call, written back as one UPDATE
+            scores = await quiz_service.update_scores(self.quiz_id, increments)
+            self.leaderboard_changed()
+        for user_id, websocket, is_correct, earned in zip(
+            window.user_ids, window.websockets, correct, points
+        ):
+            if user_id not in scores:
+                # Not a participant, so nothing was saved for them
+                earned = 0
+            await self.reply(
+                websocket,
+                {
+                    "type": "answer_result",
+                    "data": {
+                        "question_id": window.question.id,
+                        "result": "correct" if is_correct else "incorrect",
+                        "points": earned,
+                    },
+                },
+            )
+
+    async def _next_command(self) -> Optional[BaseCommand]:
+        try:
+            command = await asyncio.wait_for(self.mailbox.get(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            return None
+        QUIZ_ACTOR_MAILBOX_DEPTH.dec()
+        return command
+
+    async def _run(self):
+        try:
+            while True:
+                command = await self._next_command()
+                if command is None:
+                    if self.mailbox.empty() and not self.running:
+                        break
+                    continue
+                await self._execute(command)
+                self.mailbox.task_done()
+                if self.status == "completed" and self.mailbox.empty():
+                    break
+        finally:
+            # No await between here and the registry forgetting the actor, so
+            # nothing can be queued on a mailbox nobody reads
+            self.closed = True
+            QUIZ_ACTORS_ACTIVE.dec()
+            QUIZ_ACTOR_MAILBOX_DEPTH.dec(self.mailbox.qsize())
+            if self.on_exit:
+                self.on_exit(self)
+            logger.debug("Actor for quiz ID {} stopped", self.quiz_id)
+
+    async def _execute(self, command: BaseCommand):
+        websocket = getattr(command, "websocket", None)
+        try:
+            async with self.service_scope() as quiz_service:
+                await command.execute(self, quiz_service)
+        except HTTPException as e:
+            await self.reply(websocket, {"type": "error", "message": e.detail})
+        except ValueError as e:
+            await self.reply(websocket, {"type": "error", "message": str(e)})
+        except Exception as e:
+            logger.error(
+                f"Error executing {type(command).__name__} for quiz ID {self.quiz_id}: {str(e)}"
+            )
+            await self.reply(websocket, {"type": "error", "message": "Internal error."})
+
+
+class RemoteSocket:
+    """Reply target for a command forwarded from a socket on another worker."""
+
+    __slots__ = ("worker_id", "socket_id")
+
+    def __init__(self, worker_id: str, socket_id: str):
+        self.worker_id = worker_id
+        self.socket_id = socket_id
+
+
+class QuizActorRegistry:
+    """
+    Starts an actor per quiz on first use and forgets it when it exits.
+
+    Actors only see this worker's sockets and clock, so each quiz runs on
+    one worker. The registry claims the quiz through ``leases`` (the
+    broadcaster) when it starts the actor, and renews the claim while the
+    actor runs. Commands arriving on any other worker are forwarded to the
+    owner, whose replies are routed back to the originating socket; with
+    ``forward=False`` they are refused instead.
+    """
+
+    def __init__(
+        self,
+        service_scope: ServiceScope,
+        send: Sender,
+        broadcast: Broadcaster,
+        coalescer: LeaderboardCoalescer,
+        scheduler: TimerScheduler,
+        scoring: Optional[BaseScoringStrategy] = None,
+        mailbox_size: int = QUIZ_ACTOR_MAILBOX_SIZE,
+        idle_timeout: float = QUIZ_ACTOR_IDLE_SECONDS,
+        leases: Optional[BaseBroadcaster] = None,
+        forward: bool = QUIZ_FORWARD_COMMANDS,
+    ):
+        self.service_scope = service_scope
+        self.send = send
+        self.broadcast = broadcast
+        self.coalescer = coalescer
+        self.scheduler = scheduler
+        self.scoring = scoring or create_scoring_strategy()
+        self.mailbox_size = mailbox_size
+        self.idle_timeout = idle_timeout
+        self.leases = leases
+        self.forward = forward
+        self.actors: Dict[str, QuizActor] = {}
+        self._releases: Set[asyncio.Task] = set()
+        # Serializes claiming and releasing each quiz on this worker
+        self._lease_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._renewer: Optional[asyncio.Task] = None
+        self._listening_for_replies = False
+        # Local sockets with commands forwarded to another worker
+        self._socket_ids: "weakref.WeakKeyDictionary[Any, str]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sockets: "weakref.WeakValueDictionary[str, Any]" = (
+            weakref.WeakValueDictionary()
+        )
+        if leases:
+            leases.set_direct_handler(self._on_direct)
+
+    def get(self, quiz_id: str) -> QuizActor:
+        actor = self.actors.get(quiz_id)
+        if actor is None or actor.closed:
+            actor = QuizActor(
+                quiz_id,
+                self.service_scope,
+                self._send,
+                self.broadcast,
+                self.coalescer,
+                self.scheduler,
+                scoring=self.scoring,
+                mailbox_size=self.mailbox_size,
+                idle_timeout=self.idle_timeout,
+                on_exit=self._forget,
+            )
+            self.actors[quiz_id] = actor
+            actor.start()
+        return actor
+
+    async def tell(self, quiz_id: str, command: BaseCommand):
+        actor = self.actors.get(quiz_id)
+        if actor is not None and not actor.closed:
+            # Owned here already: no lease round trip per command
+            await actor.tell(command)
+            return
+        if self.leases:
+            async with self._lease_locks[quiz_id]:
+                if not await self._claim(quiz_id):
+                    actor = None
+                else:
+                    actor = self.get(quiz_id)
+            if actor is None:
+                await self._forward(quiz_id, command)
+                return
+            await actor.tell(command)
+            return
+        await self.get(quiz_id).tell(command)
+
+    async def _claim(self, quiz_id: str) -> bool:
+        if not await self.leases.claim(quiz_id):
+            return False
+        await self.leases.listen(self._quiz_address(quiz_id))
+        if self.leases.owner_ttl and self._renewer is None:
+            self._renewer = asyncio.create_task(self._renew_leases())
+        return True
+
+    async def _forward(self, quiz_id: str, command: BaseCommand):
+        websocket = getattr(command, "websocket", None)
+        if self.forward:
+            if not self._listening_for_replies:
+                await self.leases.listen(self._worker_address(self.leases.worker_id))
+                self._listening_for_replies = True
+            delivered = await self.leases.send_direct(
+                self._quiz_address(quiz_id),
+                {
+                    "type": "command",
+                    "quiz_id": quiz_id,
+                    "command": type(command).__name__,
+                    "data": command.to_message(self.scheduler.clock()),
+                    "reply_to": self.leases.worker_id,
+                    "socket_id": self._socket_id(websocket),
+                },
+            )
+            if delivered:
+                return
+            # The owner holds the lease but stopped listening, e.g. it
+            # crashed; the lease expires within owner_ttl
+            message = f"Quiz {quiz_id} is unavailable, try again shortly."
+        else:
+            message = f"Quiz {quiz_id} is running on another worker."
+        logger.warning(f"Quiz ID {quiz_id} is owned by another worker")
+        if websocket is not None:
+            await self.send(websocket, {"type": "error", "message": message})
+
+    def _socket_id(self, websocket) -> Optional[str]:
+        if websocket is None:
+            return None
+        socket_id = self._socket_ids.get(websocket)
+        if socket_id is None:
+            socket_id = self._socket_ids[websocket] = uuid.uuid4().hex
+            self._sockets[socket_id] = websocket
+        return socket_id
+
+    async def _send(self, websocket, message: dict):
+        if isinstance(websocket, RemoteSocket):
+            await self.leases.send_direct(
+                self._worker_address(websocket.worker_id),
+                {"type": "reply", "socket_id": websocket.socket_id, "message": message},
+            )
+        else:
+            await self.send(websocket, message)
+
+    async def _on_direct(self, message: dict):
+        try:
+            if message["type"] == "reply":
+                websocket = self._sockets.get(message["socket_id"])
+                if websocket is not None:
+                    await self.send(websocket, message["message"])
+                return
+            command_class = FORWARDED_COMMANDS[message["command"]]
+            websocket = None
+            if message["socket_id"] is not None:
+                websocket = RemoteSocket(message["reply_to"], message["socket_id"])
+            command = command_class.from_message(
+                message["data"], websocket, self.scheduler.clock()
+            )
+            # Only sent here while this worker holds the lease
+            await self.get(message["quiz_id"]).tell(command)
+        except Exception as e:
+            logger.error(f"Error handling forwarded message: {str(e)}")
+
+    async def _renew_leases(self):
+        while True:
+            await asyncio.sleep(self.leases.owner_ttl / 3)
+            for quiz_id, actor in list(self.actors.items()):
+                try:
+                    if not await self.leases.claim(quiz_id):
+                        # Another worker took over; never run two timelines
+                        logger.error(f"Lost the lease on quiz ID {quiz_id}")
+                        await actor.stop()
+                except Exception as e:
+                    logger.error(f"Error renewing lease on quiz ID {quiz_id}: {str(e)}")
+
+    @staticmethod
+    def _quiz_address(quiz_id: str) -> str:
+        return f"quiz:{quiz_id}"
+
+    @staticmethod
+    def _worker_address(worker_id: str) -> str:
+        return f"worker:{worker_id}"
+
+    async def _release(self, quiz_id: str):
+        async with self._lease_locks[quiz_id]:
+            if quiz_id in self.actors:
+                # Claimed again for a new actor meanwhile
+                return
+            await self.leases.unlisten(self._quiz_address(quiz_id))
+            await self.leases.release(quiz_id)
+
+    def _forget(self, actor: QuizActor):
+        if self.actors.get(actor.quiz_id) is actor:
+            del self.actors[actor.quiz_id]
+            if self.leases:
+                task = asyncio.create_task(self._release(actor.quiz_id))
+                self._releases.add(task)
+                task.add_done_callback(self._releases.discard)
+
+    async def stop(self):
+        if self._renewer is not None:
+            self._renewer.cancel()
+            await asyncio.gather(self._renewer, return_exceptions=True)
+            self._renewer = None
+        actors = list(self.actors.values())
+        # Forgotten up front: an actor cancelled before its task ran never
+        # calls on_exit, so its lease is released here instead
+        self.actors.clear()
+        for actor in actors:
+            await actor.stop()
+            if self.leases:
+                await self._release(actor.quiz_id)
+        await asyncio.gather(*self._releases, return_exceptions=True)
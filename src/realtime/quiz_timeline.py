@@ -0,0 +1,70 @@
+import os
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.caches import CachedQuestion
+
+QUESTION_DURATION_SECONDS = float(os.getenv("QUESTION_DURATION_SECONDS", 10))
+QUESTION_INTERVAL_SECONDS = float(os.getenv("QUESTION_INTERVAL_SECONDS", 0))
+
+
+@dataclass(frozen=True)
+class TimelineEvent:
+    # question_start, deadline or quiz_end
+    kind: str
+    question: Optional[CachedQuestion]
+    index: int
+    # Seconds until the next step is due
+    delay: float
+
+
+class QuizTimeline:
+    """
+    The sequence of events of a running quiz: each question opens, closes
+    at its deadline, and the quiz ends after the last one. It only tracks
+    where the quiz is; the owning actor schedules the steps and pauses.
+    """
+
+    def __init__(
+        self,
+        questions: List[CachedQuestion],
+        default_duration: float = QUESTION_DURATION_SECONDS,
+        interval: float = QUESTION_INTERVAL_SECONDS,
+    ):
+        self.questions = questions
+        self.default_duration = default_duration
+        self.interval = interval
+        self.index = -1
+        # pending, open, closed or ended
+        self.phase = "pending"
+
+    @property
+    def current(self) -> Optional[CachedQuestion]:
+        if self.phase == "open":
+            return self.questions[self.index]
+        return None
+
+    @property
+    def ended(self) -> bool:
+        return self.phase == "ended"
+
+    def duration_of(self, question: CachedQuestion) -> float:
+        return question.duration_seconds or self.default_duration
+
+    def step(self) -> TimelineEvent:
+        if self.phase == "ended":
+            raise ValueError("Quiz timeline has already ended.")
+        if self.phase == "open":
+            self.phase = "closed"
+            return TimelineEvent(
+                "deadline", self.questions[self.index], self.index, self.interval
+            )
+        self.index += 1
+        if self.index >= len(self.questions):
+            self.phase = "ended"
+            return TimelineEvent("quiz_end", None, self.index, 0)
+        self.phase = "open"
+        question = self.questions[self.index]
+        return TimelineEvent(
+            "question_start", question, self.index, self.duration_of(question)
+        )
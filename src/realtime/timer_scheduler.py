@@ -0,0 +1,112 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from src.utils.logger import LoggerSingleton
+from src.utils.metrics import TIMERS_PENDING
+
+logger = LoggerSingleton().logger
+
+
+class TimerHandle:
+    __slots__ = ("deadline", "callback", "args", "cancelled")
+
+    def __init__(self, deadline: float, callback: Callable[..., Any], args: tuple):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def remaining(self, now: float) -> float:
+        return max(0.0, self.deadline - now)
+
+
+class TimerScheduler:
+    """
+    Fires every timer on this worker from a single task, using a heap keyed
+    by monotonic deadline. The task sleeps until the earliest deadline and
+    is woken early when a sooner timer is added, so a thousand running
+    quizzes cost one sleeping task rather than one each.
+
+    Callbacks run on the scheduler's task and must not block; they hand
+    the event to whoever owns it. Cancelled timers are dropped lazily, and
+    the heap is rebuilt once they make up half of it.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._heap: List[Tuple[float, int, TimerHandle]] = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    def call_at(
+        self, deadline: float, callback: Callable[..., Any], *args: Any
+    ) -> TimerHandle:
+        handle = TimerHandle(deadline, callback, args)
+        heapq.heappush(self._heap, (deadline, next(self._counter), handle))
+        TIMERS_PENDING.inc()
+        if self._heap[0][2] is handle:
+            self._wakeup.set()
+        return handle
+
+    def call_later(
+        self, delay: float, callback: Callable[..., Any], *args: Any
+    ) -> TimerHandle:
+        return self.call_at(self.clock() + delay, callback, *args)
+
+    def cancel(self, handle: Optional[TimerHandle]):
+        if handle is None or handle.cancelled:
+            return
+        handle.cancelled = True
+        self._cancelled += 1
+        TIMERS_PENDING.dec()
+        if self._cancelled > len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def _pop_due(self, now: float) -> List[TimerHandle]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, handle = heapq.heappop(self._heap)
+            if handle.cancelled:
+                self._cancelled -= 1
+                continue
+            # Marked so a late cancel() of a fired timer is a no-op
+            handle.cancelled = True
+            TIMERS_PENDING.dec()
+            due.append(handle)
+        return due
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            for handle in self._pop_due(self.clock()):
+                try:
+                    handle.callback(*handle.args)
+                except Exception as e:
+                    logger.error(f"Error firing timer: {str(e)}")
+            timeout = None
+            if self._heap:
+                timeout = max(0.0, self._heap[0][0] - self.clock())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
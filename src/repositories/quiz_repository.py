@@ -1,9 +1,12 @@
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
+from sqlalchemy import Select, and_, case, insert, literal, or_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from src.models import Participant, Question, QuizSession
+from src.models import Participant, Question, QuizSession, User
 from src.schemas.question import QuestionCreate
 from src.utils.logger import LoggerSingleton
 
@@ -30,6 +33,83 @@ class QuizRepository:
             self.logger.error(f"Error creating quiz with ID {quiz_id}: {str(e)}")
             raise e
 
+    async def get_existing_quiz_ids(self, quiz_ids: List[str]) -> List[str]:
+        result = await self.db.execute(
+            select(QuizSession.quiz_id).where(QuizSession.quiz_id.in_(quiz_ids))
+        )
+        return list(result.scalars().all())
+
+    async def clone_quiz(
+        self, source_quiz_id: str, target_quiz_ids: List[str], creator_id: int
+    ) -> int:
+        """
+        Creates the target quizzes and copies the source's questions into
+        each with one INSERT ... SELECT, all in a single transaction.
+        Returns the number of questions copied per quiz.
+        """
+        self.logger.info(
+            f"Cloning quiz ID {source_quiz_id} into {len(target_quiz_ids)} quizzes"
+        )
+        try:
+            await self.db.execute(
+                insert(QuizSession),
+                [
+                    {
+                        "quiz_id": quiz_id,
+                        "creator_user_id": creator_id,
+                        "status": "active",
+                    }
+                    for quiz_id in target_quiz_ids
+                ],
+            )
+            copied = 0
+            for quiz_id in target_quiz_ids:
+                result = await self.db.execute(
+                    insert(Question).from_select(
+                        [
+                            "quiz_id",
+                            "text",
+                            "options",
+                            "correct_option",
+                            "duration_seconds",
+                        ],
+                        select(
+                            literal(quiz_id),
+                            Question.text,
+                            Question.options,
+                            Question.correct_option,
+                            Question.duration_seconds,
+                        )
+                        .where(Question.quiz_id == source_quiz_id)
+                        .order_by(Question.id),
+                    )
+                )
+                copied = result.rowcount
+            await self.db.commit()
+            self.logger.info(
+                f"Cloned quiz ID {source_quiz_id} with {copied} questions into {len(target_quiz_ids)} quizzes"
+            )
+            return copied
+        except Exception as e:
+            await self.db.rollback()
+            self.logger.error(f"Error cloning quiz ID {source_quiz_id}: {str(e)}")
+            raise e
+
+    async def update_status(self, quiz_id: str, status: str) -> None:
+        self.logger.info(f"Setting status of quiz ID {quiz_id} to {status}")
+        try:
+            await self.db.execute(
+                update(QuizSession)
+                .where(QuizSession.quiz_id == quiz_id)
+                .values(status=status)
+            )
+            await self.db.commit()
+        except Exception as e:
+            self.logger.error(
+                f"Error setting status of quiz ID {quiz_id} to {status}: {str(e)}"
+            )
+            raise e
+
     async def add_participant(self, quiz_id: str, user_id: int) -> Participant:
         self.logger.info(
             f"Adding participant with user ID: {user_id} to quiz ID: {quiz_id}"
@@ -41,15 +121,29 @@ class QuizRepository:
             participant = result.scalars().first()
             if not participant:
                 self.logger.debug(f"Creating new participant for quiz ID: {quiz_id}")
-                participant = Participant(quiz_id=quiz_id, user_id=user_id, score=0)
-                self.db.add(participant)
+                # A concurrent join may insert the same pair first; the unique
+                # index turns that into a no-op and both read back one row
+                dialect_insert = (
+                    sqlite_insert
+                    if self.db.bind.dialect.name == "sqlite"
+                    else pg_insert
+                )
+                await self.db.execute(
+                    dialect_insert(Participant)
+                    .values(quiz_id=quiz_id, user_id=user_id, score=0)
+                    .on_conflict_do_nothing(index_elements=["quiz_id", "user_id"])
+                )
                 await self.db.commit()
-                await self.db.refresh(participant)
+                result = await self.db.execute(
+                    select(Participant).filter_by(quiz_id=quiz_id, user_id=user_id)
+                )
+                participant = result.scalars().one()
             self.logger.info(
                 f"Participant added successfully with ID: {participant.id}"
             )
             return participant
         except Exception as e:
+            await self.db.rollback()
             self.logger.error(
                 f"Error adding participant to quiz ID {quiz_id}: {str(e)}"
             )
@@ -58,7 +152,9 @@ class QuizRepository:
     async def update_score(
         self, quiz_id: str, user_id: int, increment: int = 10
     ) -> int:
-        self.logger.info(f"Updating score for user ID: {user_id} in quiz ID: {quiz_id}")
+        self.logger.debug(
+            "Updating score for user ID: {} in quiz ID: {}", user_id, quiz_id
+        )
         try:
             result = await self.db.execute(
                 select(Participant).filter_by(quiz_id=quiz_id, user_id=user_id)
@@ -67,8 +163,11 @@ class QuizRepository:
             if participant:
                 participant.score += increment
                 await self.db.commit()
-                self.logger.info(
-                    f"Score updated to {participant.score} for user ID: {user_id} in quiz ID: {quiz_id}"
+                self.logger.debug(
+                    "Score updated to {} for user ID: {} in quiz ID: {}",
+                    participant.score,
+                    user_id,
+                    quiz_id,
                 )
                 return participant.score
             self.logger.warning(
@@ -81,18 +180,95 @@ class QuizRepository:
             )
             raise e
 
+    async def get_scores(
+        self, quiz_id: str, user_ids: Optional[List[int]] = None
+    ) -> Dict[int, int]:
+        self.logger.info(f"Fetching scores for quiz ID: {quiz_id}")
+        try:
+            query = select(Participant.user_id, Participant.score).filter_by(
+                quiz_id=quiz_id
+            )
+            if user_ids is not None:
+                query = query.where(Participant.user_id.in_(user_ids))
+            result = await self.db.execute(query)
+            return {user_id: score or 0 for user_id, score in result.all()}
+        except Exception as e:
+            self.logger.error(f"Error fetching scores for quiz ID {quiz_id}: {str(e)}")
+            raise e
+
+    async def get_ranked_participants(self, quiz_id: str) -> List[dict]:
+        self.logger.debug("Fetching ranked participants for quiz ID: {}", quiz_id)
+        try:
+            result = await self.db.execute(
+                select(Participant.user_id, User.username, Participant.score)
+                .join(User, Participant.user_id == User.id)
+                .where(Participant.quiz_id == quiz_id)
+                .order_by(Participant.score.desc(), Participant.id)
+            )
+            return [
+                {"user_id": user_id, "username": username, "score": score or 0}
+                for user_id, username, score in result.all()
+            ]
+        except Exception as e:
+            self.logger.error(
+                f"Error fetching ranked participants for quiz ID {quiz_id}: {str(e)}"
+            )
+            raise e
+
+    async def get_participant_entry(self, quiz_id: str, user_id: int) -> Optional[dict]:
+        result = await self.db.execute(
+            select(Participant.user_id, User.username, Participant.score)
+            .join(User, Participant.user_id == User.id)
+            .where(Participant.quiz_id == quiz_id, Participant.user_id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return {
+            "user_id": row.user_id,
+            "username": row.username,
+            "score": row.score or 0,
+        }
+
+    async def apply_score_deltas(self, quiz_id: str, deltas: Dict[int, int]) -> None:
+        # One multi-row UPDATE for the whole batch
+        self.logger.debug(
+            "Applying {} score increments to quiz ID: {}", len(deltas), quiz_id
+        )
+        try:
+            await self.db.execute(
+                update(Participant)
+                .where(
+                    Participant.quiz_id == quiz_id,
+                    Participant.user_id.in_(list(deltas)),
+                )
+                .values(
+                    score=Participant.score
+                    + case(deltas, value=Participant.user_id, else_=0)
+                )
+            )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            self.logger.error(
+                f"Error applying score increments to quiz ID {quiz_id}: {str(e)}"
+            )
+            raise e
+
     async def get_leaderboard(self, quiz_id: str) -> List[dict]:
-        self.logger.info(f"Fetching leaderboard for quiz ID: {quiz_id}")
+        self.logger.debug("Fetching leaderboard for quiz ID: {}", quiz_id)
         try:
+            # Plain (username, score) rows: one query, no ORM objects to hydrate
             result = await self.db.execute(
-                select(Participant)
-                .filter_by(quiz_id=quiz_id)
-                .order_by(Participant.score.desc())
+                select(User.username, Participant.score)
+                .join(User, Participant.user_id == User.id)
+                .where(Participant.quiz_id == quiz_id)
+                .order_by(Participant.score.desc(), Participant.id)
             )
-            participants = result.scalars().all()
-            self.logger.info(f"Leaderboard retrieved for quiz ID: {quiz_id}")
+            self.logger.debug("Leaderboard retrieved for quiz ID: {}", quiz_id)
             return [
-                {"username": p.user.username, "score": p.score} for p in participants
+                {"username": username, "score": score}
+                for username, score in result.all()
             ]
         except Exception as e:
             self.logger.error(
@@ -108,6 +284,7 @@ class QuizRepository:
                 text=question_in.text,
                 options=question_in.options,
                 correct_option=question_in.correct_option,
+                duration_seconds=question_in.duration_seconds,
             )
             self.db.add(question)
             await self.db.commit()
@@ -120,10 +297,28 @@ class QuizRepository:
             self.logger.error(f"Error adding question to quiz ID {quiz_id}: {str(e)}")
             raise e
 
+    async def add_questions(self, quiz_id: str, questions: List[dict]) -> int:
+        self.logger.info(f"Adding {len(questions)} questions to quiz ID: {quiz_id}")
+        try:
+            # A list of parameter sets runs as a single executemany
+            await self.db.execute(
+                insert(Question),
+                [{**question, "quiz_id": quiz_id} for question in questions],
+            )
+            await self.db.commit()
+            return len(questions)
+        except Exception as e:
+            await self.db.rollback()
+            self.logger.error(f"Error adding questions to quiz ID {quiz_id}: {str(e)}")
+            raise e
+
     async def get_questions(self, quiz_id: str) -> List[Question]:
         self.logger.info(f"Fetching questions for quiz ID: {quiz_id}")
         try:
-            result = await self.db.execute(select(Question).filter_by(quiz_id=quiz_id))
+            # In id order, which is the order they are asked in
+            result = await self.db.execute(
+                select(Question).filter_by(quiz_id=quiz_id).order_by(Question.id)
+            )
             questions = result.scalars().all()
             self.logger.info(f"Questions retrieved successfully for quiz ID: {quiz_id}")
             return questions
@@ -134,14 +329,14 @@ class QuizRepository:
             raise e
 
     async def get_quiz_by_id(self, quiz_id: str) -> QuizSession:
-        self.logger.info(f"Fetching quiz by ID: {quiz_id}")
+        self.logger.debug("Fetching quiz by ID: {}", quiz_id)
         try:
             result = await self.db.execute(
                 select(QuizSession).filter_by(quiz_id=quiz_id)
             )
             quiz = result.scalars().first()
             if quiz:
-                self.logger.info(f"Quiz retrieved successfully with ID: {quiz_id}")
+                self.logger.debug("Quiz retrieved successfully with ID: {}", quiz_id)
             else:
                 self.logger.warning(f"Quiz not found with ID: {quiz_id}")
             return quiz
@@ -149,19 +344,80 @@ class QuizRepository:
             self.logger.error(f"Error fetching quiz by ID {quiz_id}: {str(e)}")
             raise e
 
-    async def get_participants(self, quiz_id: str) -> List[Participant]:
-        self.logger.info(f"Fetching participants for quiz ID: {quiz_id}")
+    def _participants_query(self, quiz_id: str, after: Optional[int]) -> Select:
+        query = (
+            select(
+                Participant.id, Participant.user_id, User.username, Participant.score
+            )
+            .join(User, Participant.user_id == User.id)
+            .where(Participant.quiz_id == quiz_id)
+            .order_by(Participant.id)
+        )
+        if after is not None:
+            query = query.where(Participant.id > after)
+        return query
+
+    def _leaderboard_query(
+        self, quiz_id: str, after: Optional[Tuple[int, int]]
+    ) -> Select:
+        # Keyset on (score DESC, id): walks idx_participants_quiz_id_score
+        query = (
+            select(Participant.id, User.username, Participant.score)
+            .join(User, Participant.user_id == User.id)
+            .where(Participant.quiz_id == quiz_id)
+            .order_by(Participant.score.desc(), Participant.id)
+        )
+        if after is not None:
+            score, participant_id = after
+            query = query.where(
+                or_(
+                    Participant.score < score,
+                    and_(Participant.score == score, Participant.id > participant_id),
+                )
+            )
+        return query
+
+    async def get_participants_page(
+        self, quiz_id: str, limit: int, after: Optional[int] = None
+    ) -> List[dict]:
+        self.logger.info(f"Fetching participants page for quiz ID: {quiz_id}")
         try:
             result = await self.db.execute(
-                select(Participant).filter_by(quiz_id=quiz_id)
+                self._participants_query(quiz_id, after).limit(limit)
             )
-            participants = result.scalars().all()
-            self.logger.info(
-                f"Participants retrieved successfully for quiz ID: {quiz_id}"
+            return [dict(row._mapping) for row in result.all()]
+        except Exception as e:
+            self.logger.error(
+                f"Error fetching participants page for quiz ID {quiz_id}: {str(e)}"
             )
-            return participants
+            raise e
+
+    async def get_leaderboard_page(
+        self, quiz_id: str, limit: int, after: Optional[Tuple[int, int]] = None
+    ) -> List[dict]:
+        self.logger.info(f"Fetching leaderboard page for quiz ID: {quiz_id}")
+        try:
+            result = await self.db.execute(
+                self._leaderboard_query(quiz_id, after).limit(limit)
+            )
+            return [dict(row._mapping) for row in result.all()]
         except Exception as e:
             self.logger.error(
-                f"Error fetching participants for quiz ID {quiz_id}: {str(e)}"
+                f"Error fetching leaderboard page for quiz ID {quiz_id}: {str(e)}"
             )
             raise e
+
+    async def stream_participants(
+        self, quiz_id: str, after: Optional[int] = None
+    ) -> AsyncIterator[dict]:
+        # Server-side cursor: rows are fetched as the caller consumes them
+        result = await self.db.stream(self._participants_query(quiz_id, after))
+        async for row in result:
+            yield dict(row._mapping)
+
+    async def stream_leaderboard(
+        self, quiz_id: str, after: Optional[Tuple[int, int]] = None
+    ) -> AsyncIterator[dict]:
+        result = await self.db.stream(self._leaderboard_query(quiz_id, after))
+        async for row in result:
+            yield dict(row._mapping)
@@ -1,12 +1,14 @@
-from typing import Optional
+from typing import Dict, List, Optional, Set
 
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from werkzeug.security import check_password_hash
 
 from src.models.user import User
 from src.repositories.base_repository import BaseRepository
 from src.schemas.user import UserCreate, UserUpdate
+from src.utils.hashing import password_hasher
 from src.utils.logger import LoggerSingleton
 
 
@@ -16,27 +18,60 @@ class UserRepository(BaseRepository[User, UserCreate]):
         self.logger = LoggerSingleton().logger
 
     async def get_user_by_username(self, username: str) -> Optional[User]:
-        self.logger.debug(f"Querying user by username: {username}")
+        self.logger.debug("Querying user by username: {}", username)
         result = await self.db.execute(select(User).filter_by(username=username))
         user = result.scalars().first()
         if user:
-            self.logger.debug(f"User found: {user.username}")
+            self.logger.debug("User found: {}", user.username)
         else:
             self.logger.warning(f"User not found: {username}")
         return user
 
     async def create_user(self, username: str, password_hash: str) -> User:
-        self.logger.debug(f"Creating user: {username} - {password_hash}")
+        self.logger.debug("Creating user: {}", username)
         user_data = UserCreate(username=username, password_hash=password_hash)
         user = await self.create(user_data)  # Use BaseRepository's create method
         self.logger.info(f"User created with ID: {user.id}")
         return user
 
+    async def get_existing_usernames(self, usernames: List[str]) -> Set[str]:
+        result = await self.db.execute(
+            select(User.username).where(User.username.in_(usernames))
+        )
+        return set(result.scalars().all())
+
+    async def bulk_create_users(self, users: List[dict]) -> Dict[str, int]:
+        """
+        Inserts users with one multi-row INSERT, skipping usernames that
+        already exist. Returns the ids of the rows actually inserted.
+        """
+        self.logger.info(f"Bulk creating {len(users)} users")
+        if not users:
+            return {}
+        try:
+            insert = (
+                sqlite_insert if self.db.bind.dialect.name == "sqlite" else pg_insert
+            )
+            result = await self.db.execute(
+                insert(User)
+                .values(users)
+                .on_conflict_do_nothing(index_elements=[User.username])
+                .returning(User.id, User.username)
+            )
+            created = {username: user_id for user_id, username in result.all()}
+            await self.db.commit()
+            self.logger.info(f"Bulk created {len(created)} of {len(users)} users")
+            return created
+        except Exception as e:
+            await self.db.rollback()
+            self.logger.error(f"Error bulk creating users: {str(e)}")
+            raise e
+
     async def authenticate(self, username: str, password: str) -> Optional[User]:
         self.logger.info(f"Authenticating user: {username}")
         user = await self.get_user_by_username(username)
         if user:
-            if check_password_hash(user.password_hash, password):
+            if await password_hasher.verify(user.password_hash, password):
                 self.logger.info(f"Authentication successful for user: {username}")
                 return user
             else:
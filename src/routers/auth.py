@@ -1,19 +1,34 @@
-from fastapi import APIRouter, Depends, Form, HTTPException
+import json
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Form, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 from src.services.user_service import UserService
+from src.utils.auth import get_current_user
 from src.utils.dependencies import get_user_service
 from src.utils.exceptions import (
+    HashingBusyException,
     InvalidCredentialsException,
     UserAlreadyExistsException,
     UserNotFoundException,
 )
 from src.utils.logger import LoggerSingleton
 from src.utils.response import format_response
+from src.utils.stream_parser import (
+    StreamParseError,
+    detect_format,
+    iter_batches,
+    iter_rows,
+)
 from src.utils.token import create_token
 
 logger = LoggerSingleton().logger
 router = APIRouter(tags=["auth"])
 
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 500))
+
 
 @router.post("/register")
 async def register(
@@ -34,11 +49,54 @@ async def register(
     except UserAlreadyExistsException as e:
         logger.error(f"user already existed {username}: {str(e)}")
         return format_response("error", str(e.detail))
+    except HashingBusyException:
+        raise
     except Exception as e:
         logger.error(f"Error registering user {username}: {str(e)}")
         raise HTTPException(status_code=400, detail="Registration failed")
 
 
+@router.post("/register/bulk")
+async def register_bulk(
+    request: Request,
+    format: Optional[str] = None,
+    user_service: UserService = Depends(get_user_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Provisions users from a CSV (username,password header) or JSONL upload
+    and answers with one NDJSON result per row followed by a summary.
+    """
+    try:
+        fmt = detect_format(request.headers.get("content-type"), format)
+    except StreamParseError as e:
+        return format_response("error", str(e))
+
+    logger.info(f"Bulk registration ({fmt}) started by user ID: {current_user.id}")
+    # The upload is consumed here, batch by batch: StreamingResponse reads
+    # the receive channel itself, so the body can't be read while streaming
+    lines = []
+    summary = {"created": 0, "exists": 0, "duplicate": 0, "invalid": 0}
+    seen = set()
+    try:
+        async for batch in iter_batches(
+            iter_rows(request.stream(), fmt), BULK_BATCH_SIZE
+        ):
+            for result in await user_service.bulk_create_users(batch, seen):
+                summary[result["status"]] += 1
+                lines.append(json.dumps(result) + "\n")
+    except StreamParseError as e:
+        logger.warning(f"Bulk registration aborted: {str(e)}")
+        summary["error"] = str(e)
+    except Exception as e:
+        # Rows already committed are still reported above the summary
+        logger.error(f"Bulk registration failed: {str(e)}")
+        summary["error"] = "Bulk registration failed"
+    logger.info(f"Bulk registration finished: {summary}")
+    lines.append(json.dumps({"summary": summary}) + "\n")
+    return StreamingResponse(iter(lines), media_type="application/x-ndjson")
+
+
 @router.post("/login")
 async def login(
     username: str,
@@ -58,6 +116,8 @@ async def login(
     except InvalidCredentialsException as e:
         logger.warning(f"Login failed - Invalid credentials for user: {username}")
         return format_response("error", "Invalid credentials.")
+    except HashingBusyException:
+        raise
     except Exception as e:
         logger.error(f"Login failed for user {username}: {str(e)}")
         raise HTTPException(status_code=401, detail="Login failed")
@@ -91,6 +151,8 @@ async def login_for_access_token(
             f"Token generation failed - Invalid credentials for user: {username}"
         )
         return format_response("error", "Invalid credentials.")
+    except HashingBusyException:
+        raise
     except Exception as e:
         logger.error(f"Token generation failed for user {username}: {str(e)}")
         raise HTTPException(status_code=401, detail="Token generation failed")
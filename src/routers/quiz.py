@@ -1,12 +1,24 @@
-from fastapi import APIRouter, Depends
+import json
+import os
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 
 from src.schemas.question import QuestionCreate
-from src.schemas.quiz import QuizCreate
+from src.schemas.quiz import QuizClone, QuizCreate
 from src.services.quiz_service import QuizService
 from src.utils.auth import get_current_user
-from src.utils.dependencies import get_quiz_service
+from src.utils.dependencies import get_quiz_service, quiz_service_scope
 from src.utils.logger import LoggerSingleton
+from src.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor
 from src.utils.response import format_response
+from src.utils.stream_parser import (
+    StreamParseError,
+    detect_format,
+    iter_batches,
+    iter_rows,
+)
 
 router = APIRouter(
     prefix="/quiz",
@@ -14,23 +26,54 @@ router = APIRouter(
 )
 logger = LoggerSingleton().logger
 
+QUESTION_IMPORT_BATCH_SIZE = int(os.getenv("QUESTION_IMPORT_BATCH_SIZE", 500))
+# Rejected rows beyond this are counted but not listed in the response
+QUESTION_IMPORT_MAX_ERRORS = 100
+
+
+def stream_ndjson(
+    open_rows: Callable[[QuizService], Awaitable[AsyncIterator[dict]]],
+) -> StreamingResponse:
+    # The request's session is closed before the body streams, so the rows
+    # are read through a session owned by the response
+    async def body():
+        async with quiz_service_scope() as quiz_service:
+            async for row in await open_rows(quiz_service):
+                yield json.dumps(row) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
 
 @router.get("/{quiz_id}/leaderboard")
 async def get_leaderboard(
     quiz_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: bool = False,
     quiz_service: QuizService = Depends(get_quiz_service),
     current_user=Depends(get_current_user),
 ):
+    """
+    Leaderboard ordered by score, paged with the ``next_cursor`` of the
+    previous page. ``stream=true`` writes every remaining row as NDJSON.
+    """
     try:
         logger.info(f"Retrieving leaderboard for quiz ID: {quiz_id}")
-        leaderboard_entries = await quiz_service.get_leaderboard(quiz_id=quiz_id)
+        if stream:
+            await quiz_service.get_quiz(quiz_id)  # Ensure quiz exists
+            decode_cursor(after, 2)
+            return stream_ndjson(
+                lambda service: service.stream_leaderboard(quiz_id, after)
+            )
+        page = await quiz_service.get_leaderboard_page(quiz_id, limit, after)
         logger.info(f"Leaderboard retrieved successfully for quiz ID: {quiz_id}")
         return format_response(
             "success",
             "Leaderboard retrieved successfully.",
             {
                 "quiz_id": quiz_id,
-                "leaderboard_entries": leaderboard_entries,
+                "leaderboard_entries": page["items"],
+                "next_cursor": page["next_cursor"],
             },
         )
     except Exception as e:
@@ -67,6 +110,36 @@ async def create_quiz(
         return format_response("error", str(e))
 
 
+@router.post("/{quiz_id}/clone")
+async def clone_quiz(
+    quiz_id: str,
+    clone: QuizClone,
+    quiz_service: QuizService = Depends(get_quiz_service),
+    current_user=Depends(get_current_user),
+):
+    try:
+        logger.info(f"Cloning quiz ID: {quiz_id} by user ID: {current_user.id}")
+        quiz_ids, questions_copied = await quiz_service.clone_quiz(
+            quiz_id,
+            creator_id=current_user.id,
+            target_quiz_ids=clone.quiz_ids,
+            count=clone.count,
+        )
+        logger.info(f"Quiz ID {quiz_id} cloned into {len(quiz_ids)} quizzes")
+        return format_response(
+            "success",
+            "Quiz cloned successfully.",
+            {
+                "source_quiz_id": quiz_id,
+                "quiz_ids": quiz_ids,
+                "questions_per_quiz": questions_copied,
+            },
+        )
+    except Exception as e:
+        logger.error(f"Error cloning quiz ID {quiz_id}: {str(e)}")
+        return format_response("error", str(e))
+
+
 @router.post("/{quiz_id}/questions")
 async def add_question(
     quiz_id: str,
@@ -81,6 +154,7 @@ async def add_question(
             text=question.text,
             options=question.options,
             correct_option=question.correct_option,
+            duration_seconds=question.duration_seconds,
         )
         logger.info(
             f"Question added successfully to quiz ID: {quiz_id}, Question ID: {new_question.id}"
@@ -94,6 +168,7 @@ async def add_question(
                 "text": new_question.text,
                 "options": new_question.options,
                 "correct_option": new_question.correct_option,
+                "duration_seconds": new_question.duration_seconds,
             },
         )
     except Exception as e:
@@ -132,6 +207,57 @@ async def add_participant(
         return format_response("error", str(e))
 
 
+@router.post("/{quiz_id}/questions/import")
+async def import_questions(
+    quiz_id: str,
+    request: Request,
+    format: Optional[str] = None,
+    quiz_service: QuizService = Depends(get_quiz_service),
+    current_user=Depends(get_current_user),
+):
+    """
+    Imports a JSONL or CSV (text,options,correct_option header) question bank
+    in batches without buffering the upload.
+    """
+    imported = 0
+    rejected = 0
+    errors = []
+    try:
+        fmt = detect_format(request.headers.get("content-type"), format)
+        logger.info(f"Importing {fmt} questions into quiz ID: {quiz_id}")
+        await quiz_service.get_quiz(quiz_id)  # Fail before reading the upload
+        async for batch in iter_batches(
+            iter_rows(request.stream(), fmt), QUESTION_IMPORT_BATCH_SIZE
+        ):
+            count, batch_errors = await quiz_service.import_questions(quiz_id, batch)
+            imported += count
+            rejected += len(batch_errors)
+            errors.extend(batch_errors[: QUESTION_IMPORT_MAX_ERRORS - len(errors)])
+        logger.info(
+            f"Imported {imported} questions into quiz ID: {quiz_id}, rejected {rejected}"
+        )
+        return format_response(
+            "success",
+            "Questions imported.",
+            {
+                "quiz_id": quiz_id,
+                "imported": imported,
+                "rejected": rejected,
+                "errors": errors,
+            },
+        )
+    except StreamParseError as e:
+        logger.warning(f"Question import into quiz ID {quiz_id} aborted: {str(e)}")
+        return format_response(
+            "error",
+            str(e),
+            {"quiz_id": quiz_id, "imported": imported, "rejected": rejected},
+        )
+    except Exception as e:
+        logger.error(f"Error importing questions into quiz ID {quiz_id}: {str(e)}")
+        return format_response("error", str(e))
+
+
 @router.get("/{quiz_id}")
 async def get_quiz(
     quiz_id: str,
@@ -160,15 +286,30 @@ async def get_quiz(
 @router.get("/{quiz_id}/participants")
 async def get_quiz_participants(
     quiz_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    stream: bool = False,
     quiz_service: QuizService = Depends(get_quiz_service),
     current_user=Depends(get_current_user),
 ):
     try:
         logger.info(f"Retrieving participants for quiz ID: {quiz_id}")
-        participants = await quiz_service.get_participants(quiz_id)
+        if stream:
+            await quiz_service.get_quiz(quiz_id)  # Ensure quiz exists
+            decode_cursor(after, 1)
+            return stream_ndjson(
+                lambda service: service.stream_participants(quiz_id, after)
+            )
+        page = await quiz_service.get_participants(quiz_id, limit, after)
         logger.info(f"Participants retrieved successfully for quiz ID: {quiz_id}")
         return format_response(
-            "success", "Participants retrieved successfully.", participants
+            "success",
+            "Participants retrieved successfully.",
+            {
+                "quiz_id": quiz_id,
+                "participants": page["items"],
+                "next_cursor": page["next_cursor"],
+            },
         )
     except Exception as e:
         logger.error(f"Error retrieving participants for quiz ID {quiz_id}: {str(e)}")
@@ -1,13 +1,23 @@
-import json
-from typing import Dict, List
-
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
-
+import os
+import time
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+
+from src.commands.end_quiz_command import EndQuizCommand
+from src.commands.pause_quiz_command import PauseQuizCommand
+from src.commands.resume_quiz_command import ResumeQuizCommand
+from src.commands.skip_question_command import SkipQuestionCommand
+from src.commands.start_quiz_command import StartQuizCommand
+from src.commands.submit_answer_command import SubmitAnswerCommand
+from src.realtime.codec import send_payload
+from src.realtime.connection_manager import manager
+from src.realtime.leaderboard_coalescer import LeaderboardCoalescer
+from src.realtime.leaderboard_views import LeaderboardView
+from src.realtime.quiz_actor import QuizActorRegistry
+from src.realtime.timer_scheduler import TimerScheduler
 from src.schemas.leaderboard import Leaderboard
-from src.services.quiz_service import QuizService
-from src.services.user_service import UserService
 from src.utils.auth import get_current_user_for_ws
-from src.utils.dependencies import get_quiz_service, get_user_service
+from src.utils.dependencies import quiz_service_scope, user_service_scope
 from src.utils.exceptions import QuizNotFoundException
 from src.utils.logger import LoggerSingleton
 
@@ -17,44 +27,48 @@ router = APIRouter(
 )
 logger = LoggerSingleton().logger
 
+LEADERBOARD_TICK_MS = int(os.getenv("LEADERBOARD_TICK_MS", 200))
+
+
+async def load_leaderboard(quiz_id: str) -> Leaderboard:
+    async with quiz_service_scope() as quiz_service:
+        entries = await quiz_service.get_leaderboard(quiz_id=quiz_id)
+    return Leaderboard(quiz_id=quiz_id, entries=entries)
 
-# In-memory storage of active connections per quiz
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
-
-    async def connect(self, quiz_id: str, websocket: WebSocket):
-        await websocket.accept()
-        if quiz_id not in self.active_connections:
-            self.active_connections[quiz_id] = []
-        self.active_connections[quiz_id].append(websocket)
-        logger.info(f"WebSocket connection established for quiz ID: {quiz_id}")
-
-    def disconnect(self, quiz_id: str, websocket: WebSocket):
-        self.active_connections[quiz_id].remove(websocket)
-        if not self.active_connections[quiz_id]:
-            del self.active_connections[quiz_id]
-        logger.info(f"WebSocket connection closed for quiz ID: {quiz_id}")
-
-    async def broadcast_leaderboard(self, quiz_id: str, leaderboard: Leaderboard):
-        if quiz_id in self.active_connections:
-            message = json.dumps(
-                {"type": "leaderboard_update", "data": leaderboard.dict()}
-            )
-            for connection in self.active_connections[quiz_id]:
-                await connection.send_text(message)
-            logger.info(f"Broadcasted leaderboard update for quiz ID: {quiz_id}")
 
+coalescer = LeaderboardCoalescer(
+    load_leaderboard, manager.broadcast_leaderboard, tick=LEADERBOARD_TICK_MS / 1000
+)
+
+# Question starts, deadlines and quiz ends of every running quiz
+scheduler = TimerScheduler()
+
+# One actor per live quiz serializes its answers and state changes
+# Each quiz is run by the one worker that claims it through the broadcaster;
+# other workers forward its commands there
+actors = QuizActorRegistry(
+    quiz_service_scope,
+    manager.send_personal,
+    manager.broadcast,
+    coalescer,
+    scheduler,
+    leases=manager.broadcaster,
+)
 
-manager = ConnectionManager()
+CONTROL_COMMANDS = {
+    "start_quiz": StartQuizCommand,
+    "pause_quiz": PauseQuizCommand,
+    "resume_quiz": ResumeQuizCommand,
+    "skip_question": SkipQuestionCommand,
+    # Queued behind every answer already received for the quiz
+    "end_quiz": EndQuizCommand,
+}
 
 
 @router.websocket("/{quiz_id}")
 async def websocket_endpoint(
     websocket: WebSocket,
     quiz_id: str,
-    quiz_service: QuizService = Depends(get_quiz_service),
-    user_service: UserService = Depends(get_user_service),
 ):
     token = websocket.query_params.get("token")
     if not token:
@@ -63,60 +77,64 @@ async def websocket_endpoint(
         return
 
     try:
-        current_user = await get_current_user_for_ws(
-            token=token, user_service=user_service
-        )
+        # Sessions are held per message, never for the socket's lifetime
+        async with user_service_scope() as user_service:
+            current_user = await get_current_user_for_ws(
+                token=token, user_service=user_service
+            )
     except HTTPException as e:
         await websocket.close(code=1008, reason=str(e.detail))
         logger.warning(f"WebSocket connection rejected: {e.detail}")
         return
-    await manager.connect(quiz_id, websocket)
+    try:
+        view = LeaderboardView.parse(
+            websocket.query_params.get("view"),
+            n=websocket.query_params.get("n"),
+            k=websocket.query_params.get("k"),
+        )
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        logger.warning(f"WebSocket connection rejected: {str(e)}")
+        return
+
+    await manager.connect(quiz_id, websocket, username=current_user.username, view=view)
+    if quiz_id not in manager.leaderboards:
+        # Nothing to snapshot on this worker yet; publish the board so the
+        # new socket gets it as soon as the coalescer flushes
+        coalescer.mark_dirty(quiz_id)
     try:
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
-            logger.info(f"Received WebSocket message for quiz ID {quiz_id}: {message}")
+            try:
+                message = await manager.receive(websocket)
+            except (TypeError, ValueError) as e:
+                # Undecodable frame; the socket itself is still usable
+                logger.warning(f"Malformed message for quiz ID {quiz_id}: {str(e)}")
+                message = None
+            if not isinstance(message, dict):
+                await manager.send_personal(
+                    websocket, {"type": "error", "message": "Malformed message."}
+                )
+                continue
+            # Answer deadlines are judged on when the server read the message
+            received_at = time.monotonic()
+            logger.debug(
+                "Received WebSocket message for quiz ID {}: {}", quiz_id, message
+            )
             action = message.get("action")
             if action == "submit_answer":
-                user_id = message.get("user_id")
-                question_id = message.get("question_id")
-                selected_option = message.get("selected_option")
-
-                # Process the answer, fetch the question and verify the answer
-
-                # Update participant's score if the answer is correct
-                try:
-                    participant = await quiz_service.update_score(
-                        quiz_id=quiz_id, user_id=user_id, increment=1
-                    )
-                    logger.info(f"Score updated for user {user_id} in quiz {quiz_id}")
-                except ValueError as e:
-                    error_message = str(e)
-                    logger.error(f"Error updating score: {error_message}")
-                    await websocket.send_text(
-                        json.dumps({"type": "error", "message": error_message})
-                    )
-                    continue
-
-                # Fetch the updated leaderboard
-                leaderboard_entries = await quiz_service.get_leaderboard(
-                    quiz_id=quiz_id
-                )
-                leaderboard = Leaderboard(quiz_id=quiz_id, entries=leaderboard_entries)
-
-                # Broadcast the updated leaderboard to all connected clients
-                await manager.broadcast_leaderboard(quiz_id, leaderboard)
-
-                await websocket.send_text(
-                    json.dumps(
-                        {
-                            "type": "answer_result",
-                            "data": {
-                                "question_id": question_id,
-                                "result": "correct",  # or "incorrect" based on actual answer
-                            },
-                        }
-                    )
+                # Applied by the quiz's actor, which also sends the result
+                await actors.tell(
+                    quiz_id,
+                    SubmitAnswerCommand(
+                        # Always the authenticated user; a client-sent
+                        # user_id is ignored so no socket answers for another
+                        user_id=int(current_user.id),
+                        question_id=message.get("question_id"),
+                        selected_option=message.get("selected_option"),
+                        websocket=websocket,
+                        received_at=received_at,
+                        idempotency_key=message.get("idempotency_key"),
+                    ),
                 )
 
             elif action == "join":
@@ -126,55 +144,101 @@ async def websocket_endpoint(
                 logger.info(f"User {user_id} joined quiz {quiz_id}")
                 # Validate the quiz exists
                 try:
-                    await quiz_service.get_quiz(quiz_id)
+                    async with quiz_service_scope() as quiz_service:
+                        await quiz_service.get_quiz(quiz_id)
                 except QuizNotFoundException:
                     error_message = f"Quiz {quiz_id} does not exist."
                     logger.warning(error_message)
-                    await websocket.send_text(
-                        json.dumps({"type": "error", "message": error_message})
+                    # Stop the writer first so this reply can't race queued frames
+                    codec = manager.codec_for(websocket)
+                    await manager.disconnect(quiz_id, websocket)
+                    await send_payload(
+                        websocket,
+                        codec.encode({"type": "error", "message": error_message}),
                     )
                     return
 
                 # Optionally, validate the user exists
 
-                if not await user_service.get_user_by_id(user_id):
+                async with user_service_scope() as user_service:
+                    user = await user_service.get_user_by_id(user_id)
+                if not user:
                     error_message = f"User {user_id} does not exist."
                     logger.warning(error_message)
-                    await websocket.send_text(
-                        json.dumps({"type": "error", "message": error_message})
+                    # Stop the writer first so this reply can't race queued frames
+                    codec = manager.codec_for(websocket)
+                    await manager.disconnect(quiz_id, websocket)
+                    await send_payload(
+                        websocket,
+                        codec.encode({"type": "error", "message": error_message}),
                     )
                     return
 
+                if "view" in message:
+                    try:
+                        view = LeaderboardView.parse(
+                            message.get("view"),
+                            n=message.get("n"),
+                            k=message.get("k"),
+                        )
+                    except ValueError as e:
+                        await manager.send_personal(
+                            websocket, {"type": "error", "message": str(e)}
+                        )
+                        continue
+                    manager.set_view(quiz_id, websocket, view)
+
                 logger.info(f"User {user_id} successfully joined quiz {quiz_id}")
-                await websocket.send_text(
-                    json.dumps(
+                await manager.send_personal(
+                    websocket,
+                    {
+                        "type": "status",
+                        "message": f"User {user_id} joined quiz {quiz_id}.",
+                    },
+                )
+
+            elif action in CONTROL_COMMANDS:
+                # Only the quiz's creator may run it
+                try:
+                    async with quiz_service_scope() as quiz_service:
+                        quiz = await quiz_service.get_quiz(quiz_id)
+                except QuizNotFoundException as e:
+                    await manager.send_personal(
+                        websocket, {"type": "error", "message": e.detail}
+                    )
+                    continue
+                if quiz.creator_user_id != current_user.id:
+                    logger.warning(
+                        f"User {current_user.id} may not {action} for quiz ID {quiz_id}"
+                    )
+                    await manager.send_personal(
+                        websocket,
                         {
-                            "type": "status",
-                            "message": f"User {user_id} joined quiz {quiz_id}.",
-                        }
+                            "type": "error",
+                            "message": "Only the quiz creator can control the quiz.",
+                        },
                     )
-                )
+                    continue
+                command = CONTROL_COMMANDS[action](websocket=websocket)
+                await actors.tell(quiz_id, command)
 
-            elif action == "start_quiz":
-                # Handle starting the quiz
-                # For demonstration, we'll just broadcast the current leaderboard
-                leaderboard_entries = await quiz_service.get_leaderboard(
-                    quiz_id=quiz_id
-                )
-                leaderboard = Leaderboard(quiz_id=quiz_id, entries=leaderboard_entries)
-                await manager.broadcast_leaderboard(quiz_id, leaderboard)
-                logger.info(f"Quiz {quiz_id} started and leaderboard broadcasted")
+            elif action == "resync":
+                # Client detected a gap in leaderboard_delta sequence numbers
+                if quiz_id in manager.leaderboards:
+                    manager.send_snapshot(quiz_id, websocket)
+                else:
+                    coalescer.mark_dirty(quiz_id)
 
             else:
                 logger.warning(
                     f"Invalid action received for quiz ID {quiz_id}: {action}"
                 )
-                await websocket.send_text(
-                    json.dumps({"type": "error", "message": "Invalid action."})
+                await manager.send_personal(
+                    websocket, {"type": "error", "message": "Invalid action."}
                 )
     except WebSocketDisconnect:
-        manager.disconnect(quiz_id, websocket)
         logger.info(f"WebSocket disconnected for quiz ID {quiz_id}")
-
-        leaderboard_entries = await quiz_service.get_leaderboard(quiz_id=quiz_id)
-        await manager.broadcast_leaderboard(quiz_id, leaderboard_entries)
+    finally:
+        # Runs however the handler exits, so no writer or connection outlives it
+        await manager.disconnect(quiz_id, websocket)
+        coalescer.mark_dirty(quiz_id)
@@ -1,10 +1,13 @@
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, Field
 
 
 class QuestionCreate(BaseModel):
     text: str
     options: str
     correct_option: int
+    duration_seconds: Optional[int] = Field(default=None, ge=1, le=3600)
 
 
 class QuestionRead(BaseModel):
@@ -12,6 +15,7 @@ class QuestionRead(BaseModel):
     text: str
     options: str
     correct_option: int
+    duration_seconds: Optional[int] = None
 
     class Config:
         orm_mode = True
@@ -1,12 +1,18 @@
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class QuizCreate(BaseModel):
     quiz_id: str = None  # Optional, will be auto-generated if not provided
 
 
+class QuizClone(BaseModel):
+    # Target ids for the copies; when empty, ``count`` ids are generated
+    quiz_ids: List[str] = Field(default_factory=list, max_length=500)
+    count: int = Field(default=1, ge=1, le=500)
+
+
 class QuizRead(BaseModel):
     quiz_id: str
     creator_user_id: int
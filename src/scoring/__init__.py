@@ -0,0 +1,34 @@
+import os
+
+from src.scoring.base_scoring_strategy import BaseScoringStrategy
+from src.scoring.fixed_scoring_strategy import FixedScoringStrategy
+from src.scoring.speed_bonus_scoring_strategy import SpeedBonusScoringStrategy
+from src.scoring.streak_scoring_strategy import StreakScoringStrategy
+
+SCORING_STRATEGY = os.getenv("SCORING_STRATEGY", "fixed")
+SCORE_POINTS = int(os.getenv("SCORE_POINTS", 1))
+SPEED_BONUS_POINTS = int(os.getenv("SPEED_BONUS_POINTS", 10))
+STREAK_STEP = float(os.getenv("STREAK_STEP", 0.5))
+STREAK_MAX = int(os.getenv("STREAK_MAX", 4))
+
+
+def create_scoring_strategy(
+    strategy: str = SCORING_STRATEGY,
+) -> BaseScoringStrategy:
+    # "speed+streak" applies the streak multiplier to speed-bonus points
+    name, _, modifier = strategy.partition("+")
+    if name == "fixed":
+        base = FixedScoringStrategy(SCORE_POINTS)
+    elif name == "speed":
+        base = SpeedBonusScoringStrategy(SCORE_POINTS, SPEED_BONUS_POINTS)
+    elif name == "streak" and not modifier:
+        return StreakScoringStrategy(
+            FixedScoringStrategy(SCORE_POINTS), STREAK_STEP, STREAK_MAX
+        )
+    else:
+        raise ValueError(f"Unknown scoring strategy: {strategy}")
+    if not modifier:
+        return base
+    if modifier == "streak":
+        return StreakScoringStrategy(base, STREAK_STEP, STREAK_MAX)
+    raise ValueError(f"Unknown scoring strategy: {strategy}")
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class BaseScoringStrategy(ABC):
+    """
+    Turns a closed question's answers into points, one array element per
+    answer, so a whole burst is scored in a few vectorized operations.
+    """
+
+    @abstractmethod
+    def score(
+        self,
+        correct: np.ndarray,
+        elapsed: np.ndarray,
+        duration: float,
+        streaks: np.ndarray,
+    ) -> np.ndarray:
+        """
+        ``correct`` is a bool array, ``elapsed`` the seconds from the
+        question opening to the server receiving each answer, and
+        ``streaks`` each answerer's run of correct answers before this one.
+        Returns integer points.
+        """
+        pass
@@ -0,0 +1,17 @@
+import numpy as np
+
+from src.scoring.base_scoring_strategy import BaseScoringStrategy
+
+
+class FixedScoringStrategy(BaseScoringStrategy):
+    def __init__(self, points: int = 1):
+        self.points = points
+
+    def score(
+        self,
+        correct: np.ndarray,
+        elapsed: np.ndarray,
+        duration: float,
+        streaks: np.ndarray,
+    ) -> np.ndarray:
+        return correct.astype(np.int64) * self.points
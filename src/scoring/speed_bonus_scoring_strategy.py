@@ -0,0 +1,25 @@
+import numpy as np
+
+from src.scoring.base_scoring_strategy import BaseScoringStrategy
+
+
+class SpeedBonusScoringStrategy(BaseScoringStrategy):
+    """
+    Correct answers earn ``points`` plus up to ``bonus`` more, falling off
+    linearly from the moment the question opens to its deadline.
+    """
+
+    def __init__(self, points: int = 1, bonus: int = 10):
+        self.points = points
+        self.bonus = bonus
+
+    def score(
+        self,
+        correct: np.ndarray,
+        elapsed: np.ndarray,
+        duration: float,
+        streaks: np.ndarray,
+    ) -> np.ndarray:
+        remaining = np.clip(1.0 - elapsed / max(duration, 1e-9), 0.0, 1.0)
+        points = self.points + np.rint(remaining * self.bonus).astype(np.int64)
+        return np.where(correct, points, 0)
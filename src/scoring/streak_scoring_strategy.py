@@ -0,0 +1,28 @@
+import numpy as np
+
+from src.scoring.base_scoring_strategy import BaseScoringStrategy
+
+
+class StreakScoringStrategy(BaseScoringStrategy):
+    """
+    Multiplies another strategy's points by ``1 + step * streak``, with the
+    streak counting earlier consecutive correct answers up to ``max_streak``.
+    """
+
+    def __init__(
+        self, base: BaseScoringStrategy, step: float = 0.5, max_streak: int = 4
+    ):
+        self.base = base
+        self.step = step
+        self.max_streak = max_streak
+
+    def score(
+        self,
+        correct: np.ndarray,
+        elapsed: np.ndarray,
+        duration: float,
+        streaks: np.ndarray,
+    ) -> np.ndarray:
+        points = self.base.score(correct, elapsed, duration, streaks)
+        multiplier = 1.0 + self.step * np.minimum(streaks, self.max_streak)
+        return np.rint(points * multiplier).astype(np.int64)
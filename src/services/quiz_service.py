@@ -1,15 +1,34 @@
-from typing import List
+import json
+import uuid
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
+from src.caches import CachedQuestion, CachedQuiz, QuestionCache, QuizCache
+from src.caches.question_cache import parse_options
+from src.engines import BaseLeaderboardEngine
 from src.models import Participant, Question, QuizSession
 from src.repositories.quiz_repository import QuizRepository
 from src.schemas.question import QuestionCreate
+from src.services.score_aggregator import ScoreAggregator
 from src.utils.exceptions import QuizNotFoundException
 from src.utils.logger import LoggerSingleton
+from src.utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from src.utils.stream_parser import ParsedRow
 
 
 class QuizService:
-    def __init__(self, quiz_repository: QuizRepository):
+    def __init__(
+        self,
+        quiz_repository: QuizRepository,
+        score_aggregator: Optional[ScoreAggregator] = None,
+        leaderboard_engine: Optional[BaseLeaderboardEngine] = None,
+        question_cache: Optional[QuestionCache] = None,
+        quiz_cache: Optional[QuizCache] = None,
+    ):
         self.quiz_repository = quiz_repository
+        self.score_aggregator = score_aggregator
+        self.leaderboard_engine = leaderboard_engine
+        self.question_cache = question_cache
+        self.quiz_cache = quiz_cache
         self.logger = LoggerSingleton().logger
 
     async def create_quiz(self, creator_id: int, quiz_id: str = None):
@@ -25,7 +44,12 @@ class QuizService:
             raise e
 
     async def add_question_to_quiz(
-        self, quiz_id: str, text: str, options: str, correct_option: int
+        self,
+        quiz_id: str,
+        text: str,
+        options: str,
+        correct_option: int,
+        duration_seconds: Optional[int] = None,
     ):
         self.logger.info(f"Adding question to quiz ID: {quiz_id}")
         try:
@@ -33,9 +57,14 @@ class QuizService:
             question = await self.quiz_repository.add_question(
                 quiz_id,
                 QuestionCreate(
-                    text=text, options=options, correct_option=correct_option
+                    text=text,
+                    options=options,
+                    correct_option=correct_option,
+                    duration_seconds=duration_seconds,
                 ),
             )
+            if self.question_cache:
+                self.question_cache.invalidate(quiz_id)
             self.logger.info(
                 f"Question added to quiz ID: {quiz_id}, Question ID: {question.id}"
             )
@@ -44,19 +73,62 @@ class QuizService:
             self.logger.error(f"Error adding question to quiz ID {quiz_id}: {str(e)}")
             raise e
 
-    async def get_quiz(self, quiz_id: str) -> QuizSession:
-        self.logger.info(f"Retrieving quiz with ID: {quiz_id}")
+    async def get_quiz(self, quiz_id: str) -> Union[QuizSession, CachedQuiz]:
+        self.logger.debug("Retrieving quiz with ID: {}", quiz_id)
         try:
-            quiz = await self.quiz_repository.get_quiz_by_id(quiz_id)
+            if self.quiz_cache:
+                quiz = await self.quiz_cache.get(
+                    quiz_id, self.quiz_repository.get_quiz_by_id
+                )
+            else:
+                quiz = await self.quiz_repository.get_quiz_by_id(quiz_id)
             if not quiz:
                 self.logger.warning(f"Quiz with ID {quiz_id} not found")
                 raise QuizNotFoundException(detail=f"Quiz {quiz_id} not found.")
-            self.logger.info(f"Quiz retrieved successfully with ID: {quiz_id}")
+            self.logger.debug("Quiz retrieved successfully with ID: {}", quiz_id)
             return quiz
         except Exception as e:
             self.logger.error(f"Error retrieving quiz with ID {quiz_id}: {str(e)}")
             raise e
 
+    async def clone_quiz(
+        self, quiz_id: str, creator_id: int, target_quiz_ids: List[str], count: int = 1
+    ) -> Tuple[List[str], int]:
+        self.logger.info(f"Cloning quiz with ID: {quiz_id} by user ID: {creator_id}")
+        try:
+            await self.get_quiz(quiz_id)  # Ensure the source exists
+            if not target_quiz_ids:
+                target_quiz_ids = [str(uuid.uuid4()) for _ in range(count)]
+            if len(set(target_quiz_ids)) != len(target_quiz_ids):
+                raise ValueError("Target quiz IDs must be unique.")
+            existing = await self.quiz_repository.get_existing_quiz_ids(target_quiz_ids)
+            if existing:
+                raise ValueError(f"Quiz IDs already exist: {', '.join(existing)}")
+            copied = await self.quiz_repository.clone_quiz(
+                quiz_id, target_quiz_ids, creator_id
+            )
+            self.logger.info(
+                f"Quiz ID {quiz_id} cloned into {len(target_quiz_ids)} quizzes"
+            )
+            return target_quiz_ids, copied
+        except Exception as e:
+            self.logger.error(f"Error cloning quiz with ID {quiz_id}: {str(e)}")
+            raise e
+
+    async def update_status(self, quiz_id: str, status: str):
+        self.logger.info(f"Setting status of quiz ID {quiz_id} to {status}")
+        try:
+            await self.get_quiz(quiz_id)  # Ensure quiz exists
+            await self.quiz_repository.update_status(quiz_id, status)
+            if self.quiz_cache:
+                self.quiz_cache.invalidate(quiz_id)
+            self.logger.info(f"Status of quiz ID {quiz_id} set to {status}")
+        except Exception as e:
+            self.logger.error(
+                f"Error setting status of quiz ID {quiz_id} to {status}: {str(e)}"
+            )
+            raise e
+
     async def add_participant(self, quiz_id: str, user_id: int) -> Participant:
         self.logger.info(
             f"Adding participant to quiz ID: {quiz_id} by user ID: {user_id}"
@@ -64,6 +136,19 @@ class QuizService:
         try:
             await self.get_quiz(quiz_id)  # Ensure quiz exists
             participant = await self.quiz_repository.add_participant(quiz_id, user_id)
+            if self.score_aggregator:
+                self.score_aggregator.add_participant(
+                    quiz_id, user_id, participant.score
+                )
+            if self.leaderboard_engine and await self.leaderboard_engine.is_loaded(
+                quiz_id
+            ):
+                entry = await self.quiz_repository.get_participant_entry(
+                    quiz_id, user_id
+                )
+                await self.leaderboard_engine.add(
+                    quiz_id, user_id, entry["username"], entry["score"]
+                )
             self.logger.info(
                 f"Participant added successfully: Participant ID: {participant.id}"
             )
@@ -77,12 +162,36 @@ class QuizService:
     async def update_score(
         self, quiz_id: str, user_id: int, increment: int = 10
     ) -> int:
-        self.logger.info(f"Updating score for user ID: {user_id} in quiz ID: {quiz_id}")
+        self.logger.debug(
+            "Updating score for user ID: {} in quiz ID: {}", user_id, quiz_id
+        )
         try:
             await self.get_quiz(quiz_id)  # Ensure quiz exists
-            score = await self.quiz_repository.update_score(quiz_id, user_id, increment)
-            self.logger.info(
-                f"Score updated for user ID: {user_id} in quiz ID: {quiz_id}. New score: {score}"
+            if self.leaderboard_engine:
+                await self._ensure_leaderboard_loaded(quiz_id)
+            if self.score_aggregator:
+                # Written back to the database in batches
+                score = await self.score_aggregator.increment(
+                    quiz_id, user_id, increment
+                )
+                if score is None:
+                    self.logger.warning(
+                        f"Participant not found for user ID: {user_id} in quiz ID: {quiz_id}"
+                    )
+                    return 0
+            else:
+                score = await self.quiz_repository.update_score(
+                    quiz_id, user_id, increment
+                )
+            if self.leaderboard_engine:
+                score = await self.leaderboard_engine.increment(
+                    quiz_id, user_id, increment
+                )
+            LoggerSingleton().sampled(100).info(
+                "Score updated for user ID: {} in quiz ID: {}. New score: {}",
+                user_id,
+                quiz_id,
+                score,
             )
             return score
         except Exception as e:
@@ -91,13 +200,62 @@ class QuizService:
             )
             raise e
 
-    async def get_leaderboard(self, quiz_id: str) -> List[dict]:
-        self.logger.info(f"Retrieving leaderboard for quiz ID: {quiz_id}")
+    async def update_scores(
+        self, quiz_id: str, increments: Dict[int, int]
+    ) -> Dict[int, int]:
+        """
+        Applies a batch of score increments, as when a question closes.
+        Returns the new score of every participant that was updated.
+        """
+        self.logger.debug("Updating {} scores in quiz ID: {}", len(increments), quiz_id)
         try:
             await self.get_quiz(quiz_id)  # Ensure quiz exists
-            leaderboard = await self.quiz_repository.get_leaderboard(quiz_id)
-            self.logger.info(
-                f"Leaderboard retrieved successfully for quiz ID: {quiz_id}"
+            if self.leaderboard_engine:
+                await self._ensure_leaderboard_loaded(quiz_id)
+            if self.score_aggregator:
+                scores = await self.score_aggregator.increment_many(quiz_id, increments)
+            else:
+                await self.quiz_repository.apply_score_deltas(quiz_id, increments)
+                stored = await self.quiz_repository.get_scores(quiz_id)
+                scores = {
+                    user_id: stored[user_id]
+                    for user_id in increments
+                    if user_id in stored
+                }
+            if self.leaderboard_engine and scores:
+                scores = await self.leaderboard_engine.increment_many(
+                    quiz_id, {user_id: increments[user_id] for user_id in scores}
+                )
+            return scores
+        except Exception as e:
+            self.logger.error(f"Error updating scores in quiz ID {quiz_id}: {str(e)}")
+            raise e
+
+    async def _ensure_leaderboard_loaded(self, quiz_id: str):
+        async def load() -> List[dict]:
+            if self.score_aggregator:
+                await self.score_aggregator.flush(quiz_id)
+            return await self.quiz_repository.get_ranked_participants(quiz_id)
+
+        await self.leaderboard_engine.ensure_loaded(quiz_id, load)
+
+    async def get_leaderboard(
+        self, quiz_id: str, limit: Optional[int] = None
+    ) -> List[dict]:
+        self.logger.debug("Retrieving leaderboard for quiz ID: {}", quiz_id)
+        try:
+            await self.get_quiz(quiz_id)  # Ensure quiz exists
+            if self.leaderboard_engine:
+                await self._ensure_leaderboard_loaded(quiz_id)
+                leaderboard = await self.leaderboard_engine.top(quiz_id, limit)
+            else:
+                if self.score_aggregator:
+                    await self.score_aggregator.flush(quiz_id)
+                leaderboard = await self.quiz_repository.get_leaderboard(quiz_id)
+                if limit is not None:
+                    leaderboard = leaderboard[:limit]
+            self.logger.debug(
+                "Leaderboard retrieved successfully for quiz ID: {}", quiz_id
             )
             return leaderboard
         except Exception as e:
@@ -111,6 +269,8 @@ class QuizService:
         try:
             await self.get_quiz(quiz_id)  # Ensure quiz exists
             question = await self.quiz_repository.add_question(quiz_id, question_in)
+            if self.question_cache:
+                self.question_cache.invalidate(quiz_id)
             self.logger.info(
                 f"Question added successfully to quiz ID: {quiz_id}, Question ID: {question.id}"
             )
@@ -119,6 +279,74 @@ class QuizService:
             self.logger.error(f"Error adding question to quiz ID {quiz_id}: {str(e)}")
             raise e
 
+    async def import_questions(
+        self, quiz_id: str, rows: List[ParsedRow]
+    ) -> Tuple[int, List[dict]]:
+        """
+        Validates and inserts one batch of parsed question rows. Returns the
+        number imported and an error per rejected row.
+        """
+        self.logger.info(f"Importing {len(rows)} questions into quiz ID: {quiz_id}")
+        try:
+            await self.get_quiz(quiz_id)  # Ensure quiz exists
+            questions = []
+            errors = []
+            for row in rows:
+                try:
+                    if row.error:
+                        raise ValueError(row.error)
+                    questions.append(self._question_from_row(row.data))
+                except ValueError as e:
+                    errors.append({"line": row.line, "error": str(e)})
+            if questions:
+                await self.quiz_repository.add_questions(quiz_id, questions)
+                if self.question_cache:
+                    self.question_cache.invalidate(quiz_id)
+            self.logger.info(
+                f"Imported {len(questions)} questions into quiz ID: {quiz_id}, rejected {len(errors)}"
+            )
+            return len(questions), errors
+        except Exception as e:
+            self.logger.error(
+                f"Error importing questions into quiz ID {quiz_id}: {str(e)}"
+            )
+            raise e
+
+    @staticmethod
+    def _question_from_row(data: dict) -> dict:
+        text = str(data.get("text") or "").strip()
+        if not text:
+            raise ValueError("text is required")
+        options = data.get("options")
+        if isinstance(options, list):
+            options = [str(option) for option in options]
+        elif isinstance(options, str) and options.strip():
+            options = list(parse_options(options))
+        else:
+            raise ValueError("options are required")
+        try:
+            correct_option = int(data.get("correct_option"))
+        except (TypeError, ValueError):
+            raise ValueError("correct_option must be an integer")
+        if not 0 <= correct_option < len(options):
+            raise ValueError(f"correct_option must be between 0 and {len(options) - 1}")
+        duration_seconds = data.get("duration_seconds")
+        if duration_seconds in (None, ""):
+            duration_seconds = None
+        else:
+            try:
+                duration_seconds = int(duration_seconds)
+            except (TypeError, ValueError):
+                raise ValueError("duration_seconds must be an integer")
+            if not 1 <= duration_seconds <= 3600:
+                raise ValueError("duration_seconds must be between 1 and 3600")
+        return {
+            "text": text,
+            "options": json.dumps(options),
+            "correct_option": correct_option,
+            "duration_seconds": duration_seconds,
+        }
+
     async def get_questions(self, quiz_id: str) -> List[Question]:
         self.logger.info(f"Retrieving questions for quiz ID: {quiz_id}")
         try:
@@ -132,16 +360,94 @@ class QuizService:
             )
             raise e
 
-    async def get_participants(self, quiz_id: str) -> List[Participant]:
+    async def get_cached_questions(self, quiz_id: str) -> List[CachedQuestion]:
+        """The quiz's questions in the order they are asked."""
+        if self.question_cache:
+            entry = await self.question_cache.get(
+                quiz_id, self.quiz_repository.get_questions
+            )
+            return list(entry.questions.values())
+        questions = await self.quiz_repository.get_questions(quiz_id)
+        return [CachedQuestion.from_model(question) for question in questions]
+
+    async def get_participants(
+        self, quiz_id: str, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> dict:
         self.logger.info(f"Retrieving participants for quiz ID: {quiz_id}")
         try:
-            participants = await self.quiz_repository.get_participants(quiz_id)
+            await self.get_quiz(quiz_id)  # Ensure quiz exists
+            cursor = decode_cursor(after, 1)
+            if self.score_aggregator:
+                await self.score_aggregator.flush(quiz_id)
+            participants = await self.quiz_repository.get_participants_page(
+                quiz_id, limit, cursor[0] if cursor else None
+            )
+            next_cursor = None
+            if len(participants) == limit:
+                next_cursor = encode_cursor(participants[-1]["id"])
             self.logger.info(
                 f"Participants retrieved successfully for quiz ID: {quiz_id}"
             )
-            return participants
+            return {"items": participants, "next_cursor": next_cursor}
         except Exception as e:
             self.logger.error(
                 f"Error retrieving participants for quiz ID {quiz_id}: {str(e)}"
             )
             raise e
+
+    async def get_leaderboard_page(
+        self, quiz_id: str, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None
+    ) -> dict:
+        self.logger.info(f"Retrieving leaderboard page for quiz ID: {quiz_id}")
+        try:
+            await self.get_quiz(quiz_id)  # Ensure quiz exists
+            cursor = decode_cursor(after, 2)
+            if self.score_aggregator:
+                await self.score_aggregator.flush(quiz_id)
+            entries = await self.quiz_repository.get_leaderboard_page(
+                quiz_id, limit, cursor
+            )
+            next_cursor = None
+            if len(entries) == limit:
+                next_cursor = encode_cursor(entries[-1]["score"], entries[-1]["id"])
+            self.logger.info(
+                f"Leaderboard page retrieved successfully for quiz ID: {quiz_id}"
+            )
+            return {"items": entries, "next_cursor": next_cursor}
+        except Exception as e:
+            self.logger.error(
+                f"Error retrieving leaderboard page for quiz ID {quiz_id}: {str(e)}"
+            )
+            raise e
+
+    async def stream_participants(
+        self, quiz_id: str, after: Optional[str] = None
+    ) -> AsyncIterator[dict]:
+        cursor = decode_cursor(after, 1)
+        if self.score_aggregator:
+            await self.score_aggregator.flush(quiz_id)
+        return self.quiz_repository.stream_participants(
+            quiz_id, cursor[0] if cursor else None
+        )
+
+    async def stream_leaderboard(
+        self, quiz_id: str, after: Optional[str] = None
+    ) -> AsyncIterator[dict]:
+        cursor = decode_cursor(after, 2)
+        if self.score_aggregator:
+            await self.score_aggregator.flush(quiz_id)
+        return self.quiz_repository.stream_leaderboard(quiz_id, cursor)
+
+    async def end_quiz(self, quiz_id: str):
+        self.logger.info(f"Ending quiz with ID: {quiz_id}")
+        try:
+            if self.score_aggregator:
+                await self.score_aggregator.end_quiz(quiz_id)
+            await self.update_status(quiz_id, "completed")
+            if self.leaderboard_engine:
+                # Rebuilt from the database if the quiz is read again
+                await self.leaderboard_engine.drop(quiz_id)
+            self.logger.info(f"Quiz ended with ID: {quiz_id}")
+        except Exception as e:
+            self.logger.error(f"Error ending quiz with ID {quiz_id}: {str(e)}")
+            raise e
@@ -0,0 +1,133 @@
+import asyncio
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.quiz_repository import QuizRepository
+from src.utils.logger import LoggerSingleton
+
+
+class ScoreAggregator:
+    """
+    Write-behind score table for live quizzes.
+
+    Scores are loaded once per quiz and updated in memory, which is the
+    authority while the quiz runs. Unflushed increments are written back in
+    the background as one UPDATE per quiz per ``flush_interval``, and
+    flushed unconditionally when a quiz ends and on shutdown.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        flush_interval: float = 0.5,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.logger = LoggerSingleton().logger
+        self.scores: Dict[str, Dict[int, int]] = {}
+        self.pending: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self._load_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._flush_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush_all()
+
+    async def _table(self, quiz_id: str) -> Dict[int, int]:
+        table = self.scores.get(quiz_id)
+        if table is not None:
+            return table
+        async with self._load_locks[quiz_id]:
+            if quiz_id not in self.scores:
+                async with self.session_factory() as session:
+                    self.scores[quiz_id] = await QuizRepository(session).get_scores(
+                        quiz_id
+                    )
+        self._load_locks.pop(quiz_id, None)
+        return self.scores[quiz_id]
+
+    async def increment(
+        self, quiz_id: str, user_id: int, increment: int
+    ) -> Optional[int]:
+        """Returns the new score, or None if the user isn't a participant."""
+        scores = await self.increment_many(quiz_id, {user_id: increment})
+        return scores.get(user_id)
+
+    async def increment_many(
+        self, quiz_id: str, increments: Dict[int, int]
+    ) -> Dict[int, int]:
+        """
+        Applies a batch of increments and returns the new score of every
+        participant among them; users who aren't participants are left out.
+        """
+        table = await self._table(quiz_id)
+        missing = [user_id for user_id in increments if user_id not in table]
+        if missing:
+            # Joined after the table was loaded, e.g. through another worker
+            async with self.session_factory() as session:
+                joined = await QuizRepository(session).get_scores(quiz_id, missing)
+            for user_id, score in joined.items():
+                table.setdefault(user_id, score)
+        pending = self.pending[quiz_id]
+        scores = {}
+        for user_id, increment in increments.items():
+            if user_id not in table:
+                continue
+            table[user_id] += increment
+            pending[user_id] += increment
+            scores[user_id] = table[user_id]
+        return scores
+
+    def add_participant(self, quiz_id: str, user_id: int, score: int = 0):
+        table = self.scores.get(quiz_id)
+        if table is not None:
+            table.setdefault(user_id, score)
+
+    async def flush(self, quiz_id: str):
+        # Serialized per quiz so a caller never returns while an earlier
+        # flush of the same quiz is still being written
+        async with self._flush_locks[quiz_id]:
+            deltas = self.pending.pop(quiz_id, None)
+            if not deltas:
+                return
+            try:
+                async with self.session_factory() as session:
+                    await QuizRepository(session).apply_score_deltas(quiz_id, deltas)
+            except Exception as e:
+                # Keep the increments so the next flush retries them
+                pending = self.pending[quiz_id]
+                for user_id, delta in deltas.items():
+                    pending[user_id] += delta
+                self.logger.error(
+                    f"Error flushing scores for quiz ID {quiz_id}: {str(e)}"
+                )
+                raise
+
+    async def flush_all(self):
+        for quiz_id in list(self.pending):
+            try:
+                await self.flush(quiz_id)
+            except Exception:
+                continue
+
+    async def end_quiz(self, quiz_id: str):
+        await self.flush(quiz_id)
+        self.scores.pop(quiz_id, None)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush_all()
@@ -1,4 +1,4 @@
-from werkzeug.security import check_password_hash, generate_password_hash
+from typing import List, Set
 
 from src.repositories.user_repository import UserRepository
 from src.utils.exceptions import (
@@ -6,12 +6,21 @@ from src.utils.exceptions import (
     UserAlreadyExistsException,
     UserNotFoundException,
 )
+from src.utils.hashing import PasswordHasher, bulk_password_hasher, password_hasher
 from src.utils.logger import LoggerSingleton
+from src.utils.stream_parser import ParsedRow
 
 
 class UserService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        hasher: PasswordHasher = password_hasher,
+        bulk_hasher: PasswordHasher = bulk_password_hasher,
+    ):
         self.user_repository = user_repository
+        self.hasher = hasher
+        self.bulk_hasher = bulk_hasher
         self.logger = LoggerSingleton().logger
 
     async def create_user(self, username: str, password: str):
@@ -27,18 +36,80 @@ class UserService:
             )
 
         # Create the new user
-        hashed_password = generate_password_hash(password)
-        print(31, hashed_password)
+        hashed_password = await self.hasher.hash(password)
         if not hashed_password:
             self.logger.error(f"Password hashing failed for user: {username}")
             raise Exception("Password hashing returned null or empty string")
 
-        self.logger.debug(f"Hashed password for user {username}: {hashed_password}")
-
         new_user = await self.user_repository.create_user(username, hashed_password)
         self.logger.info(f"User created with ID: {new_user.id}")
         return new_user
 
+    async def bulk_create_users(
+        self, rows: List[ParsedRow], seen: Set[str]
+    ) -> List[dict]:
+        """
+        Provisions one batch of parsed rows and returns a result per row.
+        ``seen`` carries the usernames of earlier batches in the same upload.
+        """
+        self.logger.info(f"Bulk creating users from {len(rows)} rows")
+        results = {}
+        pending = []
+        for row in rows:
+            data = row.data or {}
+            username = str(data.get("username") or "").strip()
+            password = data.get("password")
+            if row.error or not username or not password:
+                results[row.line] = {
+                    "line": row.line,
+                    "status": "invalid",
+                    "error": row.error or "username and password are required",
+                }
+            elif username in seen:
+                results[row.line] = {
+                    "line": row.line,
+                    "username": username,
+                    "status": "duplicate",
+                }
+            else:
+                seen.add(username)
+                pending.append((row.line, username, str(password)))
+
+        # Skip hashing for users that already exist
+        existing = await self.user_repository.get_existing_usernames(
+            [username for _, username, _ in pending]
+        )
+        pending = [entry for entry in pending if entry[1] not in existing]
+        password_hashes = await self.bulk_hasher.hash_many(
+            [password for _, _, password in pending]
+        )
+        created = await self.user_repository.bulk_create_users(
+            [
+                {"username": username, "password_hash": password_hash}
+                for (_, username, _), password_hash in zip(pending, password_hashes)
+            ]
+        )
+
+        for row in rows:
+            if row.line in results:
+                continue
+            username = str(row.data["username"]).strip()
+            if username in created:
+                results[row.line] = {
+                    "line": row.line,
+                    "username": username,
+                    "status": "created",
+                    "id": created[username],
+                }
+            else:
+                results[row.line] = {
+                    "line": row.line,
+                    "username": username,
+                    "status": "exists",
+                }
+        self.logger.info(f"Bulk created {len(created)} users from {len(rows)} rows")
+        return [results[row.line] for row in rows]
+
     async def authenticate_user(self, username: str, password: str):
         self.logger.info(f"Authenticating user: {username}")
         user = await self.user_repository.get_user_by_username(username)
@@ -47,7 +118,7 @@ class UserService:
             raise UserNotFoundException(detail=f"User '{username}' not found.")
 
         # Check password
-        if not check_password_hash(user.password_hash, password):
+        if not await self.hasher.verify(user.password_hash, password):
             self.logger.warning(
                 f"Authentication failed. Invalid password for user: {username}"
             )
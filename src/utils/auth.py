@@ -1,14 +1,45 @@
+import os
+
 from fastapi import Depends, HTTPException, WebSocket
 from fastapi.security import OAuth2PasswordBearer
 
+from src.schemas.user import UserRead
 from src.services.user_service import UserService
-from src.utils.dependencies import get_user_service
+from src.utils.dependencies import get_user_service, principal_cache
 from src.utils.logger import LoggerSingleton
 from src.utils.token import decode_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 logger = LoggerSingleton().logger
 
+# Signed claims are enough to identify the user; skips the lookup entirely
+AUTH_TRUST_CLAIMS = os.getenv("AUTH_TRUST_CLAIMS", "false").lower() == "true"
+
+
+async def resolve_principal(
+    token: str, token_data: dict, user_service: UserService
+) -> UserRead:
+    """
+    Returns the user a decoded token belongs to, from the principal cache
+    when possible.
+    """
+    user = principal_cache.get(token)
+    if user:
+        return user
+
+    user_id = token_data.get("user_id")
+    if AUTH_TRUST_CLAIMS:
+        user = UserRead(id=user_id, username=token_data["username"])
+    else:
+        db_user = await user_service.get_user_by_id(user_id)
+        if not db_user:
+            logger.warning(f"User not found with ID: {user_id}")
+            raise HTTPException(status_code=404, detail="User not found")
+        user = UserRead(id=db_user.id, username=db_user.username)
+
+    principal_cache.put(token, user, token_data.get("exp"))
+    return user
+
 
 async def validate_and_get_user(token: str, user_service: UserService):
     """
@@ -17,17 +48,11 @@ async def validate_and_get_user(token: str, user_service: UserService):
     """
     try:
         token_data = decode_token(token)
-        user_id = token_data.get("user_id")
     except ValueError as e:
         logger.error(f"Token validation error: {str(e)}")
         raise HTTPException(status_code=401, detail=str(e))
 
-    user = await user_service.get_user_by_id(user_id)
-    if not user:
-        logger.warning(f"User not found with ID: {user_id}")
-        raise HTTPException(status_code=404, detail="User not found")
-
-    return user
+    return await resolve_principal(token, token_data, user_service)
 
 
 async def get_current_user(
@@ -54,11 +79,7 @@ async def get_current_user_for_ws(
             logger.warning("Invalid token: missing user_id.")
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        user = await user_service.get_user_by_id(user_id)
-        if not user:
-            logger.warning(f"User not found with ID: {user_id}")
-            raise HTTPException(status_code=404, detail="User not found")
-        return user
+        return await resolve_principal(token, payload, user_service)
     except Exception as e:
         logger.error(f"Token validation error: {str(e)}")
         raise HTTPException(status_code=401, detail="Invalid token")
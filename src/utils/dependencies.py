@@ -1,14 +1,53 @@
-from typing import AsyncGenerator
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.caches import PrincipalCache, QuestionCache, QuizCache
 from src.database import AsyncSessionLocal
+from src.engines import create_leaderboard_engine
 from src.repositories.quiz_repository import QuizRepository
 from src.repositories.user_repository import UserRepository
 from src.services.quiz_service import QuizService
+from src.services.score_aggregator import ScoreAggregator
 from src.services.user_service import UserService
 
+SCORE_FLUSH_INTERVAL_MS = int(os.getenv("SCORE_FLUSH_INTERVAL_MS", 500))
+QUESTION_CACHE_MAX_QUIZZES = int(os.getenv("QUESTION_CACHE_MAX_QUIZZES", 1024))
+QUIZ_CACHE_MAX_SIZE = int(os.getenv("QUIZ_CACHE_MAX_SIZE", 4096))
+QUIZ_CACHE_TTL_SECONDS = float(os.getenv("QUIZ_CACHE_TTL_SECONDS", 30))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", 10000))
+PRINCIPAL_CACHE_MAX_TTL_SECONDS = float(
+    os.getenv("PRINCIPAL_CACHE_MAX_TTL_SECONDS", 300)
+)
+
+# Shared by every request so live scores have a single in-memory authority
+score_aggregator = ScoreAggregator(
+    AsyncSessionLocal, flush_interval=SCORE_FLUSH_INTERVAL_MS / 1000
+)
+
+leaderboard_engine = create_leaderboard_engine()
+
+question_cache = QuestionCache(max_quizzes=QUESTION_CACHE_MAX_QUIZZES)
+
+quiz_cache = QuizCache(max_size=QUIZ_CACHE_MAX_SIZE, ttl=QUIZ_CACHE_TTL_SECONDS)
+
+principal_cache = PrincipalCache(
+    max_size=PRINCIPAL_CACHE_MAX_SIZE, max_ttl=PRINCIPAL_CACHE_MAX_TTL_SECONDS
+)
+
+
+def build_quiz_service(db: AsyncSession) -> QuizService:
+    return QuizService(
+        QuizRepository(db),
+        score_aggregator=score_aggregator,
+        leaderboard_engine=leaderboard_engine,
+        question_cache=question_cache,
+        quiz_cache=quiz_cache,
+    )
+
 
 # Dependency to provide an AsyncSession
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -18,11 +57,23 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 # Async-compatible QuizService provider
 async def get_quiz_service(db: AsyncSession = Depends(get_db)) -> QuizService:
-    quiz_repository = QuizRepository(db)
-    return QuizService(quiz_repository)
+    return build_quiz_service(db)
 
 
 # Async-compatible UserService provider
 async def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
     user_repository = UserRepository(db)
     return UserService(user_repository)
+
+
+# Service bound to its own short-lived session, for code outside a request
+@asynccontextmanager
+async def quiz_service_scope() -> AsyncIterator[QuizService]:
+    async with AsyncSessionLocal() as session:
+        yield build_quiz_service(session)
+
+
+@asynccontextmanager
+async def user_service_scope() -> AsyncIterator[UserService]:
+    async with AsyncSessionLocal() as session:
+        yield UserService(UserRepository(session))
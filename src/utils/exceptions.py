@@ -36,6 +36,17 @@ class InvalidAnswerException(HTTPException):
         super().__init__(status_code=400, detail=detail)
 
 
+class HashingBusyException(HTTPException):
+    def __init__(
+        self,
+        detail: str = "Server is busy, please retry shortly.",
+        retry_after: int = 1,
+    ):
+        super().__init__(
+            status_code=503, detail=detail, headers={"Retry-After": str(retry_after)}
+        )
+
+
 async def user_already_exists_handler(
     request: Request, exc: UserAlreadyExistsException
 ):
@@ -90,6 +101,15 @@ async def invalid_credentials_handler(
     )
 
 
+async def hashing_busy_handler(request: Request, exc: HashingBusyException):
+    logger_instance.warning(f"Password hashing saturated: {exc.detail}")
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=exc.headers,
+    )
+
+
 def register_exception_handlers(app: FastAPI):
     app.add_exception_handler(UserAlreadyExistsException, user_already_exists_handler)
     app.add_exception_handler(UserNotFoundException, user_not_found_handler)
@@ -98,3 +118,4 @@ def register_exception_handlers(app: FastAPI):
         ParticipantNotFoundException, participant_not_found_handler
     )
     app.add_exception_handler(InvalidAnswerException, invalid_answer_handler)
+    app.add_exception_handler(HashingBusyException, hashing_busy_handler)
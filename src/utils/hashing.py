@@ -0,0 +1,120 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from src.utils.exceptions import HashingBusyException
+from src.utils.logger import LoggerSingleton
+from src.utils.metrics import PASSWORD_HASH_QUEUE_DEPTH, PASSWORD_HASH_REJECTIONS
+
+# thread: hashlib releases the GIL while hashing; process: isolates the CPU
+HASH_EXECUTOR = os.getenv("HASH_EXECUTOR", "thread")
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", min(4, os.cpu_count() or 1)))
+HASH_MAX_PENDING = int(os.getenv("HASH_MAX_PENDING", 64))
+BULK_HASH_WORKERS = int(os.getenv("BULK_HASH_WORKERS", os.cpu_count() or 1))
+
+
+def _hash_batch(passwords: List[str]) -> List[str]:
+    return [generate_password_hash(password) for password in passwords]
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification off the event loop, at most
+    ``workers`` at a time. Once ``max_pending`` jobs are running or queued,
+    further calls fail fast with HashingBusyException (503) instead of
+    queueing behind a login storm. With ``wait`` they queue for a free slot
+    instead, for callers that can't give up halfway through.
+    """
+
+    def __init__(
+        self,
+        executor: str = HASH_EXECUTOR,
+        workers: int = HASH_WORKERS,
+        max_pending: int = HASH_MAX_PENDING,
+        wait: bool = False,
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown hash executor: {executor}")
+        self.executor_kind = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self.wait = wait
+        self.pending = 0
+        self._slots = asyncio.Semaphore(max_pending)
+        self._executor: Optional[Executor] = None
+        self.logger = LoggerSingleton().logger
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so importing the module doesn't fork workers
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def _run(self, fn: Callable, *args):
+        if self.wait:
+            async with self._slots:
+                return await self._submit(fn, *args)
+        if self.pending >= self.max_pending:
+            PASSWORD_HASH_REJECTIONS.inc()
+            self.logger.warning(
+                f"Password hashing saturated with {self.pending} pending jobs"
+            )
+            raise HashingBusyException()
+        return await self._submit(fn, *args)
+
+    async def _submit(self, fn: Callable, *args):
+        self.pending += 1
+        PASSWORD_HASH_QUEUE_DEPTH.inc()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+            PASSWORD_HASH_QUEUE_DEPTH.dec()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(generate_password_hash, password)
+
+    async def verify(self, password_hash: str, password: str) -> bool:
+        return await self._run(check_password_hash, password_hash, password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        # One job per worker rather than per password, so a large batch
+        # counts as ``workers`` pending jobs
+        if not passwords:
+            return []
+        size = -(-len(passwords) // self.workers)
+        chunks = [
+            passwords[start : start + size] for start in range(0, len(passwords), size)
+        ]
+        results = await asyncio.gather(
+            *(self._run(_hash_batch, chunk) for chunk in chunks)
+        )
+        return [password_hash for chunk in results for password_hash in chunk]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+# Bulk provisioning hashes thousands of passwords per request; a process
+# pool spreads that over every core without touching the login pool.
+# Concurrent uploads wait their turn: a 503 halfway through an upload would
+# lose the results of the batches already committed
+bulk_password_hasher = PasswordHasher(
+    executor="process",
+    workers=BULK_HASH_WORKERS,
+    max_pending=BULK_HASH_WORKERS * 2,
+    wait=True,
+)
@@ -1,7 +1,34 @@
+import os
 import sys
+from typing import Dict, Tuple
 
 from loguru import logger
 
+# development: colored console at INFO and a DEBUG file
+# production: JSON lines on stdout and a file, both at LOG_LEVEL
+LOG_PROFILE = os.getenv("LOG_PROFILE", "development")
+LOG_LEVEL = os.getenv(
+    "LOG_LEVEL", "INFO" if LOG_PROFILE == "development" else "WARNING"
+)
+
+
+class _NullLogger:
+    """Stands in for the logger on calls a sampler skips."""
+
+    def _skip(self, *args, **kwargs):
+        pass
+
+    def _self(self, *args, **kwargs):
+        return self
+
+    trace = debug = info = success = warning = error = critical = _skip
+    exception = log = _skip
+    # Chained calls such as opt(...).info(...) stay no-ops
+    bind = opt = patch = _self
+
+
+_null_logger = _NullLogger()
+
 
 class LoggerSingleton:
     _instance = None
@@ -16,12 +43,19 @@ class LoggerSingleton:
         # Remove the default handler
         logger.remove()
 
-        # Add a console handler
-        logger.add(
-            sys.stdout,
-            level="INFO",
-            format="<green>{time}</green> | <level>{level}</level> | <level>{message}</level>",
-        )
+        # Sinks are enqueued: the caller only pushes the record onto a queue
+        # and a background thread does the formatting and I/O
+        if LOG_PROFILE == "production":
+            logger.add(sys.stdout, level=LOG_LEVEL, serialize=True, enqueue=True)
+            file_level = LOG_LEVEL
+        else:
+            logger.add(
+                sys.stdout,
+                level=LOG_LEVEL,
+                format="<green>{time}</green> | <level>{level}</level> | <level>{message}</level>",
+                enqueue=True,
+            )
+            file_level = "DEBUG"
 
         # Add a file handler with rotation and retention
         logger.add(
@@ -29,8 +63,27 @@ class LoggerSingleton:
             rotation="10 MB",
             retention="10 days",
             compression="zip",
-            level="DEBUG",
+            level=file_level,
+            enqueue=True,
         )
 
         # Assign the configured logger to an instance attribute
         self.logger = logger
+        self._sample_counts: Dict[Tuple[str, int], int] = {}
+
+    def sampled(self, every: int = 100):
+        """
+        Returns the logger for one call in ``every`` from the calling line and
+        a no-op logger otherwise, for hot paths:
+
+            LoggerSingleton().sampled(100).info("Scored {} in {}", user, quiz)
+
+        Sampled records carry ``sample_rate`` in their extra fields.
+        """
+        frame = sys._getframe(1)
+        site = (frame.f_code.co_filename, frame.f_lineno)
+        count = self._sample_counts.get(site, 0)
+        self._sample_counts[site] = count + 1
+        if count % every:
+            return _null_logger
+        return self.logger.bind(sample_rate=every)
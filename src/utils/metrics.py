@@ -0,0 +1,65 @@
+from prometheus_client import Counter, Gauge
+from sqlalchemy import event
+
+# Exposed on /metrics next to the HTTP metrics from the instrumentator
+
+QUESTION_CACHE_HITS = Counter(
+    "question_cache_hits_total", "Question lookups served from the question cache"
+)
+QUESTION_CACHE_MISSES = Counter(
+    "question_cache_misses_total", "Question lookups that had to load the quiz"
+)
+QUESTION_CACHE_EVICTIONS = Counter(
+    "question_cache_evictions_total", "Quizzes evicted from the question cache"
+)
+
+QUIZ_CACHE_HITS = Counter(
+    "quiz_cache_hits_total", "Quiz lookups served from the quiz cache"
+)
+QUIZ_CACHE_MISSES = Counter(
+    "quiz_cache_misses_total", "Quiz lookups that went to the database"
+)
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "Password hash jobs running or waiting for a worker"
+)
+PASSWORD_HASH_REJECTIONS = Counter(
+    "password_hash_rejections_total", "Password hash jobs refused while saturated"
+)
+
+QUIZ_ACTORS_ACTIVE = Gauge("quiz_actors_active", "Live quiz actors on this worker")
+QUIZ_ACTOR_MAILBOX_DEPTH = Gauge(
+    "quiz_actor_mailbox_depth", "Commands waiting in quiz actor mailboxes"
+)
+
+ANSWERS_REJECTED = Counter(
+    "answers_rejected_total",
+    "Answers refused without grading, by reason",
+    ["reason"],
+)
+
+ANSWERS_DUPLICATE = Counter(
+    "answers_duplicate_total", "Resent answers acknowledged without regrading"
+)
+
+TIMERS_PENDING = Gauge("timers_pending", "Timers waiting in the timer scheduler")
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool",
+)
+
+
+def instrument_pool(engine):
+    """
+    Tracks checked-out connections of an engine's pool in DB_POOL_CHECKED_OUT.
+    """
+    target = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(target, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(target, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
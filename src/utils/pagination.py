@@ -0,0 +1,35 @@
+import base64
+import json
+from typing import Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursorException(ValueError):
+    pass
+
+
+def encode_cursor(*values) -> str:
+    """
+    Opaque cursor for keyset pagination: the sort key of the last row sent.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[Tuple]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise InvalidCursorException("Invalid cursor.")
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(value, int) for value in values)
+    ):
+        raise InvalidCursorException("Invalid cursor.")
+    return tuple(values)
@@ -0,0 +1,99 @@
+import codecs
+import csv
+import json
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Tuple
+
+MAX_LINE_BYTES = 64 * 1024
+
+
+class StreamParseError(ValueError):
+    pass
+
+
+@dataclass
+class ParsedRow:
+    line: int
+    data: Optional[dict] = None
+    error: Optional[str] = None
+
+
+def detect_format(content_type: Optional[str], fmt: Optional[str] = None) -> str:
+    """
+    Picks ``csv`` or ``jsonl`` from an explicit format, else the content type.
+    """
+    if fmt:
+        fmt = fmt.lower()
+        if fmt not in ("csv", "jsonl"):
+            raise StreamParseError(f"Unsupported format: {fmt}")
+        return fmt
+    if content_type and "csv" in content_type.lower():
+        return "csv"
+    return "jsonl"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    # Decodes incrementally so a multi-byte character split across chunks
+    # survives, and only ever holds one partial line
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line.rstrip("\r")
+        if len(buffer) > MAX_LINE_BYTES:
+            raise StreamParseError(
+                f"Line {line_no + 1} is longer than {MAX_LINE_BYTES}"
+            )
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield line_no + 1, buffer.rstrip("\r")
+
+
+async def iter_rows(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[ParsedRow]:
+    """
+    Yields one ParsedRow per non-blank record. Rows that can't be parsed are
+    yielded with ``error`` set rather than stopping the stream. CSV input
+    needs a header line; quoted fields can't span lines.
+    """
+    header: Optional[List[str]] = None
+    async for line_no, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                yield ParsedRow(
+                    line_no, error=f"Expected {len(header)} columns, got {len(values)}"
+                )
+                continue
+            yield ParsedRow(line_no, data=dict(zip(header, values)))
+        else:
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                yield ParsedRow(line_no, error=f"Invalid JSON: {e}")
+                continue
+            if not isinstance(data, dict):
+                yield ParsedRow(line_no, error="Expected a JSON object")
+                continue
+            yield ParsedRow(line_no, data=data)
+
+
+async def iter_batches(
+    rows: AsyncIterator[ParsedRow], size: int
+) -> AsyncIterator[List[ParsedRow]]:
+    batch: List[ParsedRow] = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -17,7 +17,7 @@ def decode_token(token: str) -> dict:
         if user_id is None or username is None:
             raise ValueError("Token payload does not contain user_id or username.")
 
-        return {"user_id": user_id, "username": username}
+        return {"user_id": user_id, "username": username, "exp": payload.get("exp")}
 
     except jwt.ExpiredSignatureError:
         raise ValueError("Token has expired.")
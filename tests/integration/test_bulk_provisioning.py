@@ -0,0 +1,71 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from werkzeug.security import check_password_hash
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.models import User
+from src.models.base import Base
+from src.repositories.user_repository import UserRepository
+from src.services.user_service import UserService
+from src.utils.hashing import PasswordHasher
+from src.utils.stream_parser import iter_batches, iter_rows
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add(User(id=1, username="ann", password_hash="x"))
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+async def upload(data: bytes):
+    yield data
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_every_row(session):
+    hasher = PasswordHasher(workers=2)
+    service = UserService(UserRepository(session), bulk_hasher=hasher)
+    data = (
+        b"username,password\n"
+        b"ann,secret\n"
+        b"bob,secret\n"
+        b"cat,\n"
+        b"bob,again\n"
+        b"dan,secret\n"
+    )
+
+    results = []
+    seen = set()
+    try:
+        async for batch in iter_batches(iter_rows(upload(data), "csv"), 2):
+            results.extend(await service.bulk_create_users(batch, seen))
+    finally:
+        hasher.shutdown()
+
+    assert [(r["line"], r["status"]) for r in results] == [
+        (2, "exists"),
+        (3, "created"),
+        (4, "invalid"),
+        (5, "duplicate"),
+        (6, "created"),
+    ]
+    rows = await session.execute(select(User.username, User.password_hash))
+    stored = dict(rows.all())
+    assert sorted(stored) == ["ann", "bob", "dan"]
+    assert check_password_hash(stored["bob"], "secret")
@@ -0,0 +1,79 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.models import Participant, QuizSession, User
+from src.models.base import Base
+from src.repositories.quiz_repository import QuizRepository
+from src.services.quiz_service import QuizService
+from src.utils.pagination import InvalidCursorException
+
+
+@pytest.fixture
+async def service():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add(QuizSession(quiz_id="quiz-1", creator_user_id=1))
+        for i in range(1, 26):
+            session.add(User(id=i, username=f"user-{i}", password_hash="x"))
+            # Plenty of ties so the id tie-breaker matters
+            session.add(Participant(quiz_id="quiz-1", user_id=i, score=i % 4))
+        await session.commit()
+        yield QuizService(QuizRepository(session))
+    await engine.dispose()
+
+
+async def walk(fetch, limit):
+    rows, after = [], None
+    while True:
+        page = await fetch("quiz-1", limit, after)
+        rows.extend(page["items"])
+        after = page["next_cursor"]
+        if after is None:
+            return rows
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_pages_match_a_full_scan(service):
+    paged = await walk(service.get_leaderboard_page, 4)
+    streamed = [row async for row in await service.stream_leaderboard("quiz-1")]
+
+    assert paged == streamed
+    assert len(paged) == 25
+    assert [(row["score"], row["id"]) for row in paged] == sorted(
+        ((row["score"], row["id"]) for row in paged), key=lambda key: (-key[0], key[1])
+    )
+
+
+@pytest.mark.asyncio
+async def test_participants_pages_are_plain_rows(service):
+    paged = await walk(service.get_participants, 10)
+
+    assert [row["user_id"] for row in paged] == list(range(1, 26))
+    assert paged[0] == {"id": 1, "user_id": 1, "username": "user-1", "score": 1}
+
+    page = await service.get_participants("quiz-1", 10)
+    rest = [
+        row["id"]
+        async for row in await service.stream_participants(
+            "quiz-1", page["next_cursor"]
+        )
+    ]
+    assert rest == list(range(11, 26))
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(service):
+    with pytest.raises(InvalidCursorException):
+        await service.get_leaderboard_page("quiz-1", 10, "not-a-cursor")
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.utils.metrics import DB_POOL_CHECKED_OUT, instrument_pool
+
+
+@pytest.mark.asyncio
+async def test_gauge_follows_connection_checkout(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/pool.db")
+    instrument_pool(engine)
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    baseline = DB_POOL_CHECKED_OUT._value.get()
+
+    async with factory() as session:
+        # A session only takes a connection once it runs a statement
+        assert DB_POOL_CHECKED_OUT._value.get() == baseline
+        await session.execute(text("SELECT 1"))
+        assert DB_POOL_CHECKED_OUT._value.get() == baseline + 1
+    assert DB_POOL_CHECKED_OUT._value.get() == baseline
+
+    await engine.dispose()
@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.caches import QuestionCache
+from src.models import QuizSession, User
+from src.models.base import Base
+from src.repositories.quiz_repository import QuizRepository
+from src.services.quiz_service import QuizService
+from src.utils.stream_parser import iter_batches, iter_rows
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all(
+            [
+                User(id=1, username="ann", password_hash="x"),
+                QuizSession(quiz_id="quiz-1", creator_user_id=1),
+            ]
+        )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+async def upload(lines):
+    for line in lines:
+        yield (json.dumps(line) + "\n").encode()
+
+
+@pytest.mark.asyncio
+async def test_import_inserts_valid_rows_and_reports_the_rest(session):
+    cache = QuestionCache()
+    service = QuizService(QuizRepository(session), question_cache=cache)
+    # Warm the cache with no questions
+    assert await service.get_cached_questions("quiz-1") == []
+    lines = [
+        {"text": "2 + 2?", "options": ["3", "4"], "correct_option": 1},
+        {"text": "", "options": ["a"], "correct_option": 0},
+        {"text": "Capital of France?", "options": "Paris, Rome", "correct_option": 0},
+        {"text": "Out of range", "options": ["a", "b"], "correct_option": 2},
+        {"text": "Sky?", "options": '["blue", "green"]', "correct_option": "0"},
+    ]
+
+    imported = 0
+    errors = []
+    async for batch in iter_batches(iter_rows(upload(lines), "jsonl"), 2):
+        count, batch_errors = await service.import_questions("quiz-1", batch)
+        imported += count
+        errors.extend(batch_errors)
+
+    assert imported == 3
+    assert [error["line"] for error in errors] == [2, 4]
+    questions = await service.get_questions("quiz-1")
+    assert [json.loads(q.options) for q in questions] == [
+        ["3", "4"],
+        ["Paris", "Rome"],
+        ["blue", "green"],
+    ]
+    # The import invalidated the cached (empty) question set
+    cached = await service.get_cached_questions("quiz-1")
+    assert [q.id for q in cached] == [q.id for q in questions]
+    assert cached[0].option_index(1) == cached[0].correct_option
+    assert cached[1].option_index("Paris") == cached[1].correct_option
+
+
+@pytest.mark.asyncio
+async def test_clone_copies_questions_into_new_quizzes(session):
+    service = QuizService(QuizRepository(session))
+    lines = [
+        {"text": f"Question {i}", "options": ["a", "b"], "correct_option": i % 2}
+        for i in range(3)
+    ]
+    async for batch in iter_batches(iter_rows(upload(lines), "jsonl"), 10):
+        await service.import_questions("quiz-1", batch)
+
+    quiz_ids, copied = await service.clone_quiz(
+        "quiz-1", creator_id=1, target_quiz_ids=["quiz-2", "quiz-3"]
+    )
+
+    assert quiz_ids == ["quiz-2", "quiz-3"]
+    assert copied == 3
+    clone = await service.get_questions("quiz-3")
+    assert [(q.text, q.correct_option) for q in clone] == [
+        ("Question 0", 0),
+        ("Question 1", 1),
+        ("Question 2", 0),
+    ]
+    with pytest.raises(ValueError):
+        await service.clone_quiz("quiz-1", creator_id=1, target_quiz_ids=["quiz-2"])
+    generated, _ = await service.clone_quiz(
+        "quiz-1", creator_id=1, target_quiz_ids=[], count=2
+    )
+    assert len(generated) == 2
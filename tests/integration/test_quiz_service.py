@@ -1,3 +1,4 @@
+import asyncio
 import os
 import random
 import sys
@@ -66,3 +67,24 @@ async def test_create_quiz_and_add_participant(async_db_session: AsyncSession):
     # Assertions to verify the participant was added correctly
     assert participant.quiz_id == created_quiz.quiz_id
     assert participant.score == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_joins_share_one_participant(tmp_path):
+    # A file database, so the two sessions really are separate connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/quiz.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async_session = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async with async_session() as first, async_session() as second:
+        await QuizRepository(first).create_quiz("quiz-1", creator_id=1)
+        joined = await asyncio.gather(
+            QuizRepository(first).add_participant("quiz-1", 2),
+            QuizRepository(second).add_participant("quiz-1", 2),
+        )
+
+    assert joined[0].id == joined[1].id
+    await engine.dispose()
@@ -0,0 +1,126 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.engines.memory_leaderboard_engine import MemoryLeaderboardEngine
+from src.models import Participant, QuizSession, User
+from src.models.base import Base
+from src.repositories.quiz_repository import QuizRepository
+from src.services.quiz_service import QuizService
+from src.services.score_aggregator import ScoreAggregator
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all(
+            [
+                User(id=1, username="ann", password_hash="x"),
+                User(id=2, username="bob", password_hash="x"),
+                QuizSession(quiz_id="quiz-1", creator_user_id=1),
+                Participant(quiz_id="quiz-1", user_id=1, score=0),
+                Participant(quiz_id="quiz-1", user_id=2, score=5),
+            ]
+        )
+        await session.commit()
+
+    yield factory
+    await engine.dispose()
+
+
+async def stored_scores(session_factory):
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Participant.user_id, Participant.score).order_by(Participant.user_id)
+        )
+        return dict(result.all())
+
+
+@pytest.mark.asyncio
+async def test_increments_are_batched_until_flush(session_factory):
+    aggregator = ScoreAggregator(session_factory)
+
+    for _ in range(50):
+        await aggregator.increment("quiz-1", 1, 1)
+    assert await aggregator.increment("quiz-1", 2, 3) == 8
+    assert await aggregator.increment("quiz-1", 99, 1) is None
+    assert await stored_scores(session_factory) == {1: 0, 2: 5}
+
+    await aggregator.end_quiz("quiz-1")
+
+    assert await stored_scores(session_factory) == {1: 50, 2: 8}
+    assert "quiz-1" not in aggregator.scores
+
+
+@pytest.mark.asyncio
+async def test_service_reads_leaderboard_from_engine(session_factory):
+    aggregator = ScoreAggregator(session_factory)
+    engine = MemoryLeaderboardEngine()
+
+    async with session_factory() as session:
+        quiz_service = QuizService(
+            QuizRepository(session),
+            score_aggregator=aggregator,
+            leaderboard_engine=engine,
+        )
+        assert await quiz_service.update_score("quiz-1", 1, 7) == 7
+        assert await quiz_service.update_score("quiz-1", 99, 1) == 0
+
+        assert await quiz_service.get_leaderboard("quiz-1") == [
+            {"username": "ann", "score": 7},
+            {"username": "bob", "score": 5},
+        ]
+        assert await engine.rank("quiz-1", 2) == 2
+
+
+@pytest.mark.asyncio
+async def test_service_applies_a_batch_of_increments(session_factory):
+    aggregator = ScoreAggregator(session_factory)
+
+    async with session_factory() as session:
+        quiz_service = QuizService(
+            QuizRepository(session),
+            score_aggregator=aggregator,
+            leaderboard_engine=MemoryLeaderboardEngine(),
+        )
+        assert await quiz_service.update_scores("quiz-1", {1: 3, 2: 2, 99: 1}) == {
+            1: 3,
+            2: 7,
+        }
+
+    await aggregator.end_quiz("quiz-1")
+    assert await stored_scores(session_factory) == {1: 3, 2: 7}
+
+
+@pytest.mark.asyncio
+async def test_participant_added_after_the_first_update_is_scored(session_factory):
+    aggregator = ScoreAggregator(session_factory)
+    assert await aggregator.increment("quiz-1", 1, 1) == 1
+
+    # Joined through another worker, so this aggregator was never told
+    async with session_factory() as session:
+        session.add_all(
+            [
+                User(id=3, username="cat", password_hash="x"),
+                Participant(quiz_id="quiz-1", user_id=3, score=0),
+            ]
+        )
+        await session.commit()
+
+    assert await aggregator.increment("quiz-1", 3, 4) == 4
+    assert await aggregator.increment("quiz-1", 99, 1) is None
+    await aggregator.end_quiz("quiz-1")
+    assert await stored_scores(session_factory) == {1: 1, 2: 5, 3: 4}
@@ -0,0 +1,146 @@
+"""
+Leaderboard query benchmark.
+
+Seeds one quiz with N participants, prints the query plan of the leaderboard
+query and the latency of the joined projection next to the old
+load-every-Participant-and-its-User approach.
+
+    python tests/load/bench_leaderboard_query.py
+    python tests/load/bench_leaderboard_query.py --url postgresql+asyncpg://... --participants 10000
+
+Against Postgres the script creates the tables if needed and removes the rows
+it seeded when it finishes.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if project_root not in sys.path:
+    sys.path.append(project_root)
+from src.models import Base, Participant, QuizSession, User
+from src.repositories.quiz_repository import QuizRepository
+
+
+async def seed(session, quiz_id: str, participants: int) -> list:
+    prefix = quiz_id[:8]
+    users = [
+        {"username": f"bench-{prefix}-{i}", "password_hash": "x"}
+        for i in range(participants)
+    ]
+    await session.execute(insert(User), users)
+    result = await session.execute(
+        select(User.id).where(User.username.like(f"bench-{prefix}-%"))
+    )
+    user_ids = [row[0] for row in result.all()]
+    session.add(QuizSession(quiz_id=quiz_id, creator_user_id=user_ids[0]))
+    await session.flush()
+    await session.execute(
+        insert(Participant),
+        [
+            {"quiz_id": quiz_id, "user_id": user_id, "score": (i * 7919) % 1000}
+            for i, user_id in enumerate(user_ids)
+        ],
+    )
+    await session.commit()
+    return user_ids
+
+
+async def cleanup(session, quiz_id: str, user_ids: list):
+    await session.execute(delete(Participant).where(Participant.quiz_id == quiz_id))
+    await session.execute(delete(QuizSession).where(QuizSession.quiz_id == quiz_id))
+    await session.execute(delete(User).where(User.id.in_(user_ids)))
+    await session.commit()
+
+
+async def explain(session, dialect: str, quiz_id: str):
+    query = (
+        select(User.username, Participant.score)
+        .join(User, Participant.user_id == User.id)
+        .where(Participant.quiz_id == quiz_id)
+        .order_by(Participant.score.desc(), Participant.id)
+    )
+    compiled = query.compile(
+        dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    prefix = "EXPLAIN QUERY PLAN" if dialect == "sqlite" else "EXPLAIN ANALYZE"
+    result = await session.execute(text(f"{prefix} {compiled}"))
+    print(f"--- {prefix} ---")
+    for row in result.all():
+        print(" | ".join(str(column) for column in row))
+
+
+async def legacy_leaderboard(session, quiz_id: str) -> list:
+    result = await session.execute(
+        select(Participant)
+        .options(selectinload(Participant.user))
+        .filter_by(quiz_id=quiz_id)
+        .order_by(Participant.score.desc())
+    )
+    return [
+        {"username": p.user.username, "score": p.score} for p in result.scalars().all()
+    ]
+
+
+async def timed(factory, fn, quiz_id: str, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        async with factory() as session:
+            start = time.perf_counter()
+            await fn(session, quiz_id)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: list):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(
+        f"{label:<22} median {statistics.median(samples):8.2f} ms"
+        f"   p95 {p95:8.2f} ms   min {samples[0]:8.2f} ms"
+    )
+
+
+async def main(args):
+    engine = create_async_engine(args.url)
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    quiz_id = f"bench-{uuid.uuid4()}"
+    async with factory() as session:
+        user_ids = await seed(session, quiz_id, args.participants)
+    try:
+        async with factory() as session:
+            await explain(session, engine.dialect.name, quiz_id)
+
+        async def projected(session, quiz_id):
+            return await QuizRepository(session).get_leaderboard(quiz_id)
+
+        print(f"--- {args.participants} participants, {args.runs} runs ---")
+        report("joined projection", await timed(factory, projected, quiz_id, args.runs))
+        report(
+            "ORM + selectinload",
+            await timed(factory, legacy_leaderboard, quiz_id, args.runs),
+        )
+    finally:
+        async with factory() as session:
+            await cleanup(session, quiz_id, user_ids)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--participants", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
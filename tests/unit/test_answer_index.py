@@ -0,0 +1,34 @@
+from src.realtime.answer_index import AnswerIndex
+
+
+def test_bitsets_track_answers_per_question():
+    index = AnswerIndex()
+
+    for user_id in range(1000):
+        if user_id % 3 == 0:
+            index.mark_answered(1, user_id)
+    index.mark_answered("2", 999)
+
+    assert index.has_answered("1", 300)
+    assert not index.has_answered(1, 301)
+    assert index.has_answered(2, 999) and not index.has_answered(2, 0)
+    assert not index.has_answered(3, 0)
+    assert not index.has_answered(1, 5000)
+    # One bit per participant slot, grown in 64-byte chunks
+    assert len(index.answered["1"]) == 64
+    assert len(index.answered["2"]) == 64
+
+
+def test_idempotency_keys_are_per_user_and_bounded():
+    index = AnswerIndex(max_keys=2)
+
+    index.remember(1, "a", {"n": 1})
+    index.remember(2, "a", {"n": 2})
+    assert index.reply_for(1, "a") == {"n": 1}
+    index.remember(1, "b", {"n": 3})
+
+    # The least recently used key went first
+    assert index.reply_for(2, "a") is None
+    assert index.reply_for(1, "a") == {"n": 1}
+    assert index.reply_for(1, "b") == {"n": 3}
+    assert index.reply_for(1, None) is None
@@ -0,0 +1,56 @@
+import asyncio
+
+import msgpack
+
+from src.broadcasters import MemoryBroadcaster
+from src.realtime.codec import JSON_CODEC, MSGPACK_CODEC, negotiate_codec
+from src.realtime.connection_manager import ConnectionManager
+from src.schemas.leaderboard import Leaderboard, LeaderboardEntry
+from tests.utils.websocket import FakeWebSocket
+
+
+def test_negotiation_prefers_subprotocol_then_query_then_json():
+    assert negotiate_codec(FakeWebSocket(subprotocols=["msgpack"])) == (
+        MSGPACK_CODEC,
+        "msgpack",
+    )
+    assert negotiate_codec(FakeWebSocket(query_params={"encoding": "msgpack"})) == (
+        MSGPACK_CODEC,
+        None,
+    )
+    assert negotiate_codec(FakeWebSocket()) == (JSON_CODEC, None)
+
+
+async def test_mixed_codecs_in_one_room():
+    manager = ConnectionManager(MemoryBroadcaster())
+    await manager.start()
+    json_socket = FakeWebSocket()
+    binary_socket = FakeWebSocket(subprotocols=["msgpack"])
+    await manager.connect("quiz-1", json_socket)
+    await manager.connect("quiz-1", binary_socket)
+    assert binary_socket.accepted_subprotocol == "msgpack"
+
+    entries = [LeaderboardEntry(username="ann", score=3)]
+    await manager.broadcast_leaderboard(
+        "quiz-1", Leaderboard(quiz_id="quiz-1", entries=entries)
+    )
+    await asyncio.sleep(0.01)
+
+    assert isinstance(json_socket.sent[-1], str)
+    message = msgpack.unpackb(binary_socket.sent[-1], raw=False)
+    assert message["type"] == "leaderboard_delta"
+    assert message["data"]["changes"] == [{"username": "ann", "score": 3, "rank": 1}]
+
+
+async def test_broadcast_frame_is_encoded_once_and_shared():
+    manager = ConnectionManager(MemoryBroadcaster())
+    await manager.start()
+    sockets = [FakeWebSocket() for _ in range(3)]
+    for socket in sockets:
+        await manager.connect("quiz-1", socket)
+
+    await manager.deliver_local("quiz-1", {"type": "quiz_end", "data": {}})
+    await asyncio.sleep(0.01)
+
+    first = sockets[0].sent[-1]
+    assert all(socket.sent[-1] is first for socket in sockets)
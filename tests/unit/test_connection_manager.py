@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+from src.broadcasters import MemoryBroadcaster, MemoryBroker
+from src.realtime.connection_manager import ConnectionManager
+from src.realtime.leaderboard_views import LeaderboardView
+from src.schemas.leaderboard import Leaderboard, LeaderboardEntry
+from tests.utils.websocket import FakeWebSocket
+
+
+async def test_broadcast_reaches_sockets_on_every_worker():
+    broker = MemoryBroker()
+    worker_a = ConnectionManager(MemoryBroadcaster(broker))
+    worker_b = ConnectionManager(MemoryBroadcaster(broker))
+    await worker_a.start()
+    await worker_b.start()
+
+    socket_a = FakeWebSocket()
+    socket_b = FakeWebSocket()
+    await worker_a.connect("quiz-1", socket_a)
+    await worker_b.connect("quiz-1", socket_b)
+
+    leaderboard = Leaderboard(
+        quiz_id="quiz-1", entries=[LeaderboardEntry(username="ann", score=3)]
+    )
+    await worker_a.broadcast_leaderboard("quiz-1", leaderboard)
+    await asyncio.sleep(0.01)
+
+    for socket in (socket_a, socket_b):
+        message = json.loads(socket.sent[-1])
+        assert message["type"] == "leaderboard_delta"
+        assert message["seq"] == 1
+        assert message["data"]["changes"] == [
+            {"username": "ann", "score": 3, "rank": 1}
+        ]
+
+
+async def test_late_joiner_gets_snapshot_then_deltas():
+    manager = ConnectionManager(MemoryBroadcaster())
+    await manager.start()
+    await manager.connect("quiz-1", FakeWebSocket())
+
+    entries = [LeaderboardEntry(username="ann", score=3)]
+    await manager.broadcast_leaderboard(
+        "quiz-1", Leaderboard(quiz_id="quiz-1", entries=entries)
+    )
+
+    late = FakeWebSocket()
+    await manager.connect("quiz-1", late)
+    await asyncio.sleep(0.01)
+    entries = [
+        LeaderboardEntry(username="bob", score=5),
+        LeaderboardEntry(username="ann", score=3),
+    ]
+    await manager.broadcast_leaderboard(
+        "quiz-1", Leaderboard(quiz_id="quiz-1", entries=entries)
+    )
+    await asyncio.sleep(0.01)
+
+    snapshot = json.loads(late.sent[0])
+    assert snapshot["type"] == "leaderboard_update"
+    assert snapshot["seq"] == 1
+    delta = json.loads(late.sent[-1])
+    assert delta["seq"] == 2
+
+
+async def test_worker_unsubscribes_when_last_socket_leaves():
+    broadcaster = MemoryBroadcaster()
+    manager = ConnectionManager(broadcaster)
+    await manager.start()
+
+    socket = FakeWebSocket()
+    await manager.connect("quiz-1", socket)
+    assert "quiz-1" in broadcaster.subscriptions
+
+    await manager.disconnect("quiz-1", socket)
+    assert "quiz-1" not in broadcaster.subscriptions
+    assert "quiz-1" not in manager.active_connections
+
+
+async def test_top_n_viewer_gets_constant_size_view():
+    manager = ConnectionManager(MemoryBroadcaster())
+    await manager.start()
+    socket = FakeWebSocket()
+    await manager.connect(
+        "quiz-1",
+        socket,
+        username="user-42",
+        view=LeaderboardView.parse("around_me", n=3, k=1),
+    )
+
+    entries = [
+        LeaderboardEntry(username=f"user-{i}", score=1000 - i) for i in range(500)
+    ]
+    await manager.broadcast_leaderboard(
+        "quiz-1", Leaderboard(quiz_id="quiz-1", entries=entries)
+    )
+    await asyncio.sleep(0.01)
+
+    message = json.loads(socket.sent[-1])
+    assert message["type"] == "leaderboard_view"
+    assert message["data"]["total"] == 500
+    assert [entry["rank"] for entry in message["data"]["top"]] == [1, 2, 3]
+    assert message["data"]["me"] == {"username": "user-42", "score": 958, "rank": 43}
+    assert [entry["username"] for entry in message["data"]["around"]] == [
+        "user-41",
+        "user-42",
+        "user-43",
+    ]
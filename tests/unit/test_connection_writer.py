@@ -0,0 +1,52 @@
+import asyncio
+
+from src.realtime.connection_writer import ConnectionWriter
+from tests.utils.websocket import FakeWebSocket
+
+
+class StalledWebSocket(FakeWebSocket):
+    """Accepts writes but never finishes sending them."""
+
+    async def send_text(self, data: str):
+        await asyncio.Event().wait()
+
+
+async def test_latest_leaderboard_wins_while_client_is_busy():
+    websocket = FakeWebSocket()
+    writer = ConnectionWriter(websocket)
+    writer.start()
+
+    writer.send("reply")
+    for version in range(5):
+        writer.send_leaderboard(f"leaderboard-{version}")
+    await asyncio.sleep(0.01)
+
+    assert websocket.sent == ["reply", "leaderboard-4"]
+    assert writer.dropped == 4
+    await writer.stop()
+
+
+async def test_stalled_client_is_disconnected_without_blocking_others():
+    stalled = StalledWebSocket()
+    closed = []
+    writer = ConnectionWriter(stalled, max_lag=0.05, on_close=closed.append)
+    writer.start()
+
+    assert writer.send_leaderboard("first")
+    await asyncio.sleep(0.1)
+
+    assert writer.closed
+    assert closed == [writer]
+    await asyncio.sleep(0)
+    assert stalled.closed
+
+
+async def test_queue_overflow_disconnects_client():
+    writer = ConnectionWriter(StalledWebSocket(), max_queue=2)
+    writer.start()
+    assert writer.send("a")
+    await asyncio.sleep(0)
+    assert writer.send("b")
+    assert writer.send("c")
+    assert not writer.send("d")
+    assert writer.closed
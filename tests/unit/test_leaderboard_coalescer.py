@@ -0,0 +1,42 @@
+import asyncio
+
+from src.realtime.leaderboard_coalescer import LeaderboardCoalescer
+from src.schemas.leaderboard import Leaderboard
+
+
+def make_coalescer(tick: float):
+    loads = []
+    published = []
+
+    async def loader(quiz_id: str) -> Leaderboard:
+        loads.append(quiz_id)
+        return Leaderboard(quiz_id=quiz_id, entries=[])
+
+    async def publisher(quiz_id: str, leaderboard: Leaderboard):
+        published.append(leaderboard)
+
+    return LeaderboardCoalescer(loader, publisher, tick=tick), loads, published
+
+
+async def test_burst_of_updates_is_flushed_once_per_tick():
+    coalescer, loads, published = make_coalescer(tick=0.05)
+
+    for _ in range(500):
+        coalescer.mark_dirty("quiz-1")
+    coalescer.mark_dirty("quiz-2")
+    assert loads == []
+
+    await asyncio.sleep(0.1)
+    assert sorted(loads) == ["quiz-1", "quiz-2"]
+    assert len(published) == 2
+
+
+async def test_flush_now_skips_the_tick():
+    coalescer, loads, published = make_coalescer(tick=10)
+
+    coalescer.mark_dirty("quiz-1")
+    await coalescer.flush_now("quiz-1")
+
+    assert loads == ["quiz-1"]
+    assert len(published) == 1
+    await coalescer.stop()
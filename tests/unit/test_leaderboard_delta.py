@@ -0,0 +1,56 @@
+import asyncio
+import json
+from functools import partial
+
+from src.realtime.codec import JSON_CODEC
+from src.realtime.connection_writer import ConnectionWriter
+from src.realtime.leaderboard_delta import LeaderboardState
+from tests.utils.websocket import FakeWebSocket
+
+
+def test_delta_only_carries_changed_entries():
+    state = LeaderboardState("quiz-1")
+    state.apply(
+        [
+            {"username": "ann", "score": 5},
+            {"username": "bob", "score": 3},
+            {"username": "cat", "score": 1},
+        ]
+    )
+
+    delta = state.apply(
+        [
+            {"username": "bob", "score": 6},
+            {"username": "ann", "score": 5},
+            {"username": "cat", "score": 1},
+        ]
+    )
+
+    assert delta.message["seq"] == 2
+    assert delta.message["data"]["changes"] == [
+        {"username": "bob", "score": 6, "rank": 1},
+        {"username": "ann", "score": 5, "rank": 2},
+    ]
+    assert delta.message["data"]["removed"] == []
+    assert state.apply(state.entries) is None
+
+
+async def test_dropped_delta_is_replaced_by_snapshot():
+    state = LeaderboardState("quiz-1")
+    websocket = FakeWebSocket()
+    writer = ConnectionWriter(websocket)
+
+    # Writer not started yet, so both deltas pile up in the slot
+    for score in (1, 2):
+        delta = state.apply([{"username": "ann", "score": score}])
+        writer.send_leaderboard(
+            delta.payload(JSON_CODEC), partial(state.snapshot_payload, JSON_CODEC)
+        )
+    writer.start()
+    await asyncio.sleep(0.01)
+
+    assert len(websocket.sent) == 1
+    message = json.loads(websocket.sent[0])
+    assert message["type"] == "leaderboard_update"
+    assert message["seq"] == 2
+    await writer.stop()
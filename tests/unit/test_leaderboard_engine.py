@@ -0,0 +1,127 @@
+import pytest
+
+from src.engines import create_leaderboard_engine
+from src.engines.memory_leaderboard_engine import MemoryLeaderboardEngine
+from src.engines.redis_leaderboard_engine import RedisLeaderboardEngine
+from tests.utils.fake_redis import FakeRedis
+
+
+@pytest.fixture(params=["memory", "redis"])
+def engine(request):
+    if request.param == "redis":
+        return RedisLeaderboardEngine(FakeRedis())
+    return MemoryLeaderboardEngine()
+
+
+async def test_increment_reorders_and_ranks(engine):
+    await engine.load(
+        "quiz-1",
+        [
+            {"user_id": 1, "username": "ann", "score": 5},
+            {"user_id": 2, "username": "bob", "score": 3},
+            {"user_id": 3, "username": "cat", "score": 1},
+        ],
+    )
+    assert await engine.is_loaded("quiz-1")
+
+    assert await engine.increment("quiz-1", 3, 10) == 11
+
+    assert await engine.top("quiz-1", 2) == [
+        {"username": "cat", "score": 11},
+        {"username": "ann", "score": 5},
+    ]
+    assert await engine.rank("quiz-1", 3) == 1
+    assert await engine.rank("quiz-1", 2) == 3
+    assert await engine.rank("quiz-1", 42) is None
+    assert await engine.range("quiz-1", 1, 5) == [
+        {"username": "ann", "score": 5},
+        {"username": "bob", "score": 3},
+    ]
+    assert await engine.count("quiz-1") == 3
+
+
+async def test_add_keeps_existing_score_and_drop_unloads(engine):
+    await engine.load("quiz-1", [])
+    await engine.add("quiz-1", 7, "dan", 0)
+    await engine.increment("quiz-1", 7, 4)
+    await engine.add("quiz-1", 7, "dan", 0)
+
+    assert await engine.score("quiz-1", 7) == 4
+
+    await engine.drop("quiz-1")
+    assert not await engine.is_loaded("quiz-1")
+
+
+async def test_ensure_loaded_calls_loader_once(engine):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return [{"user_id": 1, "username": "ann", "score": 2}]
+
+    await engine.ensure_loaded("quiz-1", loader)
+    await engine.ensure_loaded("quiz-1", loader)
+
+    assert calls == [1]
+    assert await engine.top("quiz-1") == [{"username": "ann", "score": 2}]
+
+
+async def test_redis_load_keeps_scores_of_a_board_already_loaded():
+    redis = FakeRedis()
+    first, second = RedisLeaderboardEngine(redis), RedisLeaderboardEngine(redis)
+    rows = [{"user_id": 1, "username": "ann", "score": 2}]
+
+    await first.load("quiz-1", rows)
+    await first.increment("quiz-1", 1, 5)
+    # A second worker that raced past is_loaded() must not reset the board
+    await second.load("quiz-1", rows)
+
+    assert await second.score("quiz-1", 1) == 7
+
+
+def test_memory_engine_refuses_a_cross_worker_broadcaster():
+    with pytest.raises(ValueError):
+        create_leaderboard_engine("memory", broadcast_backend="redis")
+
+    assert isinstance(
+        create_leaderboard_engine("memory", broadcast_backend="in_process"),
+        MemoryLeaderboardEngine,
+    )
+
+
+async def test_increment_many_returns_new_scores(engine):
+    await engine.load("quiz-1", [{"user_id": 1, "username": "ann", "score": 2}])
+
+    assert await engine.increment_many("quiz-1", {1: 3, 2: 4}) == {1: 5, 2: 4}
+    assert await engine.rank("quiz-1", 1) == 1
+
+
+async def test_memory_and_redis_engines_give_the_same_board():
+    boards = []
+    for engine in (MemoryLeaderboardEngine(), RedisLeaderboardEngine(FakeRedis())):
+        await engine.load(
+            "quiz-1",
+            [
+                {"user_id": 2, "username": "bob", "score": 5},
+                {"user_id": 10, "username": "ten", "score": 5},
+                {"user_id": 9, "username": "nine", "score": 3},
+            ],
+        )
+        await engine.increment("quiz-1", 9, 2)
+        # Scored before joining: no name until add() supplies one
+        await engine.increment("quiz-1", 11, 5)
+        unnamed = await engine.top("quiz-1")
+        await engine.add("quiz-1", 11, "eve")
+        boards.append(
+            (
+                unnamed,
+                await engine.top("quiz-1"),
+                await engine.range("quiz-1", 1, 2),
+                [await engine.rank("quiz-1", user_id) for user_id in (2, 9, 10, 11)],
+            )
+        )
+
+    assert boards[0] == boards[1]
+    unnamed, top, _, _ = boards[0]
+    assert {"username": "11", "score": 5} in unnamed
+    assert [entry["username"] for entry in top] == ["nine", "bob", "eve", "ten"]
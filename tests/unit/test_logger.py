@@ -0,0 +1,21 @@
+from src.utils.logger import LoggerSingleton, _null_logger
+
+
+def test_sampled_passes_one_call_in_n_per_call_site():
+    log = LoggerSingleton()
+    first = [log.sampled(10) is not _null_logger for _ in range(30)]
+    second = [log.sampled(10) is not _null_logger for _ in range(5)]
+
+    assert first.count(True) == 3
+    assert first[0] and first[10] and first[20]
+    # Another call site keeps its own counter
+    assert second[0]
+    assert second.count(True) == 1
+
+
+def test_null_logger_swallows_calls():
+    _null_logger.info("Scored {} in {}", 1, "quiz-1")
+    _null_logger.exception("ignored")
+    _null_logger.critical("ignored")
+    _null_logger.log("INFO", "ignored")
+    _null_logger.bind(quiz_id="quiz-1").opt(lazy=True).info("ignored")
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from src.utils.exceptions import HashingBusyException
+from src.utils.hashing import PasswordHasher
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+async def test_hash_and_verify_off_the_loop(executor):
+    hasher = PasswordHasher(executor=executor, workers=1, max_pending=4)
+    try:
+        password_hash = await hasher.hash("secret")
+        assert await hasher.verify(password_hash, "secret")
+        assert not await hasher.verify(password_hash, "wrong")
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+async def test_saturated_hasher_fails_fast():
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    try:
+        results = await asyncio.gather(
+            *(hasher.hash("secret") for _ in range(5)), return_exceptions=True
+        )
+        rejected = [r for r in results if isinstance(r, HashingBusyException)]
+        assert len(rejected) == 3
+        assert rejected[0].status_code == 503
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+async def test_waiting_hasher_queues_instead_of_rejecting():
+    hasher = PasswordHasher(workers=1, max_pending=1, wait=True)
+    try:
+        results = await asyncio.gather(
+            *(hasher.hash_many(["a", "b", "c"]) for _ in range(4))
+        )
+        assert all(len(hashes) == 3 for hashes in results)
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,71 @@
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+# src.utils.auth pulls in the database module, which needs a URL at import
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from src.caches.principal_cache import PrincipalCache
+from src.schemas.user import UserRead
+from src.utils import auth
+from src.utils.token import create_token
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = PrincipalCache()
+    monkeypatch.setattr(auth, "principal_cache", cache)
+    return cache
+
+
+def make_user_service(user=None):
+    user_service = MagicMock()
+    user_service.get_user_by_id = AsyncMock(return_value=user)
+    return user_service
+
+
+def test_entry_expires_at_token_exp():
+    cache = PrincipalCache()
+    user = UserRead(id=1, username="ann")
+
+    cache.put("live", user, exp=time.time() + 60)
+    cache.put("expired", user, exp=time.time() - 1)
+
+    assert cache.get("live") == user
+    assert cache.get("expired") is None
+    assert "expired" not in cache.entries
+
+
+async def test_user_is_loaded_once_per_token(cache):
+    token = create_token({"user_id": 1, "username": "ann"})
+    user_service = make_user_service(SimpleNamespace(id=1, username="ann"))
+
+    first = await auth.validate_and_get_user(token, user_service)
+    second = await auth.get_current_user_for_ws(token, user_service)
+
+    assert first == second == UserRead(id=1, username="ann")
+    user_service.get_user_by_id.assert_awaited_once_with(1)
+
+
+async def test_unknown_user_is_not_cached(cache):
+    token = create_token({"user_id": 7, "username": "ghost"})
+    user_service = make_user_service(None)
+
+    with pytest.raises(HTTPException):
+        await auth.validate_and_get_user(token, user_service)
+    assert cache.entries == {}
+
+
+async def test_trust_claims_skips_the_database(cache, monkeypatch):
+    monkeypatch.setattr(auth, "AUTH_TRUST_CLAIMS", True)
+    token = create_token({"user_id": 3, "username": "cat"})
+    user_service = make_user_service()
+
+    user = await auth.validate_and_get_user(token, user_service)
+
+    assert user == UserRead(id=3, username="cat")
+    user_service.get_user_by_id.assert_not_awaited()
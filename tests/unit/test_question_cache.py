@@ -0,0 +1,82 @@
+import json
+
+from src.caches.question_cache import QuestionCache, parse_options
+from src.models import Question
+
+
+def make_loader(questions_by_quiz: dict):
+    loads = []
+
+    async def loader(quiz_id: str):
+        loads.append(quiz_id)
+        return list(questions_by_quiz.get(quiz_id, []))
+
+    return loader, loads
+
+
+def make_question(question_id: int, quiz_id: str = "quiz-1", correct: int = 1):
+    return Question(
+        id=question_id,
+        quiz_id=quiz_id,
+        text=f"Question {question_id}",
+        options=json.dumps(["a", "b", "c"]),
+        correct_option=correct,
+    )
+
+
+def test_parse_options_accepts_json_and_comma_lists():
+    assert parse_options('["x", "y, z"]') == ("x", "y, z")
+    assert parse_options("x, y ,z") == ("x", "y", "z")
+
+
+async def test_questions_are_loaded_once_and_graded_from_memory():
+    cache = QuestionCache()
+    loader, loads = make_loader({"quiz-1": [make_question(1), make_question(2)]})
+
+    question = (await cache.get("quiz-1", loader)).questions[1]
+    assert question.options == ("a", "b", "c")
+    assert question.option_index(1) == 1
+    assert question.option_index("1") == 1
+    assert question.option_index("b") == 1
+    assert question.option_index("z") == -1
+    assert question.option_index(None) == -1
+    assert list((await cache.get("quiz-1", loader)).questions) == [1, 2]
+
+    assert loads == ["quiz-1"]
+
+
+async def test_invalidate_reloads_the_quiz():
+    questions = {"quiz-1": [make_question(1)]}
+    cache = QuestionCache()
+    loader, loads = make_loader(questions)
+
+    await cache.get("quiz-1", loader)
+    questions["quiz-1"].append(make_question(2))
+    cache.invalidate("quiz-1")
+
+    assert 2 in (await cache.get("quiz-1", loader)).questions
+    assert loads == ["quiz-1", "quiz-1"]
+
+
+async def test_load_racing_an_invalidation_is_not_stored():
+    cache = QuestionCache()
+
+    async def loader(quiz_id: str):
+        cache.invalidate(quiz_id)
+        return [make_question(1)]
+
+    await cache.get("quiz-1", loader)
+
+    assert "quiz-1" not in cache.entries
+
+
+async def test_least_recently_used_quiz_is_evicted():
+    cache = QuestionCache(max_quizzes=2)
+    loader, loads = make_loader({})
+
+    await cache.get("quiz-1", loader)
+    await cache.get("quiz-2", loader)
+    await cache.get("quiz-1", loader)
+    await cache.get("quiz-3", loader)
+
+    assert list(cache.entries) == ["quiz-1", "quiz-3"]
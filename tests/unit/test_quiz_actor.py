@@ -0,0 +1,390 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from src.broadcasters import MemoryBroadcaster, MemoryBroker
+from src.caches import CachedQuestion
+from src.commands.base_command import BaseCommand
+from src.commands.end_quiz_command import EndQuizCommand
+from src.commands.pause_quiz_command import PauseQuizCommand
+from src.commands.resume_quiz_command import ResumeQuizCommand
+from src.commands.skip_question_command import SkipQuestionCommand
+from src.commands.start_quiz_command import StartQuizCommand
+from src.commands.submit_answer_command import SubmitAnswerCommand
+from src.realtime.quiz_actor import QuizActorRegistry
+from src.realtime.timer_scheduler import TimerScheduler
+from src.scoring import FixedScoringStrategy
+from src.utils.exceptions import QuizNotFoundException
+from tests.utils.websocket import FakeWebSocket
+
+
+class FakeQuizService:
+    def __init__(self):
+        self.scores = {}
+        self.batches = []
+        self.non_participants = set()
+        self.ended = []
+        self.statuses = []
+        self.questions = [
+            CachedQuestion(1, "q1", ("a", "b"), 1, duration_seconds=0.05),
+            CachedQuestion(2, "q2", ("a", "b"), 0, duration_seconds=0.05),
+        ]
+
+    async def update_score(self, quiz_id, user_id, increment):
+        # Read, yield, write: loses updates unless calls are serialized
+        score = self.scores.get(user_id, 0)
+        await asyncio.sleep(0)
+        self.scores[user_id] = score + increment
+        return self.scores[user_id]
+
+    async def update_scores(self, quiz_id, increments):
+        self.batches.append(dict(increments))
+        scores = {}
+        for user_id, increment in increments.items():
+            if user_id not in self.non_participants:
+                scores[user_id] = await self.update_score(quiz_id, user_id, increment)
+        return scores
+
+    async def end_quiz(self, quiz_id):
+        self.ended.append(quiz_id)
+
+    async def update_status(self, quiz_id, status):
+        self.statuses.append(status)
+
+    async def get_cached_questions(self, quiz_id):
+        return self.questions
+
+
+class FakeCoalescer:
+    def __init__(self):
+        self.dirty = []
+        self.flushed = []
+
+    def mark_dirty(self, quiz_id):
+        self.dirty.append(quiz_id)
+
+    async def flush_now(self, quiz_id):
+        self.flushed.append(quiz_id)
+
+
+def make_registry(idle_timeout: float = 10, **kwargs):
+    service = FakeQuizService()
+    sent = []
+    broadcasts = []
+
+    @asynccontextmanager
+    async def scope():
+        yield service
+
+    async def send(websocket, message):
+        sent.append((websocket, message))
+
+    async def broadcast(quiz_id, message):
+        broadcasts.append(message)
+
+    registry = QuizActorRegistry(
+        scope,
+        send,
+        broadcast,
+        FakeCoalescer(),
+        TimerScheduler(),
+        scoring=FixedScoringStrategy(1),
+        mailbox_size=8,
+        idle_timeout=idle_timeout,
+        **kwargs,
+    )
+    registry.broadcasts = broadcasts
+    return registry, service, sent
+
+
+async def test_answers_are_buffered_and_graded_when_the_question_closes():
+    registry, service, sent = make_registry()
+    service.questions = [CachedQuestion(1, "q1", ("a", "b"), 1, duration_seconds=60)]
+
+    await registry.tell("quiz-1", StartQuizCommand())
+    await asyncio.gather(
+        *(
+            registry.tell(
+                "quiz-1", SubmitAnswerCommand(user_id, 1, user_id % 2, websocket="ws")
+            )
+            for user_id in range(100)
+        )
+    )
+    await registry.get("quiz-1").mailbox.join()
+    assert service.scores == {}
+    assert {m["type"] for _, m in sent} == {"answer_received"}
+
+    await registry.tell("quiz-1", SkipQuestionCommand())
+    await registry.get("quiz-1").mailbox.join()
+
+    assert service.scores == {user_id: 1 for user_id in range(1, 100, 2)}
+    assert len(service.batches) == 1
+    results = [m for _, m in sent if m["type"] == "answer_result"]
+    assert len(results) == 100
+    assert results[1]["data"] == {"question_id": 1, "result": "correct", "points": 1}
+    assert registry.broadcasts[-1]["data"]["correct_option"] == 1
+    await registry.stop()
+
+
+async def test_answers_outside_the_window_are_rejected():
+    registry, service, sent = make_registry()
+    service.questions = [CachedQuestion(1, "q1", ("a", "b"), 1, duration_seconds=60)]
+
+    await registry.tell("quiz-1", SubmitAnswerCommand(7, 1, 1, websocket="ws"))
+    await registry.tell("quiz-1", StartQuizCommand())
+    await registry.tell("quiz-1", SubmitAnswerCommand(7, 2, 1, websocket="ws"))
+    actor = registry.get("quiz-1")
+    await actor.mailbox.join()
+    late = actor.window.closes_at + 1
+    await registry.tell(
+        "quiz-1", SubmitAnswerCommand(7, 1, 1, websocket="ws", received_at=late)
+    )
+    await actor.mailbox.join()
+
+    messages = [m["message"] for _, m in sent]
+    assert messages == [
+        "Question 1 is not open for answers.",
+        "Question 2 is not open for answers.",
+        "Answer to question 1 arrived after its deadline.",
+    ]
+    assert actor.window.user_ids == []
+    await registry.stop()
+
+
+async def test_command_errors_are_replied_and_the_actor_keeps_running():
+    registry, service, sent = make_registry()
+
+    class Failing(BaseCommand):
+        websocket = "ws"
+
+        async def execute(self, actor, quiz_service):
+            raise QuizNotFoundException(detail="Quiz quiz-1 not found.")
+
+    await registry.tell("quiz-1", Failing())
+    await registry.tell("quiz-1", ResumeQuizCommand(websocket="ws"))
+    await registry.get("quiz-1").mailbox.join()
+
+    assert [m["message"] for _, m in sent] == [
+        "Quiz quiz-1 not found.",
+        "Quiz is not paused.",
+    ]
+    await registry.stop()
+
+
+async def test_actor_exits_when_quiz_ends_or_goes_idle():
+    registry, service, sent = make_registry(idle_timeout=0.05)
+
+    await registry.tell("quiz-1", SubmitAnswerCommand(7, "q1", 1))
+    await registry.tell("quiz-1", EndQuizCommand())
+    await registry.tell("quiz-2", SubmitAnswerCommand(7, "q1", 1))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+
+    assert service.ended == ["quiz-1"]
+    assert "quiz-1" not in registry.actors
+    assert registry.coalescer.flushed == ["quiz-1"]
+
+    await asyncio.sleep(0.1)
+    assert registry.actors == {}
+
+
+async def test_commands_after_exit_start_a_new_actor():
+    registry, service, sent = make_registry()
+
+    class Probe(BaseCommand):
+        async def execute(self, actor, quiz_service):
+            actor.status = "completed"
+
+    await registry.tell("quiz-1", Probe())
+    first = registry.actors["quiz-1"]
+    await first.mailbox.join()
+    await asyncio.sleep(0)
+
+    assert first.closed
+    assert registry.get("quiz-1") is not first
+    await registry.stop()
+
+
+async def test_scheduler_drives_the_question_timeline():
+    registry, service, sent = make_registry()
+    await registry.scheduler.start()
+
+    await registry.tell("quiz-1", StartQuizCommand())
+    await asyncio.sleep(0.3)
+
+    assert [m["type"] for m in registry.broadcasts] == [
+        "new_question",
+        "question_closed",
+        "new_question",
+        "question_closed",
+        "quiz_end",
+    ]
+    assert registry.broadcasts[0]["data"]["id"] == 1
+    assert service.statuses == ["started"]
+    assert service.ended == ["quiz-1"]
+    assert "quiz-1" not in registry.actors
+    assert len(registry.scheduler) == 0
+    await registry.scheduler.stop()
+
+
+async def test_pause_resume_and_skip():
+    registry, service, sent = make_registry()
+    service.questions = [
+        CachedQuestion(1, "q1", ("a", "b"), 1, duration_seconds=0.2),
+        CachedQuestion(2, "q2", ("a", "b"), 0, duration_seconds=60),
+    ]
+    await registry.scheduler.start()
+
+    await registry.tell("quiz-1", StartQuizCommand())
+    await registry.tell("quiz-1", PauseQuizCommand(websocket="ws"))
+    await asyncio.sleep(0.3)
+    # Paused before the deadline, so the first question is still open
+    assert [m["type"] for m in registry.broadcasts] == ["new_question", "quiz_paused"]
+    assert 0 < registry.broadcasts[1]["data"]["remaining"] <= 0.2
+
+    await registry.tell("quiz-1", ResumeQuizCommand(websocket="ws"))
+    await asyncio.sleep(0.3)
+    assert registry.broadcasts[-2]["type"] == "question_closed"
+    assert registry.broadcasts[-1]["data"]["id"] == 2
+
+    await registry.tell("quiz-1", SkipQuestionCommand(websocket="ws"))
+    await registry.tell("quiz-1", SkipQuestionCommand(websocket="ws"))
+    await asyncio.sleep(0.05)
+    assert [m["type"] for m in registry.broadcasts[-2:]] == [
+        "question_closed",
+        "quiz_end",
+    ]
+    assert sent == []
+
+    await registry.tell("quiz-1", ResumeQuizCommand(websocket="ws"))
+    await registry.get("quiz-1").mailbox.join()
+    assert sent[-1][1] == {"type": "error", "message": "Quiz is not paused."}
+    await registry.stop()
+    await registry.scheduler.stop()
+
+
+async def test_resent_answers_are_acknowledged_once_and_graded_once():
+    registry, service, sent = make_registry()
+    service.questions = [CachedQuestion(1, "q1", ("a", "b"), 1, duration_seconds=60)]
+
+    await registry.tell("quiz-1", StartQuizCommand())
+    for _ in range(3):
+        await registry.tell("quiz-1", SubmitAnswerCommand(7, 1, 1, websocket="ws"))
+    await registry.tell(
+        "quiz-1", SubmitAnswerCommand(8, 1, 1, websocket="ws", idempotency_key="k1")
+    )
+    # Same key with a changed payload gets the original reply back
+    await registry.tell(
+        "quiz-1", SubmitAnswerCommand(8, 2, 0, websocket="ws", idempotency_key="k1")
+    )
+    await registry.tell("quiz-1", SkipQuestionCommand())
+    actor = registry.get("quiz-1")
+    await actor.mailbox.join()
+
+    duplicates = [m for _, m in sent if m.get("duplicate")]
+    assert len(duplicates) == 3
+    assert duplicates[-1]["data"] == {"question_id": 1}
+    assert service.scores == {7: 1, 8: 1}
+    assert len([m for _, m in sent if m["type"] == "answer_result"]) == 2
+    await registry.stop()
+
+
+async def test_commands_on_another_worker_are_forwarded_to_the_owner():
+    broker = MemoryBroker()
+    host, bob = FakeWebSocket(), FakeWebSocket()
+    owner, owner_service, owner_sent = make_registry(leases=MemoryBroadcaster(broker))
+    other, other_service, other_sent = make_registry(leases=MemoryBroadcaster(broker))
+    owner_service.questions = [
+        CachedQuestion(1, "q1", ("a", "b"), 1, duration_seconds=60)
+    ]
+
+    await owner.tell("quiz-1", StartQuizCommand(websocket=host))
+    await owner.get("quiz-1").mailbox.join()
+    await other.tell("quiz-1", StartQuizCommand(websocket=bob))
+    await other.tell(
+        "quiz-1",
+        SubmitAnswerCommand(
+            8, 1, 1, websocket=bob, received_at=other.scheduler.clock()
+        ),
+    )
+    await owner.get("quiz-1").mailbox.join()
+
+    # One timeline, run by the owner; the other worker never starts an actor
+    assert "quiz-1" not in other.actors
+    assert owner_service.statuses == ["started"]
+    # Replies go back to the socket on the worker that sent the command
+    assert [m for _, m in other_sent] == [
+        {"type": "error", "message": "Quiz has already started."},
+        {"type": "answer_received", "data": {"question_id": 1}},
+    ]
+    assert {websocket for websocket, _ in other_sent} == {bob}
+
+    await owner.tell("quiz-1", SkipQuestionCommand())
+    await owner.get("quiz-1").mailbox.join()
+    assert owner_service.scores == {8: 1}
+    assert other_sent[-1][1]["type"] == "answer_result"
+
+    # Released when the owner's actor exits, so another worker can claim it
+    await owner.stop()
+    await other.tell("quiz-1", StartQuizCommand(websocket=bob))
+    assert "quiz-1" in other.actors
+    await other.stop()
+
+
+async def test_refusing_commands_for_another_workers_quiz_is_opt_in():
+    broker = MemoryBroker()
+    host, bob = FakeWebSocket(), FakeWebSocket()
+    owner, _, _ = make_registry(leases=MemoryBroadcaster(broker))
+    other, _, other_sent = make_registry(
+        leases=MemoryBroadcaster(broker), forward=False
+    )
+
+    await owner.tell("quiz-1", StartQuizCommand(websocket=host))
+    await other.tell("quiz-1", StartQuizCommand(websocket=bob))
+
+    assert "quiz-1" not in other.actors
+    assert [m["message"] for _, m in other_sent] == [
+        "Quiz quiz-1 is running on another worker."
+    ]
+    await owner.stop()
+
+
+async def test_lease_is_claimed_once_and_renewed_on_a_timer():
+    claims = []
+
+    class CountingBroadcaster(MemoryBroadcaster):
+        async def claim(self, quiz_id):
+            claims.append(quiz_id)
+            return await super().claim(quiz_id)
+
+    registry, _, _ = make_registry(leases=CountingBroadcaster(owner_ttl=0.06))
+    for _ in range(5):
+        await registry.tell("quiz-1", SubmitAnswerCommand(7, 1, 1, websocket="ws"))
+    assert claims == ["quiz-1"]
+
+    await asyncio.sleep(0.05)
+    assert len(claims) >= 2
+    await registry.stop()
+
+
+async def test_points_are_only_reported_for_saved_scores():
+    registry, service, sent = make_registry()
+    service.questions = [CachedQuestion(1, "q1", ("a", "b"), 1, duration_seconds=60)]
+    service.non_participants = {8}
+
+    await registry.tell("quiz-1", StartQuizCommand())
+    await registry.tell("quiz-1", SubmitAnswerCommand(7, 1, 1, websocket="ann"))
+    await registry.tell("quiz-1", SubmitAnswerCommand(8, 1, 1, websocket="bob"))
+    await registry.tell("quiz-1", SkipQuestionCommand())
+    await registry.get("quiz-1").mailbox.join()
+
+    results = {
+        websocket: m["data"]["points"]
+        for websocket, m in sent
+        if m["type"] == "answer_result"
+    }
+    assert results == {"ann": 1, "bob": 0}
+    assert service.scores == {7: 1}
+    await registry.stop()
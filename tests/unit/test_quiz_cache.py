@@ -0,0 +1,71 @@
+import asyncio
+
+from src.caches.quiz_cache import QuizCache
+from src.models import QuizSession
+
+
+def make_loader(delay: float = 0):
+    loads = []
+    statuses = {"quiz-1": "active", "quiz-2": "active", "quiz-3": "active"}
+
+    async def loader(quiz_id: str):
+        loads.append(quiz_id)
+        await asyncio.sleep(delay)
+        if quiz_id not in statuses:
+            return None
+        return QuizSession(quiz_id=quiz_id, creator_user_id=1, status=statuses[quiz_id])
+
+    return loader, loads, statuses
+
+
+async def test_concurrent_misses_share_one_load():
+    cache = QuizCache()
+    loader, loads, _ = make_loader(delay=0.01)
+
+    quizzes = await asyncio.gather(*(cache.get("quiz-1", loader) for _ in range(50)))
+
+    assert loads == ["quiz-1"]
+    assert {quiz.status for quiz in quizzes} == {"active"}
+    await cache.get("quiz-1", loader)
+    assert loads == ["quiz-1"]
+
+
+async def test_entries_expire_after_ttl():
+    cache = QuizCache(ttl=0.01)
+    loader, loads, _ = make_loader()
+
+    await cache.get("quiz-1", loader)
+    await asyncio.sleep(0.02)
+    await cache.get("quiz-1", loader)
+
+    assert loads == ["quiz-1", "quiz-1"]
+
+
+async def test_invalidate_picks_up_status_change():
+    cache = QuizCache()
+    loader, loads, statuses = make_loader()
+
+    await cache.get("quiz-1", loader)
+    statuses["quiz-1"] = "started"
+    cache.invalidate("quiz-1")
+
+    assert (await cache.get("quiz-1", loader)).status == "started"
+
+
+async def test_missing_quiz_is_not_cached():
+    cache = QuizCache()
+    loader, loads, _ = make_loader()
+
+    assert await cache.get("missing", loader) is None
+    assert await cache.get("missing", loader) is None
+    assert loads == ["missing", "missing"]
+
+
+async def test_size_is_bounded():
+    cache = QuizCache(max_size=2)
+    loader, _, _ = make_loader()
+
+    for quiz_id in ("quiz-1", "quiz-2", "quiz-3"):
+        await cache.get(quiz_id, loader)
+
+    assert list(cache.entries) == ["quiz-2", "quiz-3"]
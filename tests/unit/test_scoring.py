@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.caches import CachedQuestion
+from src.realtime.answer_window import AnswerWindow
+from src.scoring import (
+    FixedScoringStrategy,
+    SpeedBonusScoringStrategy,
+    StreakScoringStrategy,
+    create_scoring_strategy,
+)
+
+QUESTION = CachedQuestion(1, "q1", ("a", "b", "c"), 2)
+
+
+def test_window_grades_buffered_answers_in_one_batch():
+    window = AnswerWindow(QUESTION, opened_at=100.0, duration=10)
+    window.add(1, 2, 101.0)
+    window.add(2, "c", 109.0)
+    window.add(3, 0, 102.0)
+    window.add(4, "nope", 103.0)
+
+    correct, points = window.grade(SpeedBonusScoringStrategy(1, 10), {})
+
+    assert correct.tolist() == [True, True, False, False]
+    # 1 point plus the bonus left at 10% and 90% of the window
+    assert points.tolist() == [10, 2, 0, 0]
+
+
+def test_window_bounds_and_pauses():
+    window = AnswerWindow(QUESTION, opened_at=100.0, duration=10)
+    assert window.accepts(100.0) and window.accepts(110.0)
+    assert not window.accepts(99.0) and not window.accepts(110.5)
+
+    window.pause(104.0)
+    assert not window.accepts(105.0)
+    window.resume(109.0)
+
+    # The deadline moves by the pause, which doesn't count against speed
+    assert window.closes_at == 115.0
+    assert window.duration == 10
+    assert not window.accepts(106.0)
+    assert window.accepts(103.0) and window.accepts(114.0)
+    window.add(1, 2, 110.0)
+    assert window.elapsed == [5.0]
+
+
+def test_streak_multiplies_base_points():
+    strategy = StreakScoringStrategy(FixedScoringStrategy(10), step=0.5, max_streak=2)
+
+    points = strategy.score(
+        np.array([True, True, True, False]),
+        np.zeros(4),
+        10,
+        np.array([0, 1, 5, 3]),
+    )
+
+    assert points.tolist() == [10, 15, 20, 0]
+
+
+def test_create_scoring_strategy():
+    assert isinstance(create_scoring_strategy("fixed"), FixedScoringStrategy)
+    combined = create_scoring_strategy("speed+streak")
+    assert isinstance(combined, StreakScoringStrategy)
+    assert isinstance(combined.base, SpeedBonusScoringStrategy)
+    with pytest.raises(ValueError):
+        create_scoring_strategy("random")
@@ -0,0 +1,35 @@
+from dataclasses import replace
+
+from src.settings import DatabaseSettings
+
+
+def make_settings(monkeypatch, url: str) -> DatabaseSettings:
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_ECHO", "yes")
+    return replace(DatabaseSettings.from_env(), url=url)
+
+
+def test_sqlite_gets_no_pool_arguments(monkeypatch):
+    settings = make_settings(monkeypatch, "sqlite+aiosqlite:///:memory:")
+
+    assert settings.engine_options() == {"echo": True, "pool_pre_ping": True}
+
+
+def test_asyncpg_gets_pool_and_statement_settings(monkeypatch):
+    settings = make_settings(monkeypatch, "postgresql+asyncpg://u:p@db/quiz")
+
+    options = settings.engine_options()
+
+    assert options["pool_size"] == 7
+    assert options["connect_args"] == {
+        "prepared_statement_cache_size": 500,
+        "statement_cache_size": 500,
+        "server_settings": {"statement_timeout": "5000"},
+    }
+
+
+def test_statement_timeout_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "0")
+    settings = make_settings(monkeypatch, "postgresql+asyncpg://u:p@db/quiz")
+
+    assert "server_settings" not in settings.engine_options()["connect_args"]
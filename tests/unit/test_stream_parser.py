@@ -0,0 +1,54 @@
+import pytest
+
+from src.utils.stream_parser import (
+    StreamParseError,
+    detect_format,
+    iter_batches,
+    iter_rows,
+)
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+async def test_jsonl_rows_survive_arbitrary_chunk_boundaries():
+    data = '{"username": "zoë"}\n\nnot json\n[1]\n{"username": "bob"}'.encode()
+
+    rows = await collect(iter_rows(chunked(data, 3), "jsonl"))
+
+    assert [(row.line, row.data) for row in rows if row.data] == [
+        (1, {"username": "zoë"}),
+        (5, {"username": "bob"}),
+    ]
+    assert [row.line for row in rows if row.error] == [3, 4]
+
+
+async def test_csv_rows_are_keyed_by_header():
+    data = b'\xef\xbb\xbfusername,password\r\nann,"a,b"\r\nbob\r\n'
+
+    rows = await collect(iter_rows(chunked(data, 5), "csv"))
+
+    assert rows[0].data == {"username": "ann", "password": "a,b"}
+    assert rows[1].error == "Expected 2 columns, got 1"
+
+
+async def test_overlong_line_is_rejected():
+    with pytest.raises(StreamParseError):
+        await collect(iter_rows(chunked(b"x" * 70000, 8192), "jsonl"))
+
+
+async def test_batches_and_format_detection():
+    data = b"\n".join(b'{"n": %d}' % i for i in range(5))
+
+    batches = await collect(iter_batches(iter_rows(chunked(data, 4), "jsonl"), 2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert detect_format("text/csv; charset=utf-8") == "csv"
+    assert detect_format("application/x-ndjson") == "jsonl"
+    assert detect_format("text/csv", "jsonl") == "jsonl"
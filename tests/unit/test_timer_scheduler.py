@@ -0,0 +1,68 @@
+import asyncio
+
+from src.caches import CachedQuestion
+from src.realtime.quiz_timeline import QuizTimeline
+from src.realtime.timer_scheduler import TimerScheduler
+
+
+async def test_timers_fire_in_deadline_order_from_one_task():
+    scheduler = TimerScheduler()
+    await scheduler.start()
+    fired = []
+
+    for delay in (0.06, 0.02, 0.04):
+        scheduler.call_later(delay, fired.append, delay)
+    await asyncio.sleep(0.1)
+
+    assert fired == [0.02, 0.04, 0.06]
+    assert len(scheduler) == 0
+    await scheduler.stop()
+
+
+async def test_sooner_timer_wakes_the_scheduler_and_cancel_skips():
+    scheduler = TimerScheduler()
+    await scheduler.start()
+    fired = []
+
+    scheduler.call_later(10, fired.append, "late")
+    await asyncio.sleep(0.01)
+    handle = scheduler.call_later(0.02, fired.append, "cancelled")
+    scheduler.call_later(0.02, fired.append, "soon")
+    scheduler.cancel(handle)
+    await asyncio.sleep(0.05)
+
+    assert fired == ["soon"]
+    assert len(scheduler) == 1
+    await scheduler.stop()
+
+
+def test_cancelled_timers_are_compacted():
+    scheduler = TimerScheduler()
+    handles = [scheduler.call_later(i, print) for i in range(10)]
+    for handle in handles[:6]:
+        scheduler.cancel(handle)
+
+    assert len(scheduler._heap) == 4
+    assert len(scheduler) == 4
+
+
+def test_timeline_steps_through_questions():
+    timeline = QuizTimeline(
+        [
+            CachedQuestion(1, "q1", ("a", "b"), 0, duration_seconds=30),
+            CachedQuestion(2, "q2", ("a", "b"), 1),
+        ],
+        default_duration=10,
+        interval=2,
+    )
+
+    events = [timeline.step() for _ in range(5)]
+
+    assert [(e.kind, e.delay) for e in events] == [
+        ("question_start", 30),
+        ("deadline", 2),
+        ("question_start", 10),
+        ("deadline", 2),
+        ("quiz_end", 0),
+    ]
+    assert timeline.ended
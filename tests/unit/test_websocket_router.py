@@ -0,0 +1,88 @@
+import os
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from src.routers import websocket as websocket_router  # noqa: E402
+from src.commands.end_quiz_command import EndQuizCommand  # noqa: E402
+
+CREATOR = SimpleNamespace(id=1, username="ann")
+PLAYER = SimpleNamespace(id=2, username="bob")
+
+
+class FakeQuizService:
+    async def get_quiz(self, quiz_id):
+        return SimpleNamespace(quiz_id=quiz_id, creator_user_id=CREATOR.id)
+
+    async def get_leaderboard(self, quiz_id, limit=None):
+        return []
+
+
+class FakeActors:
+    def __init__(self):
+        self.told = []
+
+    async def tell(self, quiz_id, command):
+        self.told.append((quiz_id, command))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    users = {"creator": CREATOR, "player": PLAYER}
+
+    async def current_user(token, user_service):
+        return users[token]
+
+    @asynccontextmanager
+    async def scope():
+        yield FakeQuizService()
+
+    actors = FakeActors()
+    monkeypatch.setattr(websocket_router, "get_current_user_for_ws", current_user)
+    monkeypatch.setattr(websocket_router, "quiz_service_scope", scope)
+    monkeypatch.setattr(websocket_router, "actors", actors)
+    app = FastAPI()
+    app.include_router(websocket_router.router)
+    with TestClient(app) as test_client:
+        test_client.actors = actors
+        yield test_client
+
+
+def test_control_commands_are_refused_for_non_creators(client):
+    with client.websocket_connect("/ws/quiz-1?token=player") as ws:
+        ws.send_json({"action": "end_quiz"})
+        assert ws.receive_json() == {
+            "type": "error",
+            "message": "Only the quiz creator can control the quiz.",
+        }
+    assert client.actors.told == []
+
+    with client.websocket_connect("/ws/quiz-1?token=creator") as ws:
+        ws.send_json({"action": "end_quiz"})
+        ws.send_json({"action": "no_such_action"})
+        assert ws.receive_json()["message"] == "Invalid action."
+    assert [type(command) for _, command in client.actors.told] == [EndQuizCommand]
+
+
+def test_malformed_frames_get_an_error_and_leave_no_connection_behind(client):
+    manager = websocket_router.manager
+    for frame in ("not json", "[1, 2]"):
+        with client.websocket_connect("/ws/quiz-2?token=player") as ws:
+            ws.send_text(frame)
+            assert ws.receive_json() == {
+                "type": "error",
+                "message": "Malformed message.",
+            }
+            ws.send_json({"action": "resync"})
+        # The handler finishes on the server's loop after the client closes
+        deadline = time.monotonic() + 2
+        while "quiz-2" in manager.active_connections and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert "quiz-2" not in manager.active_connections
+        assert manager.writers == {}
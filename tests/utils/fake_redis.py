@@ -0,0 +1,92 @@
+from typing import Dict
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the sorted-set and hash commands the leaderboard
+    engine uses, with redis-py's async call signatures.
+    """
+
+    def __init__(self):
+        self.zsets: Dict[str, Dict[str, float]] = {}
+        self.hashes: Dict[str, Dict[str, str]] = {}
+        self.strings: Dict[str, str] = {}
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(self)
+
+    def _ranked(self, key):
+        # Redis orders ties by member, descending for ZREV* commands
+        items = self.zsets.get(key, {}).items()
+        return sorted(items, key=lambda item: (item[1], item[0]), reverse=True)
+
+    async def exists(self, *keys):
+        return sum(
+            key in self.zsets or key in self.hashes or key in self.strings
+            for key in keys
+        )
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.zsets.pop(key, None)
+            self.hashes.pop(key, None)
+            self.strings.pop(key, None)
+
+    async def set(self, key, value, nx=False):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = str(value)
+        return True
+
+    async def zadd(self, key, mapping, nx=False):
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if nx and member in zset:
+                continue
+            zset[member] = float(score)
+
+    async def zincrby(self, key, amount, member):
+        zset = self.zsets.setdefault(key, {})
+        zset[member] = zset.get(member, 0.0) + amount
+        return zset[member]
+
+    async def zrevrange(self, key, start, end, withscores=False):
+        ranked = self._ranked(key)
+        ranked = ranked[start:] if end == -1 else ranked[start : end + 1]
+        return ranked if withscores else [member for member, _ in ranked]
+
+    async def zrevrank(self, key, member):
+        members = [item[0] for item in self._ranked(key)]
+        return members.index(member) if member in members else None
+
+    async def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def hmget(self, key, fields):
+        values = self.hashes.get(key, {})
+        return [values.get(field) for field in fields]
+
+    async def aclose(self):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.redis, name), args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [await method(*args, **kwargs) for method, args, kwargs in self.calls]
@@ -0,0 +1,23 @@
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket that records what was sent."""
+
+    def __init__(self, subprotocols=None, query_params=None):
+        self.scope = {"subprotocols": subprotocols or []}
+        self.query_params = query_params or {}
+        self.accepted_subprotocol = None
+        self.accepted = False
+        self.closed = False
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        self.accepted = True
+        self.accepted_subprotocol = subprotocol
+
+    async def send_text(self, data: str):
+        self.sent.append(data)
+
+    async def send_bytes(self, data: bytes):
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str = None):
+        self.closed = True